@@ -5,11 +5,20 @@ import config
 
 # Blueprint'leri import et
 from routes.auth import auth_bp
+from services.auth import cached_user
 from routes.cari import cari_bp
 from routes.birim import birim_bp
 from routes.urun import urun_bp
 from routes.fatura import fatura_bp
 from routes.web import web_bp  # YENİ EKLENDİ
+from routes.stats import stats_bp
+from routes.importer import import_bp
+from routes.rapor import rapor_bp
+from utils.json_provider import FastJSONProvider
+from utils.compression import init_compression
+from utils.metrics import init_metrics
+from utils.profiler import init_profiler
+from utils.logger import init_logging
 
 def create_app():
     app = Flask(__name__)
@@ -18,8 +27,25 @@ def create_app():
     app.config.from_object(config.Config)
     app.config['SECRET_KEY'] = 'web-panel-secret-key-2025'  # Session için
     
+    # Kuyruk tabanlı JSON loglama ve istek kimliği (X-Request-ID)
+    init_logging(app)
+    
+    # JSON (orjson varsa) ve yanıt sıkıştırma
+    app.json = FastJSONProvider(app)
+    init_compression(app)
+    
+    # İstek/DB/cache metrikleri (/metrics)
+    if config.Config.METRICS_ENABLED:
+        init_metrics(app)
+    init_profiler(app)  # QUERY_PROFILER_ENABLED kapalıysa hiçbir şey yapmaz
+    
     # JWT ve CORS
     jwt = JWTManager(app)
+    
+    # flask_jwt_extended.current_user - profil cache'inden (veritabanına gidilmez)
+    @jwt.user_lookup_loader
+    def user_lookup(_jwt_header, jwt_data):
+        return cached_user(jwt_data[app.config.get('JWT_IDENTITY_CLAIM', 'sub')])
     CORS(app)
     
     # Blueprint'leri kaydet
@@ -29,6 +55,9 @@ def create_app():
     app.register_blueprint(urun_bp)
     app.register_blueprint(fatura_bp)
     app.register_blueprint(web_bp)  # YENİ EKLENDİ
+    app.register_blueprint(stats_bp)
+    app.register_blueprint(import_bp)
+    app.register_blueprint(rapor_bp)
     
     # Basit bir test endpoint'i
     @app.route('/api/test', methods=['GET'])
@@ -0,0 +1,114 @@
+"""JSON serileştirme ve yanıt sıkıştırma karşılaştırması
+
+Mevcut yol (Flask'ın standart json sağlayıcısı, sıkıştırmasız) ile
+FastJSONProvider (orjson kuruluysa) ve gzip/brotli sıkıştırmayı
+/api/fatura?include=detaylar ve /api/urun benzeri sentetik yüklerle karşılaştırır.
+Veritabanı gerekmez.
+
+Kullanım:
+    python benchmark_json.py --faturalar 2000 --detay 5 --urunler 20000 --repeat 5
+"""
+import argparse
+import gzip
+import time
+from datetime import date
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from utils.json_provider import FastJSONProvider, orjson
+from models.fatura import Fatura
+from models.fatura_detay import FaturaDetay
+from models.urun import Urun
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def fatura_payload(count, detay_count):
+    faturalar = []
+    for i in range(1, count + 1):
+        fatura = Fatura(id=i, fatura_tarihi=date(2025, 1, 1 + i % 28), fatura_no=f"FTR20250101{i:04d}",
+                        cari_id=i % 500 + 1, toplam_miktar=10.5, toplam_kdv=18.0, toplam_tutar=118.0,
+                        aciklama='Şubat ayı sevkiyatı - İstanbul')
+        fatura.cari_adi = f"Çağlar Öztürk {i % 500}"
+        fatura.detaylar = []
+        for j in range(detay_count):
+            detay = FaturaDetay(id=i * 10 + j, fatura_id=i, urun_id=j + 1, miktar=2, birim_id=1,
+                                birim_fiyat=12.5, kdv_orani=18, brut_tutar=25.0, net_tutar=29.5)
+            detay.urun_adi = f"Ürün {j} - Şeker"
+            detay.birim_adi = 'Kilogram'
+            fatura.detaylar.append(detay)
+        faturalar.append(fatura)
+    return faturalar
+
+
+def urun_payload(count):
+    urunler = []
+    for i in range(1, count + 1):
+        urun = Urun(id=i, barkod=f"869{i:010d}", kisa_adi=f"ÜRN{i}", adi=f"Ürün {i} Işıklı Çay",
+                    birim_id=1, kdv=18, aciklama=None)
+        urun.birim_adi = 'Adet'
+        urunler.append(urun)
+    return urunler
+
+
+def timed(func, repeat):
+    """En iyi süre (ms) ve son sonuç"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(name, objects, app, repeat):
+    standard = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+
+    def current():
+        return standard.dumps({'success': True, 'data': [obj.to_dict() for obj in objects], 'total': len(objects)},
+                              separators=(',', ':')).encode('utf-8')
+
+    def faster():
+        return fast.dumps({'success': True, 'data': [obj.to_dict() for obj in objects], 'total': len(objects)},
+                          separators=(',', ':')).encode('utf-8')
+
+    print(f"\n📦 {name} ({len(objects)} kayıt)")
+    base_ms, body = timed(current, repeat)
+    print(f"   json (mevcut)     : {base_ms:8.1f} ms  {len(body) / 1024:9.1f} KB")
+    fast_ms, fast_body = timed(faster, repeat)
+    print(f"   {fast.backend:<18}: {fast_ms:8.1f} ms  {len(fast_body) / 1024:9.1f} KB  ({base_ms / fast_ms:.1f}x)")
+
+    for level in (1, 6, 9):
+        ms, data = timed(lambda: gzip.compress(fast_body, compresslevel=level), repeat)
+        print(f"   gzip {level}            : {ms:8.1f} ms  {len(data) / 1024:9.1f} KB")
+    if brotli is not None:
+        for quality in (1, 4, 8):
+            ms, data = timed(lambda: brotli.compress(fast_body, quality=quality), repeat)
+            print(f"   brotli {quality}          : {ms:8.1f} ms  {len(data) / 1024:9.1f} KB")
+    else:
+        print("   brotli            : kurulu değil")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON serileştirme ve sıkıştırma karşılaştırması')
+    parser.add_argument('--faturalar', type=int, default=2000, help='Fatura sayısı')
+    parser.add_argument('--detay', type=int, default=5, help='Fatura başına detay satırı')
+    parser.add_argument('--urunler', type=int, default=20000, help='Ürün sayısı')
+    parser.add_argument('--repeat', type=int, default=5, help='Tekrar (en iyi süre alınır)')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    if orjson is None:
+        print("⚠️ orjson kurulu değil - hızlı yol standart json'a düşer")
+
+    run('/api/fatura?include=detaylar', fatura_payload(args.faturalar, args.detay), app, args.repeat)
+    run('/api/urun', urun_payload(args.urunler), app, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,333 @@
+"""HTTP yük testi - uç nokta başına throughput ve p50/p95/p99 gecikme
+
+create_app() aynı process içinde gerçek bir HTTP sunucusunda (werkzeug, threaded)
+başlatılır ya da --url ile çalışan bir sunucu hedeflenir. Veritabanı config.py'deki
+DB_HOST/DB_NAME/DB_USER ortam değişkenlerinden okunur; üretim verisine dokunmamak için yerel bir
+MySQL/MariaDB (ör. docker) veritabanı gösterin - fatura iş yükü kayıt ekler.
+
+İş yükleri (--mix ile ağırlıklandırılır):
+    list    GET /api/cari, /api/urun, /api/fatura (?limit=...)
+    detail  GET /api/cari/<id>, /api/urun/<id>, /api/fatura/<id>
+    fatura  POST /api/fatura (--lines satırlı)
+    panel   GET /, /cariler, /urunler, /faturalar (oturum açılmış web paneli)
+
+Sonuçlar JSON olarak yazılır (--output). --baseline verilirse p95 ve throughput
+karşılaştırılır; --tolerance'ı aşan gerileme varsa çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmark_load.py --concurrency 8 --duration 30 --output sonuc.json
+    python benchmark_load.py --baseline baseline.json --tolerance 0.15
+    python benchmark_load.py --output baseline.json   # baseline kaydet
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime
+
+import requests
+
+WORKLOADS = ('list', 'detail', 'fatura', 'panel')
+PANEL_PAGES = ('/', '/cariler', '/urunler', '/faturalar')
+
+
+def percentile(sorted_values, pct):
+    """Sıralı listede en yakın sıra (nearest-rank) yüzdeliği"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    """Thread-safe gecikme toplayıcı - uç nokta adı -> süreler (sn) ve hata sayısı"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def add(self, name, elapsed, ok):
+        with self._lock:
+            self.latencies[name].append(elapsed)
+            if not ok:
+                self.errors[name] += 1
+
+    def summary(self, wall_time):
+        """Uç nokta başına istatistikler (ms) ve genel toplam"""
+        endpoints = {}
+        everything = []
+        for name in sorted(self.latencies):
+            values = sorted(self.latencies[name])
+            everything.extend(values)
+            endpoints[name] = self._stats(values, self.errors[name], wall_time)
+        everything.sort()
+        total = self._stats(everything, sum(self.errors.values()), wall_time)
+        return endpoints, total
+
+    @staticmethod
+    def _stats(values, errors, wall_time):
+        return {
+            'count': len(values),
+            'errors': errors,
+            'throughput_rps': round(len(values) / wall_time, 2) if wall_time else 0.0,
+            'mean_ms': round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+            'p50_ms': round(percentile(values, 50) * 1000, 2),
+            'p95_ms': round(percentile(values, 95) * 1000, 2),
+            'p99_ms': round(percentile(values, 99) * 1000, 2),
+            'max_ms': round(values[-1] * 1000, 2) if values else 0.0
+        }
+
+
+def start_local_server():
+    """create_app()'i boş bir portta arka planda başlatır - (base_url, server)"""
+    from werkzeug.serving import make_server
+    from app import create_app
+
+    server = make_server('127.0.0.1', 0, create_app(), threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+def api_login(base_url, username, password):
+    response = requests.post(f"{base_url}/api/auth/login",
+                             json={'username': username, 'password': password}, timeout=30)
+    if response.status_code != 200:
+        raise RuntimeError(f"API girişi başarısız ({response.status_code}): {response.text[:200]}")
+    return response.json()['access_token']
+
+
+def discover_ids(base_url, headers, sample):
+    """Detay ve fatura iş yükleri için mevcut kayıt id'lerini toplar"""
+    ids = {}
+    urunler = []
+    for resource in ('cari', 'urun', 'fatura'):
+        response = requests.get(f"{base_url}/api/{resource}", headers=headers,
+                                params={'limit': sample}, timeout=60)
+        response.raise_for_status()
+        data = response.json()['data']
+        ids[resource] = [item['id'] for item in data]
+        if resource == 'urun':
+            urunler = [item for item in data if item.get('birim_id')]
+    return ids, urunler
+
+
+class Worker(threading.Thread):
+    """Tek bir sanal kullanıcı - kendi HTTP oturumu ve rastgele üreteciyle"""
+
+    def __init__(self, index, options, recorder, deadline, remaining, remaining_lock):
+        super().__init__(daemon=True)
+        self.options = options
+        self.recorder = recorder
+        self.deadline = deadline
+        self.remaining = remaining
+        self.remaining_lock = remaining_lock
+        self.random = random.Random(options.seed + index)
+        self.session = requests.Session()
+        self.session.headers['Authorization'] = f"Bearer {options.token}"
+        self.panel = None
+
+    def _take(self):
+        """Süre/istek bütçesinden bir iterasyon ayırır"""
+        if time.perf_counter() >= self.deadline:
+            return False
+        if self.remaining is None:
+            return True
+        with self.remaining_lock:
+            if self.remaining[0] <= 0:
+                return False
+            self.remaining[0] -= 1
+            return True
+
+    def _request(self, name, method, url, session=None, **kwargs):
+        session = session or self.session
+        started = time.perf_counter()
+        ok = False
+        try:
+            response = session.request(method, self.options.base_url + url, timeout=60, **kwargs)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            pass
+        self.recorder.add(name, time.perf_counter() - started, ok)
+
+    def do_list(self):
+        resource = self.random.choice(('cari', 'urun', 'fatura'))
+        self._request(f"GET /api/{resource}", 'GET', f"/api/{resource}",
+                      params={'limit': self.options.page_size})
+
+    def do_detail(self):
+        choices = [resource for resource in ('cari', 'urun', 'fatura') if self.options.ids[resource]]
+        if not choices:
+            return
+        resource = self.random.choice(choices)
+        item_id = self.random.choice(self.options.ids[resource])
+        self._request(f"GET /api/{resource}/<id>", 'GET', f"/api/{resource}/{item_id}")
+
+    def do_fatura(self):
+        if not self.options.ids['cari'] or not self.options.urunler:
+            return
+        detaylar = []
+        for urun in self.random.sample(self.options.urunler, min(self.options.lines, len(self.options.urunler))):
+            detaylar.append({
+                'urun_id': urun['id'],
+                'birim_id': urun['birim_id'],
+                'miktar': self.random.randint(1, 10),
+                'birim_fiyat': round(self.random.uniform(1, 500), 2),
+                'kdv_orani': urun.get('kdv') or 20
+            })
+        self._request(f"POST /api/fatura ({self.options.lines} satır)", 'POST', '/api/fatura', json={
+            'fatura_tarihi': date.today().isoformat(),
+            'cari_id': self.random.choice(self.options.ids['cari']),
+            'aciklama': 'benchmark_load',
+            'detaylar': detaylar
+        })
+
+    def do_panel(self):
+        if self.panel is None:
+            # Web paneli oturumu (session cookie) - girişin kendisi ölçülmez
+            self.panel = requests.Session()
+            self.panel.post(self.options.base_url + '/login', timeout=60, data={
+                'username': self.options.username,
+                'password': self.options.password
+            })
+        page = self.random.choice(PANEL_PAGES)
+        self._request(f"GET {page} (panel)", 'GET', page, session=self.panel, allow_redirects=False)
+
+    def run(self):
+        names, weights = zip(*self.options.mix.items())
+        actions = [getattr(self, f"do_{name}") for name in names]
+        while self._take():
+            self.random.choices(actions, weights)[0]()
+
+
+def parse_mix(value):
+    """'list=4,detail=4,fatura=1,panel=1' -> {iş yükü: ağırlık}"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.strip().partition('=')
+        if name not in WORKLOADS:
+            raise argparse.ArgumentTypeError(f"Bilinmeyen iş yükü: {name} (geçerli: {', '.join(WORKLOADS)})")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("En az bir iş yükünün ağırlığı sıfırdan büyük olmalı")
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def compare(result, baseline, tolerance):
+    """Baseline'a göre gerilemeler - [(uç nokta, metrik, baseline, şimdi)]"""
+    regressions = []
+    for name, current in result['endpoints'].items():
+        base = baseline.get('endpoints', {}).get(name)
+        if not base or not base['count'] or not current['count']:
+            continue
+        if base['p95_ms'] and current['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+            regressions.append((name, 'p95_ms', base['p95_ms'], current['p95_ms']))
+        if current['throughput_rps'] < base['throughput_rps'] * (1 - tolerance):
+            regressions.append((name, 'throughput_rps', base['throughput_rps'], current['throughput_rps']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP yük testi ve baseline karşılaştırması')
+    parser.add_argument('--url', default=None, help='Çalışan sunucu (varsayılan: create_app() yerelde başlatılır)')
+    parser.add_argument('--username', default=os.getenv('BENCH_USERNAME', 'admin'), help='Giriş kullanıcı adı')
+    parser.add_argument('--password', default=os.getenv('BENCH_PASSWORD', '123456'), help='Giriş şifresi')
+    parser.add_argument('--concurrency', type=int, default=8, help='Eşzamanlı sanal kullanıcı')
+    parser.add_argument('--duration', type=float, default=30, help='Ölçüm süresi (sn)')
+    parser.add_argument('--requests', type=int, default=None, help='Toplam istek sınırı (süreden önce biterse)')
+    parser.add_argument('--warmup', type=float, default=3, help='Ölçülmeyen ısınma süresi (sn)')
+    parser.add_argument('--mix', type=parse_mix, default='list=4,detail=4,fatura=1,panel=1',
+                        help='İş yükü ağırlıkları (list, detail, fatura, panel)')
+    parser.add_argument('--lines', type=int, default=5, help='Oluşturulan fatura başına satır')
+    parser.add_argument('--page-size', type=int, default=50, help='Liste isteklerinde limit')
+    parser.add_argument('--sample', type=int, default=500, help='Detay iş yükü için toplanacak id sayısı')
+    parser.add_argument('--seed', type=int, default=42, help='Rastgele üretici tohumu')
+    parser.add_argument('--output', default=None, help='Sonuç JSON dosyası (varsayılan: stdout)')
+    parser.add_argument('--baseline', default=None, help='Karşılaştırılacak baseline JSON dosyası')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='İzin verilen gerileme oranı')
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        args.base_url = args.url.rstrip('/')
+    else:
+        args.base_url, server = start_local_server()
+        print(f"🚀 create_app() başlatıldı: {args.base_url}", file=sys.stderr)
+
+    try:
+        args.token = api_login(args.base_url, args.username, args.password)
+        args.ids, args.urunler = discover_ids(args.base_url, {'Authorization': f"Bearer {args.token}"}, args.sample)
+        print(f"📦 Kayıtlar: {len(args.ids['cari'])} cari, {len(args.ids['urun'])} ürün, "
+              f"{len(args.ids['fatura'])} fatura", file=sys.stderr)
+
+        if args.warmup > 0:
+            warmup = Recorder()
+            deadline = time.perf_counter() + args.warmup
+            workers = [Worker(i, args, warmup, deadline, None, None) for i in range(args.concurrency)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        recorder = Recorder()
+        remaining = [args.requests] if args.requests else None
+        remaining_lock = threading.Lock()
+        started = time.perf_counter()
+        deadline = started + args.duration
+        workers = [Worker(i, args, recorder, deadline, remaining, remaining_lock)
+                   for i in range(args.concurrency)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        wall_time = time.perf_counter() - started
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    endpoints, total = recorder.summary(wall_time)
+    result = {
+        'meta': {
+            'zaman': datetime.now().isoformat(timespec='seconds'),
+            'url': args.url or 'create_app()',
+            'concurrency': args.concurrency,
+            'duration_s': round(wall_time, 2),
+            'mix': args.mix,
+            'lines': args.lines,
+            'page_size': args.page_size
+        },
+        'total': total,
+        'endpoints': endpoints
+    }
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"💾 Sonuç yazıldı: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    print(f"📊 {total['count']} istek, {total['errors']} hata, {total['throughput_rps']} istek/sn, "
+          f"p50 {total['p50_ms']} ms, p95 {total['p95_ms']} ms, p99 {total['p99_ms']} ms", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.tolerance)
+        for name, metric, before, now in regressions:
+            print(f"❌ Gerileme: {name} {metric} {before} -> {now}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"✅ Baseline'a göre gerileme yok (tolerans: %{args.tolerance * 100:.0f})", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""Model katmanı mikro-benchmark'ları - süre ve tepe bellek
+
+Ölçülen işlemler (her biri 1k / 100k / 1M sentetik satırla):
+    hydrate.kwargs      cls(**item) - DictCursor satırından (get_by_id ve eski get_all yolu)
+    hydrate.from_rows   SlottedRow.from_rows - tuple cursor satırından (liste yolları)
+                        (dict'ler hazır verilir; DictCursor'ın dict oluşturma maliyeti dahil
+                        uçtan uca karşılaştırma için benchmark_rows.py)
+    to_dict             route'ların her kayıt için çağırdığı to_dict()
+    to_dict.fields      ?fields= ile daraltılmış to_dict(fields)
+    calculate_totals    FaturaDetay.calculate_totals (satır başına) ve
+                        Fatura.calculate_totals (satır dict'leri üzerinde döngü)
+
+Her işlem için en iyi süre (--repeat), satır başına ns ve tracemalloc ile
+ayrı bir çalıştırmada ölçülen tepe bellek (satır başına bayt) raporlanır.
+Veritabanı gerekmez. --output sonuçları JSON yazar; --baseline verilirse
+süre ya da tepe bellek --tolerance'tan fazla kötüleşen işlemler için çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmark_models.py
+    python benchmark_models.py --sizes 1000,100000 --only urun --repeat 5
+    python benchmark_models.py --output baseline.json
+    python benchmark_models.py --baseline baseline.json --tolerance 0.2
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from datetime import date
+from models.urun import Urun
+from models.cari import Cari
+from models.fatura import Fatura
+from models.fatura_detay import FaturaDetay
+
+URUN_COLUMNS = ('id', 'barkod', 'kisa_adi', 'adi', 'birim_id', 'kdv', 'aciklama')
+CARI_COLUMNS = ('id', 'adi_soyadi', 'tc_kimlik_no', 'aciklama')
+DETAY_COLUMNS = ('id', 'fatura_id', 'urun_id', 'miktar', 'birim_id', 'birim_fiyat', 'kdv_orani',
+                 'brut_tutar', 'net_tutar', 'aciklama', 'urun_adi')
+DETAY_PER_FATURA = 4
+
+
+def urun_rows(count):
+    return [(i, f"869{i:010d}", f"URN{i}", f"Ürün {i}", 1 + i % 20, 20, None) for i in range(1, count + 1)]
+
+
+def cari_rows(count):
+    return [(i, f"Cari {i}", f"{10000000000 + i}", None) for i in range(1, count + 1)]
+
+
+def detay_rows(count):
+    return [
+        (i, 1 + i // DETAY_PER_FATURA, 1 + i % 5000, float(1 + i % 10), 1 + i % 20, 12.5 + i % 100,
+         (1, 10, 20)[i % 3], 125.0, 150.0, '', f"Ürün {i % 5000}")
+        for i in range(1, count + 1)
+    ]
+
+
+def as_dicts(columns, rows):
+    """DictCursor çıktısının karşılığı"""
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def faturalar_with_detaylar(count):
+    """count detay satırını DETAY_PER_FATURA'lık faturalara dağıtır"""
+    detaylar = FaturaDetay.from_rows(DETAY_COLUMNS, detay_rows(count))
+    faturalar = []
+    for start in range(0, count, DETAY_PER_FATURA):
+        fatura = Fatura(id=start // DETAY_PER_FATURA + 1, fatura_tarihi=date(2025, 1, 1),
+                        fatura_no=f"FTR{start:011d}", cari_id=1, toplam_miktar=10, toplam_kdv=5, toplam_tutar=55)
+        fatura.cari_adi = 'Cari'
+        fatura.detaylar = detaylar[start:start + DETAY_PER_FATURA]
+        faturalar.append(fatura)
+    return faturalar
+
+
+def line_dicts(count):
+    return [
+        {'miktar': float(1 + i % 10), 'birim_fiyat': 12.5 + i % 100, 'kdv_orani': (1, 10, 20)[i % 3],
+         'brut_tutar': 125.0, 'net_tutar': 150.0}
+        for i in range(count)
+    ]
+
+
+def run_calculate_detay(lines):
+    calculate = FaturaDetay.calculate_totals
+    return [calculate(line['miktar'], line['birim_fiyat'], line['kdv_orani']) for line in lines]
+
+
+def run_calculate_fatura(lines):
+    fatura = Fatura()
+    fatura.calculate_totals(lines)
+    return fatura
+
+
+# (ad, hazırlık(n) -> veri, işlem(veri)) - hazırlık süresi ve belleği ölçülmez
+CASES = (
+    ('urun.hydrate.kwargs', lambda n: as_dicts(URUN_COLUMNS, urun_rows(n)),
+     lambda items: [Urun(**item) for item in items]),
+    ('urun.hydrate.from_rows', urun_rows,
+     lambda rows: Urun.from_rows(URUN_COLUMNS, rows)),
+    ('cari.hydrate.kwargs', lambda n: as_dicts(CARI_COLUMNS, cari_rows(n)),
+     lambda items: [Cari(**item) for item in items]),
+    ('cari.hydrate.from_rows', cari_rows,
+     lambda rows: Cari.from_rows(CARI_COLUMNS, rows)),
+    ('fatura_detay.hydrate.kwargs', lambda n: as_dicts(DETAY_COLUMNS, detay_rows(n)),
+     lambda items: [FaturaDetay(**item) for item in items]),
+    ('fatura_detay.hydrate.from_rows', detay_rows,
+     lambda rows: FaturaDetay.from_rows(DETAY_COLUMNS, rows)),
+    ('urun.to_dict', lambda n: Urun.from_rows(URUN_COLUMNS, urun_rows(n)),
+     lambda urunler: [urun.to_dict() for urun in urunler]),
+    ('urun.to_dict.fields', lambda n: Urun.from_rows(URUN_COLUMNS, urun_rows(n)),
+     lambda urunler: [urun.to_dict(['id', 'adi', 'barkod']) for urun in urunler]),
+    ('cari.to_dict', lambda n: Cari.from_rows(CARI_COLUMNS, cari_rows(n)),
+     lambda cariler: [cari.to_dict() for cari in cariler]),
+    ('fatura.to_dict.detaylar', faturalar_with_detaylar,
+     lambda faturalar: [fatura.to_dict() for fatura in faturalar]),
+    ('fatura_detay.calculate_totals', line_dicts, run_calculate_detay),
+    ('fatura.calculate_totals', line_dicts, run_calculate_fatura),
+)
+
+
+def measure(operation, data, repeat):
+    """(en iyi süre sn, tepe bellek bayt) - bellek ayrı, tracemalloc açık bir çalıştırmada ölçülür"""
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = operation(data)
+        elapsed = time.perf_counter() - started
+        del result
+        best = elapsed if best is None else min(best, elapsed)
+
+    gc.collect()
+    tracemalloc.start()
+    result = operation(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, peak
+
+
+def compare(results, baseline, tolerance):
+    """Baseline'a göre kötüleşen ölçümler - [(işlem, boyut, metrik, baseline, şimdi)]"""
+    previous = {(item['name'], item['size']): item for item in baseline.get('results', [])}
+    regressions = []
+    for item in results:
+        base = previous.get((item['name'], item['size']))
+        if not base:
+            continue
+        for metric in ('ns_per_row', 'peak_bytes_per_row'):
+            if base[metric] and item[metric] > base[metric] * (1 + tolerance):
+                regressions.append((item['name'], item['size'], metric, base[metric], item[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Model katmanı mikro-benchmark\'ları')
+    parser.add_argument('--sizes', default='1000,100000,1000000', help='Virgülle ayrılmış satır sayıları')
+    parser.add_argument('--repeat', type=int, default=3, help='Tekrar (en iyi süre alınır)')
+    parser.add_argument('--only', default=None, help='Sadece adında bu metin geçen işlemler')
+    parser.add_argument('--output', default=None, help='Sonuç JSON dosyası')
+    parser.add_argument('--baseline', default=None, help='Karşılaştırılacak baseline JSON dosyası')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='İzin verilen kötüleşme oranı')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    cases = [case for case in CASES if not args.only or args.only in case[0]]
+
+    results = []
+    for size in sizes:
+        print(f"📦 {size:,} satır")
+        for name, prepare, operation in cases:
+            data = prepare(size)
+            elapsed, peak = measure(operation, data, args.repeat)
+            del data
+            item = {
+                'name': name,
+                'size': size,
+                'seconds': round(elapsed, 6),
+                'ns_per_row': round(elapsed / size * 1e9, 1),
+                'rows_per_sec': round(size / elapsed),
+                'peak_bytes': peak,
+                'peak_bytes_per_row': round(peak / size, 1)
+            }
+            results.append(item)
+            print(f"   {name:<32}: {item['ns_per_row']:>9,.0f} ns/satır  {item['rows_per_sec']:>12,} satır/sn  "
+                  f"{item['peak_bytes_per_row']:>7,.0f} B/satır (tepe)  {peak / 1024 / 1024:8.1f} MB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'repeat': args.repeat, 'results': results},
+                      f, ensure_ascii=False, indent=2)
+        print(f"💾 Sonuç yazıldı: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, size, metric, before, now in regressions:
+            print(f"❌ Gerileme: {name} ({size:,}) {metric} {before} -> {now}")
+        if regressions:
+            return 1
+        print(f"✅ Baseline'a göre gerileme yok (tolerans: %{args.tolerance * 100:.0f})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
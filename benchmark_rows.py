@@ -0,0 +1,79 @@
+"""Satır modeli oluşturma (hydration) karşılaştırması
+
+Üç yol da aynı __slots__'lu Urun sınıfını kullanır; fark sadece oluşturma yolundadır:
+    dict + Urun(**item)    DictCursor satırı (dict oluşturma dahil) -> kwargs ile __init__
+    tuple + Urun(*row)     tuple cursor satırı -> konumsal __init__ (sadece tam kolon listesiyle mümkün)
+    tuple + from_rows      tuple cursor satırı -> Urun.from_rows(kolonlar, satırlar)
+
+Her yol için satır başına bellek (tracemalloc) ve saniyedeki satır sayısı
+ölçülür. Veritabanı gerekmez - satırlar bellekte üretilir.
+
+Kullanım:
+    python benchmark_rows.py --rows 100000 --repeat 3
+"""
+import argparse
+import time
+import tracemalloc
+from models.urun import Urun
+
+COLUMNS = ('id', 'barkod', 'kisa_adi', 'adi', 'birim_id', 'kdv', 'aciklama')
+
+
+def make_rows(count):
+    return [(i, f"869{i:010d}", f"URN{i}", f"Ürün {i}", 1 + i % 20, 18, None) for i in range(1, count + 1)]
+
+
+def kwargs(rows):
+    dict_rows = [dict(zip(COLUMNS, row)) for row in rows]  # DictCursor çıktısı
+    return [Urun(**item) for item in dict_rows]
+
+
+def positional(rows):
+    return [Urun(*row) for row in rows]
+
+
+def from_rows(rows):
+    return Urun.from_rows(COLUMNS, rows)
+
+
+def measure(func, rows, repeat):
+    """(en iyi süre sn, nesne başına bayt) - bellek DictCursor dict'leri dahil ayrılan tepe değerdir"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(rows)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    result = func(rows)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, current / len(rows), peak / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Satır modeli oluşturma karşılaştırması')
+    parser.add_argument('--rows', type=int, default=100000, help='Satır sayısı')
+    parser.add_argument('--repeat', type=int, default=3, help='Tekrar (en iyi süre alınır)')
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    print(f"📦 {args.rows} satır")
+    results = {}
+    for name, func in (('dict + Urun(**item)', kwargs), ('tuple + Urun(*row)', positional),
+                       ('tuple + from_rows', from_rows)):
+        elapsed, kept, peak = measure(func, rows, args.repeat)
+        results[name] = elapsed
+        print(f"   {name:<26}: {args.rows / elapsed:>10,.0f} satır/sn  "
+              f"{kept:6.0f} B/nesne (kalan)  {peak:6.0f} B/satır (tepe)  "
+              f"{kept * 100000 / 1024 / 1024:6.1f} MB/100k")
+
+    new = results['tuple + from_rows']
+    for name in ('dict + Urun(**item)', 'tuple + Urun(*row)'):
+        print(f"⚡ from_rows / {name}: {results[name] / new:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
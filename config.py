@@ -15,6 +15,67 @@ class Config:
     MYSQL_DB = os.getenv('DB_NAME', 'restdb')
     MYSQL_PORT = 3306
     
+    # Bağlantı Havuzu Ayarları
+    DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 1))
+    DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+    DB_POOL_MAX_LIFETIME = int(os.getenv('DB_POOL_MAX_LIFETIME', 3600))  # saniye
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))  # bağlantı bekleme süresi (sn)
+    DB_POOL_PING_INTERVAL = float(os.getenv('DB_POOL_PING_INTERVAL', 30))  # bu süreden uzun boşta kalan bağlantı ping'lenir
+    
+    # Fatura Ayarları
+    FATURA_DETAY_CHUNK_SIZE = int(os.getenv('FATURA_DETAY_CHUNK_SIZE', 500))  # tek INSERT'teki en fazla satır
+    FATURA_NO_TABLE = 'fatura_sayac'
+    CARI_OZET_SON_FATURA = int(os.getenv('CARI_OZET_SON_FATURA', 5))  # cari özetinde gösterilen son fatura sayısı
+    FATURA_NO_BLOCK_SIZE = int(os.getenv('FATURA_NO_BLOCK_SIZE', 10))  # worker başına ayrılan numara bloğu (en fazla boşluk)
+    
+    # Toplu Yükleme Ayarları
+    IMPORT_CHUNK_SIZE = int(os.getenv('IMPORT_CHUNK_SIZE', 500))  # transaction başına satır
+    IMPORT_MAX_ERRORS = int(os.getenv('IMPORT_MAX_ERRORS', 1000))  # raporda tutulan en fazla hata
+    
+    # Cache Ayarları
+    STATS_CACHE_TTL = int(os.getenv('STATS_CACHE_TTL', 30))  # Dashboard istatistikleri (sn)
+    BIRIM_CACHE_TTL = int(os.getenv('BIRIM_CACHE_TTL', 60))  # bellekteki birim tablosu en geç bu sürede yeniden okunur (sn)
+    BARKOD_CACHE_SIZE = int(os.getenv('BARKOD_CACHE_SIZE', 10000))  # barkod -> ürün LRU kayıt sayısı
+    BARKOD_CACHE_TTL = int(os.getenv('BARKOD_CACHE_TTL', 300))  # bulunan ürün kaydının cache süresi (sn)
+    BARKOD_MISS_TTL = int(os.getenv('BARKOD_MISS_TTL', 5))  # bulunamayan barkodun cache süresi (sn, 0: saklanmaz)
+    BARKOD_BATCH_MAX = int(os.getenv('BARKOD_BATCH_MAX', 500))  # toplu barkod sorgusunda en fazla barkod
+    ETAG_MAX_AGE = int(os.getenv('ETAG_MAX_AGE', 30))  # ETag'ler en geç bu sürede yenilenir - başka process/betik yazmaları için (sn, 0: kapalı)
+    ROW_VERSIONS_MAX = int(os.getenv('ROW_VERSIONS_MAX', 10000))  # sürümü ayrı tutulan en fazla kayıt (ETag'ler için)
+    
+    # Yanıt Sıkıştırma Ayarları
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'True').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))  # bu boyutun altındaki yanıtlar sıkıştırılmaz (bayt)
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))  # gzip seviyesi (1-9)
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))  # brotli kalitesi (0-11)
+    
+    # İzleme Ayarları
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'  # /metrics (Prometheus)
+    QUERY_PROFILER_ENABLED = os.getenv('QUERY_PROFILER_ENABLED', 'False').lower() == 'true'  # istek başına sorgu profili
+    SLOW_QUERY_MS = int(os.getenv('SLOW_QUERY_MS', 200))  # bu süreyi aşan sorgular loglanır (profil açıkken)
+    PROFILER_EXPLAIN = os.getenv('PROFILER_EXPLAIN', 'False').lower() == 'true'  # yavaş SELECT'ler için EXPLAIN
+    PROFILER_N1_THRESHOLD = int(os.getenv('PROFILER_N1_THRESHOLD', 3))  # aynı şekilde kaç sorgu N+1 sayılır
+    PROFILER_HISTORY = int(os.getenv('PROFILER_HISTORY', 50))  # /debug/queries'te tutulan istek sayısı
+    
+    # Giriş Ayarları
+    AUTH_BCRYPT_ROUNDS = int(os.getenv('AUTH_BCRYPT_ROUNDS', 12))  # yeni hash maliyeti; daha düşük maliyetli hash'ler girişte yenilenir
+    AUTH_HASH_WORKERS = int(os.getenv('AUTH_HASH_WORKERS', 2))  # bcrypt için ayrılan thread sayısı
+    AUTH_MAX_PENDING = int(os.getenv('AUTH_MAX_PENDING', 8))  # aynı anda işlenen/bekleyen en fazla giriş
+    AUTH_ADMISSION_WAIT = float(os.getenv('AUTH_ADMISSION_WAIT', 0.5))  # sıra dolu ise bekleme (sn), sonra 503
+    AUTH_VERIFY_TIMEOUT = float(os.getenv('AUTH_VERIFY_TIMEOUT', 5))  # şifre doğrulaması için en fazla bekleme (sn)
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 60))  # JWT kimliği -> kullanıcı profili cache süresi (sn)
+    
+    # Log Ayarları
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')  # kök seviye
+    LOG_LEVELS = os.getenv('LOG_LEVELS', '')  # modül bazında, ör. 'utils.database=DEBUG,services.auth=WARNING'
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # json (satır başına bir kayıt) | text (geliştirme)
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))  # kuyruk dolunca yeni kayıtlar atılır, istek beklemez
+    LOG_DEBUG_SAMPLE_RATE = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', 1.0))  # yazılan DEBUG kayıtlarının oranı (0-1)
+    
+    # Web Paneli Ayarları
+    # local: servis katmanı aynı process'te çağrılır, remote: API'ye HTTP ile gidilir
+    WEB_API_MODE = os.getenv('WEB_API_MODE', 'local')
+    WEB_API_BASE_URL = os.getenv('WEB_API_BASE_URL', 'http://localhost:5000')
+    
     # Sunucu Ayarları
     DEBUG = True
     HOST = '0.0.0.0'
@@ -0,0 +1,382 @@
+"""Deterministik sentetik veri üreteci (birim, urun, cari, fatura, fatura_detay)
+
+Aynı --seed, aynı sayılar ve aynı başlangıç durumu (tablolardaki en büyük id)
+ile her çalıştırma birebir aynı satırları üretir. Her tablonun kendi rastgele
+üreteci vardır; ör. --urun değiştirmek cari satırlarını değiştirmez.
+
+- urun: benzersiz, kontrol haneli EAN-13 barkod (869...), KDV %20/%10/%1
+- cari: geçerli kontrol haneli TC kimlik no (%90'ında), benzersiz ad
+- fatura: hafta içi/ay sonu yoğun, zamanla artan tarih dağılımı; az sayıda
+  cari ve ürün satışların çoğunu alır; satır sayısı 1 + geometrik dağılım
+- fatura_detay: brut/net tutarlar FaturaDetay.calculate_totals ile,
+  fatura toplamları Fatura.calculate_totals ile aynı formülle hesaplanır
+
+Yazma yolu varsayılan olarak LOAD DATA LOCAL INFILE'dır (sunucuda local_infile
+kapalıysa çok satırlı INSERT'e düşer). Yükleme sırasında unique_checks ve
+foreign_key_checks oturum için kapatılır - referanslar üretici tarafından
+geçerli tutulur. Sonunda cari_ozet ve günlük satış özetleri yeniden hesaplanır.
+
+Kullanım:
+    python generate_data.py --birim 10 --urun 20000 --cari 50000 --fatura 2500000
+    python generate_data.py --fatura 100000 --method insert --seed 7
+    python generate_data.py --urun 1000 --cari 1000 --fatura 5000 --dizin /tmp/veri   # sadece TSV dosyaları
+"""
+import argparse
+import bisect
+import itertools
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+import config
+
+ADLAR = ('Ahmet', 'Mehmet', 'Mustafa', 'Ali', 'Hüseyin', 'Hasan', 'İbrahim', 'Murat', 'Ömer', 'Yusuf',
+         'Ayşe', 'Fatma', 'Emine', 'Hatice', 'Zeynep', 'Elif', 'Meryem', 'Şerife', 'Zehra', 'Sultan')
+SOYADLAR = ('Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Yıldız', 'Yıldırım', 'Öztürk', 'Aydın', 'Özdemir',
+            'Arslan', 'Doğan', 'Kılıç', 'Aslan', 'Çetin', 'Kara', 'Koç', 'Kurt', 'Özkan', 'Şimşek')
+FIRMA_EKLERI = ('Ticaret Ltd. Şti.', 'Gıda A.Ş.', 'Market', 'İnşaat Ltd. Şti.', 'Tekstil A.Ş.')
+BIRIMLER = (('AD', 'Adet', 0.0), ('KG', 'Kilogram', 1.0), ('LT', 'Litre', 1.0), ('KL', 'Koli', 10.0),
+            ('PK', 'Paket', 0.5), ('MT', 'Metre', 0.0), ('GR', 'Gram', 0.001), ('TN', 'Ton', 1000.0),
+            ('M2', 'Metrekare', 0.0), ('DZ', 'Düzine', 0.0))
+KATEGORILER = ('Un', 'Şeker', 'Pirinç', 'Makarna', 'Çay', 'Kahve', 'Deterjan', 'Sabun', 'Kağıt Havlu',
+               'Süt', 'Peynir', 'Zeytinyağı', 'Ayçiçek Yağı', 'Bulgur', 'Mercimek', 'Salça', 'Su', 'Meyve Suyu')
+MARKALAR = ('Anadolu', 'Ege', 'Karadeniz', 'Marmara', 'Toros', 'Fırat', 'Kaçkar', 'Uludağ')
+KDV_ORANLARI = (20, 10, 1)
+KDV_AGIRLIK = (0.7, 0.2, 0.1)
+
+COLUMNS = {
+    'birim': ('id', 'kisa_adi', 'adi', 'kg_karsiligi', 'aciklama'),
+    'urun': ('id', 'barkod', 'kisa_adi', 'adi', 'birim_id', 'kdv', 'aciklama'),
+    'cari': ('id', 'adi_soyadi', 'tc_kimlik_no', 'aciklama'),
+    'fatura': ('id', 'fatura_tarihi', 'fatura_no', 'cari_id', 'toplam_miktar', 'toplam_kdv', 'toplam_tutar', 'aciklama'),
+    'fatura_detay': ('fatura_id', 'urun_id', 'miktar', 'birim_id', 'birim_fiyat', 'kdv_orani',
+                     'brut_tutar', 'net_tutar', 'aciklama'),
+}
+
+
+def tc_kimlik_no(n):
+    """n (>= 0) için benzersiz ve kontrol haneleri geçerli 11 haneli TC kimlik no"""
+    # 7919 asal ve 9*10^8 ile aralarında asal: n -> ilk 9 hane birebir eşlenir
+    digits = [int(c) for c in str(100000000 + (n * 7919) % 900000000)]
+    tek = digits[0] + digits[2] + digits[4] + digits[6] + digits[8]
+    cift = digits[1] + digits[3] + digits[5] + digits[7]
+    digits.append((tek * 7 - cift) % 10)
+    digits.append(sum(digits) % 10)
+    return ''.join(map(str, digits))
+
+
+def ean13(n):
+    """n (>= 0) için benzersiz, kontrol haneli EAN-13 barkod (Türkiye öneki 869)"""
+    body = f"869{(n * 7919) % 1000000000:09d}"
+    total = sum(int(c) * (3 if i % 2 else 1) for i, c in enumerate(body))
+    return body + str((10 - total % 10) % 10)
+
+
+def birim_fiyat(urun_id):
+    """Ürünün sabit liste fiyatı - id'den türetilir (mevcut ürünler için de aynı), 2.7-1100 TL"""
+    u = (urun_id * 2654435761 % 2 ** 32) / 2 ** 32
+    return round(math.exp(1 + u * 6), 2)
+
+
+def skewed(rng, items, power):
+    """Baştaki öğeleri tercih eden seçim - az sayıda cari/ürün satışların çoğunu alır"""
+    return items[int(len(items) * rng.random() ** power)]
+
+
+class Generator:
+    """Tablo satırlarını (tuple) üretir - her tablo kendi tohumlu rastgele üreteciyle"""
+
+    def __init__(self, seed, bitis, gun, ortalama_satir, max_satir):
+        self.seed = seed
+        self.ortalama_satir = ortalama_satir
+        self.max_satir = max_satir
+
+        # Tarih dağılımı: hafta sonu düşük, ay sonu yüksek, zamanla artan hacim
+        self.gunler = [bitis - timedelta(days=gun - 1 - i) for i in range(gun)]
+        weights = []
+        for i, gun_ in enumerate(self.gunler):
+            weight = (0.6, 0.3)[gun_.weekday() - 5] if gun_.weekday() >= 5 else 1.0
+            if gun_.day >= 25:
+                weight *= 1.3
+            weights.append(weight * (0.5 + i / gun))
+        self.gun_cum = list(itertools.accumulate(weights))
+
+    def _rng(self, table):
+        return random.Random(f"{self.seed}:{table}")
+
+    def birimler(self, start_id, count):
+        rng = self._rng('birim')
+        for i in range(count):
+            birim_id = start_id + i
+            # Ad id'den türetilir - tekrar çalıştırmada ve mevcut birimlerle çakışmaz
+            kisa_adi, adi, kg = BIRIMLER[birim_id % len(BIRIMLER)]
+            yield (birim_id, f"{kisa_adi}{birim_id}", f"{adi} {birim_id}", kg,
+                   'Sentetik' if rng.random() < 0.5 else None)
+
+    def urunler(self, start_id, count, birim_ids):
+        rng = self._rng('urun')
+        for i in range(count):
+            urun_id = start_id + i
+            kategori = rng.choice(KATEGORILER)
+            marka = rng.choice(MARKALAR)
+            kdv = rng.choices(KDV_ORANLARI, KDV_AGIRLIK)[0]
+            yield (urun_id, ean13(urun_id), f"{kategori[:3].upper()}{urun_id}",
+                   f"{marka} {kategori} {urun_id}", rng.choice(birim_ids), kdv, None)
+
+    def cariler(self, start_id, count):
+        rng = self._rng('cari')
+        for i in range(count):
+            cari_id = start_id + i
+            if rng.random() < 0.2:
+                adi = f"{rng.choice(SOYADLAR)} {rng.choice(FIRMA_EKLERI)} #{cari_id}"
+            else:
+                adi = f"{rng.choice(ADLAR)} {rng.choice(SOYADLAR)} #{cari_id}"
+            tc = tc_kimlik_no(cari_id) if rng.random() < 0.9 else None
+            yield (cari_id, adi, tc, None)
+
+    def faturalar(self, start_id, count, cari_ids, urunler, chunk_size):
+        """(fatura satırları, detay satırları) parçaları üretir - urunler: [(id, birim_id, kdv)]"""
+        rng = self._rng('fatura')
+        p = 1 / max(self.ortalama_satir, 1)
+        log_q = math.log(1 - p) if p < 1 else None
+        for chunk_start in range(0, count, chunk_size):
+            faturalar, detaylar = [], []
+            for fatura_id in range(start_id + chunk_start, start_id + min(chunk_start + chunk_size, count)):
+                tarih = self.gunler[bisect.bisect(self.gun_cum, rng.random() * self.gun_cum[-1])]
+                satir = 1 if log_q is None else 1 + int(math.log(1 - rng.random()) / log_q)
+                satir = min(satir, self.max_satir)
+
+                toplam_miktar = toplam_kdv = toplam_net = 0.0
+                for _ in range(satir):
+                    urun_id, birim_id, kdv = skewed(rng, urunler, 3)
+                    miktar = rng.randint(1, 10) if rng.random() < 0.8 else round(rng.uniform(0.1, 50), 3)
+                    fiyat = birim_fiyat(urun_id)
+                    # FaturaDetay.calculate_totals / Fatura.calculate_totals ile aynı hesap
+                    brut = miktar * fiyat
+                    net = brut + brut * kdv / 100
+                    toplam_miktar += miktar
+                    toplam_kdv += round(brut, 2) * kdv / 100
+                    toplam_net += round(net, 2)
+                    detaylar.append((fatura_id, urun_id, miktar, birim_id, fiyat, kdv,
+                                     round(brut, 2), round(net, 2), ''))
+
+                faturalar.append((fatura_id, tarih.isoformat(), f"GEN{fatura_id:012d}",
+                                  skewed(rng, cari_ids, 2), round(toplam_miktar, 3),
+                                  round(toplam_kdv, 2), round(toplam_net, 2), None))
+            yield faturalar, detaylar
+
+
+def _tsv_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, str):
+        return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+    return str(value)
+
+
+def to_tsv(rows):
+    """MySQL LOAD DATA varsayılan biçimi: sekme ayraçlı, \\N = NULL"""
+    return ''.join('\t'.join(map(_tsv_value, row)) + '\n' for row in rows)
+
+
+class FileWriter:
+    """Satırları <dizin>/<tablo>.tsv dosyalarına ekler (veritabanı gerekmez)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        for table in COLUMNS:
+            open(os.path.join(directory, f"{table}.tsv"), 'w').close()
+
+    def max_id(self, table):
+        return 0
+
+    def existing(self, query):
+        return []
+
+    def write(self, table, rows):
+        with open(os.path.join(self.directory, f"{table}.tsv"), 'a', encoding='utf-8', newline='\n') as f:
+            f.write(to_tsv(rows))
+
+    def close(self):
+        pass
+
+
+class DbWriter:
+    """Ayrı bir bağlantı üzerinden toplu yükleme - LOAD DATA LOCAL INFILE ya da çok satırlı INSERT"""
+
+    def __init__(self, method, insert_batch):
+        import pymysql
+
+        self.method = method
+        self.insert_batch = insert_batch
+        self.connection = pymysql.connect(
+            host=config.Config.MYSQL_HOST,
+            user=config.Config.MYSQL_USER,
+            password=config.Config.MYSQL_PASSWORD or '',
+            database=config.Config.MYSQL_DB,
+            port=config.Config.MYSQL_PORT,
+            charset='utf8mb4',
+            local_infile=method == 'load'
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute("SET SESSION unique_checks = 0, foreign_key_checks = 0")
+
+    def max_id(self, table):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+            return cursor.fetchone()[0]
+
+    def existing(self, query):
+        with self.connection.cursor() as cursor:
+            cursor.execute(query)
+            return cursor.fetchall()
+
+    def _load(self, cursor, table, rows):
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='\n', suffix='.tsv', delete=False) as f:
+            f.write(to_tsv(rows))
+        try:
+            cursor.execute(
+                f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 "
+                f"({', '.join(COLUMNS[table])})",
+                (f.name,)
+            )
+        finally:
+            os.unlink(f.name)
+
+    def _insert(self, cursor, table, rows):
+        columns = COLUMNS[table]
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+        # PyMySQL executemany INSERT ... VALUES sorgusunu tek çok satırlı sorguya çevirir
+        for start in range(0, len(rows), self.insert_batch):
+            cursor.executemany(query, rows[start:start + self.insert_batch])
+
+    def write(self, table, rows):
+        if not rows:
+            return
+        with self.connection.cursor() as cursor:
+            if self.method == 'load':
+                try:
+                    self._load(cursor, table, rows)
+                except Exception as e:
+                    # local_infile sunucuda/istemcide kapalı: INSERT yoluna geç
+                    print(f"⚠️ LOAD DATA kullanılamadı ({e}), çok satırlı INSERT kullanılacak")
+                    self.connection.rollback()
+                    self.method = 'insert'
+                    self._insert(cursor, table, rows)
+            else:
+                self._insert(cursor, table, rows)
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+def write_table(writer, table, rows, chunk_size):
+    """Üreteci parça parça yazar - yazılan satır sayısını döndürür"""
+    total = 0
+    started = time.perf_counter()
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            break
+        writer.write(table, chunk)
+        total += len(chunk)
+    if total:
+        elapsed = time.perf_counter() - started
+        print(f"   {table:<12}: {total:>11,} satır  {elapsed:7.1f} sn  {total / elapsed:>10,.0f} satır/sn")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Deterministik sentetik veri üreteci')
+    parser.add_argument('--seed', type=int, default=42, help='Rastgele üretici tohumu')
+    parser.add_argument('--birim', type=int, default=10, help='Yeni birim sayısı (0: mevcutlar kullanılır)')
+    parser.add_argument('--urun', type=int, default=5000, help='Yeni ürün sayısı (0: mevcutlar kullanılır)')
+    parser.add_argument('--cari', type=int, default=10000, help='Yeni cari sayısı (0: mevcutlar kullanılır)')
+    parser.add_argument('--fatura', type=int, default=100000, help='Yeni fatura sayısı')
+    parser.add_argument('--ortalama-satir', type=float, default=4, help='Fatura başına ortalama satır')
+    parser.add_argument('--max-satir', type=int, default=50, help='Fatura başına en fazla satır')
+    parser.add_argument('--bitis', type=date.fromisoformat, default=date(2025, 12, 31),
+                        help='Son fatura günü (YYYY-MM-DD) - sabit varsayılan, tekrarlanabilirlik için')
+    parser.add_argument('--gun', type=int, default=730, help='Faturaların yayıldığı gün sayısı')
+    parser.add_argument('--method', choices=['load', 'insert'], default='load',
+                        help='Yazma yolu: LOAD DATA LOCAL INFILE ya da çok satırlı INSERT')
+    parser.add_argument('--chunk-size', type=int, default=200000, help='Yazma başına satır (fatura_detay)')
+    parser.add_argument('--insert-batch', type=int, default=5000, help='INSERT başına satır (--method insert)')
+    parser.add_argument('--dizin', default=None, help='Veritabanı yerine bu dizine <tablo>.tsv yaz')
+    parser.add_argument('--ozet-atla', action='store_true', help='cari_ozet ve satış özetlerini yeniden hesaplama')
+    args = parser.parse_args()
+
+    generator = Generator(args.seed, args.bitis, args.gun, args.ortalama_satir, args.max_satir)
+    try:
+        writer = FileWriter(args.dizin) if args.dizin else DbWriter(args.method, args.insert_batch)
+    except Exception as e:
+        print(f"❌ Veritabanı bağlantı hatası: {e}")
+        return 1
+
+    started = time.perf_counter()
+    print(f"🎲 Seed: {args.seed} -> {args.dizin or config.Config.MYSQL_DB}")
+    try:
+        start = writer.max_id('birim') + 1
+        write_table(writer, 'birim', generator.birimler(start, args.birim), args.chunk_size)
+        birim_ids = list(range(start, start + args.birim)) or \
+            [row[0] for row in writer.existing("SELECT id FROM birim ORDER BY id")]
+
+        start = writer.max_id('urun') + 1
+        if args.urun and not birim_ids:
+            raise ValueError('Ürün üretmek için en az bir birim gerekli (--birim)')
+        urunler = list(generator.urunler(start, args.urun, birim_ids))
+        write_table(writer, 'urun', urunler, args.chunk_size)
+        urunler = [(row[0], row[4], row[5]) for row in urunler] or \
+            [tuple(row) for row in writer.existing("SELECT id, birim_id, kdv FROM urun WHERE birim_id IS NOT NULL ORDER BY id")]
+
+        start = writer.max_id('cari') + 1
+        write_table(writer, 'cari', generator.cariler(start, args.cari), args.chunk_size)
+        cari_ids = list(range(start, start + args.cari)) or \
+            [row[0] for row in writer.existing("SELECT id FROM cari ORDER BY id")]
+
+        if args.fatura:
+            if not cari_ids or not urunler:
+                raise ValueError('Fatura üretmek için cari ve ürün gerekli (--cari, --urun)')
+            start = writer.max_id('fatura') + 1
+            # Parça başına ~chunk_size detay satırı düşecek kadar fatura
+            fatura_chunk = max(int(args.chunk_size / max(args.ortalama_satir, 1)), 1)
+            fatura_total = detay_total = 0
+            fatura_started = time.perf_counter()
+            for faturalar, detaylar in generator.faturalar(start, args.fatura, cari_ids, urunler, fatura_chunk):
+                writer.write('fatura', faturalar)
+                writer.write('fatura_detay', detaylar)
+                fatura_total += len(faturalar)
+                detay_total += len(detaylar)
+                print(f"   ... {fatura_total:,}/{args.fatura:,} fatura, {detay_total:,} satır", end='\r')
+            print()
+            elapsed = time.perf_counter() - fatura_started
+            print(f"   {'fatura':<12}: {fatura_total:>11,} satır  {elapsed:7.1f} sn  "
+                  f"{fatura_total / elapsed:>10,.0f} satır/sn")
+            print(f"   {'fatura_detay':<12}: {detay_total:>11,} satır  {elapsed:7.1f} sn  "
+                  f"{detay_total / elapsed:>10,.0f} satır/sn")
+    except Exception as e:
+        print(f"❌ Veri üretme hatası: {e}")
+        return 1
+    finally:
+        writer.close()
+
+    if args.fatura and not args.dizin and not args.ozet_atla:
+        from models.cari_ozet import CariOzet
+        from models.satis_rollup import SatisRollup
+
+        print("🔄 Özet tablolar yeniden hesaplanıyor...")
+        CariOzet.rebuild()
+        SatisRollup.rebuild()
+
+    print(f"✅ Tamamlandı: {time.perf_counter() - started:.1f} sn")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
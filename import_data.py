@@ -0,0 +1,34 @@
+import argparse
+import sys
+from services.importer import import_stream
+from services.errors import ServiceError
+
+def main():
+    parser = argparse.ArgumentParser(description='CSV/NDJSON dosyasından toplu ürün/cari/birim yükleme')
+    parser.add_argument('resource', choices=['urun', 'cari', 'birim'])
+    parser.add_argument('dosya', help='Yüklenecek dosya (- ise stdin)')
+    parser.add_argument('--format', choices=['csv', 'ndjson'], default=None,
+                        help='Dosya formatı (varsayılan: uzantıdan)')
+    args = parser.parse_args()
+
+    fmt = args.format or ('ndjson' if args.dosya.endswith(('.ndjson', '.jsonl')) else 'csv')
+
+    try:
+        if args.dosya == '-':
+            report = import_stream(args.resource, sys.stdin.buffer, fmt)
+        else:
+            with open(args.dosya, 'rb') as stream:
+                report = import_stream(args.resource, stream, fmt)
+    except ServiceError as e:
+        print(f"❌ {e.message}")
+        return 1
+
+    print(f"📥 Toplam: {report['total']}, yüklenen: {report['imported']}, hatalı: {report['failed']}")
+    for error in report['errors']:
+        print(f"  ❌ Satır {error['row']}: {error['error']}")
+    if report['errors_truncated']:
+        print("  ... (hata listesi kısaltıldı)")
+    return 0 if report['failed'] == 0 else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,20 @@
+import threading
+import time
 from utils.database import db
+from utils.cache import on_write, notify_write
+from utils.pagination import decode_cursor, keyset_page, estimate_count
+from utils.fields import select_list, pick
+from utils.rows import SlottedRow, as_float
+from utils.metrics import record_cache
+import config
+
+class Birim(SlottedRow):
+    __slots__ = ('id', 'kisa_adi', 'adi', 'kg_karsiligi', 'aciklama')
+    _COERCE = {'kg_karsiligi': as_float(1.0)}
+
+    # ?fields= ile istenebilecek alanlar (tablo kolonları)
+    FIELDS = ('id', 'kisa_adi', 'adi', 'kg_karsiligi', 'aciklama')
 
-class Birim:
     def __init__(self, id=None, kisa_adi=None, adi=None, kg_karsiligi=None, aciklama=None):
         self.id = id
         self.kisa_adi = kisa_adi
@@ -8,12 +22,12 @@ class Birim:
         self.kg_karsiligi = float(kg_karsiligi) if kg_karsiligi else 1.0
         self.aciklama = aciklama
     
-    @classmethod
-    def get_all(cls, filters=None):
-        """Tüm birimleri getirir"""
-        query = "SELECT * FROM birim WHERE 1=1"
+    @staticmethod
+    def _filter_clause(filters):
+        """Filtrelerden WHERE koşullarını ve parametreleri oluşturur"""
+        query = ""
         params = []
-        
+
         if filters:
             if filters.get('kisa_adi'):
                 query += " AND kisa_adi LIKE %s"
@@ -21,23 +35,56 @@ class Birim:
             if filters.get('adi'):
                 query += " AND adi LIKE %s"
                 params.append(f"%{filters['adi']}%")
-        
+
+        return query, params
+
+    @classmethod
+    def get_all(cls, filters=None, fields=None):
+        """Tüm birimleri getirir - filtresiz liste bellekteki tablodan gelir"""
+        where, params = cls._filter_clause(filters)
+        if not where:
+            return [cls(**item) for item in birim_cache.rows()]
+        query = f"SELECT {select_list(fields, cls.FIELDS)} FROM birim WHERE 1=1" + where
         query += " ORDER BY adi"
         result = db.execute_query(query, params, fetch=True)
         
         if result:
             return [cls(**item) for item in result]
         return []
+
+    @classmethod
+    def get_page(cls, filters=None, limit=50, after=None, fields=None):
+        """Keyset sayfalama ile birimleri getirir - (liste, sonraki cursor) döner"""
+        where, params = cls._filter_clause(filters)
+        query = f"SELECT {select_list(fields, cls.FIELDS, ('adi',))} FROM birim WHERE 1=1" + where
+
+        if after:
+            adi, birim_id = decode_cursor(after, 2)
+            query += " AND (adi > %s OR (adi = %s AND id > %s))"
+            params += [adi, adi, birim_id]
+
+        query += " ORDER BY adi, id LIMIT %s"
+        params.append(limit + 1)
+        result = db.execute_query(query, params, fetch=True) or []
+
+        rows, next_cursor = keyset_page(result, limit, lambda row: (row['adi'], row['id']))
+        return [cls(**item) for item in rows], next_cursor
+
+    @classmethod
+    def count(cls, filters=None, estimate=False):
+        """Birim sayısını döndürür - filtresiz tahmini sayım tablo taramaz"""
+        where, params = cls._filter_clause(filters)
+        if estimate and not where:
+            return estimate_count('birim')
+
+        result = db.execute_query("SELECT COUNT(*) as count FROM birim WHERE 1=1" + where, params, fetch=True)
+        return result[0]['count'] if result else 0
     
     @classmethod
-    def get_by_id(cls, birim_id):
-        """ID'ye göre birim getirir"""
-        query = "SELECT * FROM birim WHERE id = %s"
-        result = db.execute_query(query, (birim_id,), fetch=True)
-        
-        if result and len(result) > 0:
-            return cls(**result[0])
-        return None
+    def get_by_id(cls, birim_id, fields=None):
+        """ID'ye göre birim getirir (bellekteki tablodan - fields sadece yanıtı daraltır)"""
+        item = birim_cache.get(birim_id)
+        return cls(**item) if item else None
     
     def create(self):
         """Yeni birim oluşturur"""
@@ -45,6 +92,7 @@ class Birim:
         params = (self.kisa_adi, self.adi, self.kg_karsiligi, self.aciklama)
         
         new_id = db.execute_query(query, params)
+        notify_write('birim', new_id)
         if new_id:
             self.id = new_id
             return True
@@ -56,6 +104,7 @@ class Birim:
         params = (self.kisa_adi, self.adi, self.kg_karsiligi, self.aciklama, self.id)
         
         result = db.execute_query(query, params)
+        notify_write('birim', self.id)
         return result is not None
     
     def delete(self):
@@ -69,14 +118,97 @@ class Birim:
         
         query = "DELETE FROM birim WHERE id = %s"
         result = db.execute_query(query, (self.id,))
+        notify_write('birim', self.id)
         return result is not None
     
-    def to_dict(self):
-        """Birim bilgilerini dictionary'ye çevirir"""
+    def to_dict(self, fields=None):
+        """Birim bilgilerini dictionary'ye çevirir - fields verilirse sadece o alanlar"""
+        if fields is not None:
+            return pick(self, fields)
         return {
             'id': self.id,
             'kisa_adi': self.kisa_adi,
             'adi': self.adi,
             'kg_karsiligi': float(self.kg_karsiligi) if self.kg_karsiligi else 1.0,
             'aciklama': self.aciklama
-        }
\ No newline at end of file
+        }
+
+
+class BirimCache:
+    """Birim tablosunun bellekteki, sürümlü kopyası
+
+    Tablo birkaç düzine satırdan oluşur ve nadiren değişir; ilk erişimde
+    tamamı yüklenir, her yazmadan sonra yeniden okunup tek atamayla
+    (atomik olarak) değiştirilir. Başka process'lerin (diğer worker'lar,
+    import_data.py, elle SQL) yazmaları için görüntü ayrıca BIRIM_CACHE_TTL
+    dolunca yeniden okunur. Okuyucular kilit almaz, o anki
+    (sürüm, id -> satır, sıralı satırlar) görüntüsünü kullanır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None  # (sürüm, {id: satır}, [satırlar adi sırasıyla])
+        self._version = 0
+        self._expires = 0.0
+
+    def _load(self):
+        """Tabloyu okuyup görüntüyü değiştirir - okunamadıysa False"""
+        rows = db.execute_query("SELECT * FROM birim ORDER BY adi, id", fetch=True)
+        if rows is None:
+            return False
+        self._version += 1
+        self._snapshot = (self._version, {row['id']: row for row in rows}, rows)
+        self._expires = time.monotonic() + config.Config.BIRIM_CACHE_TTL
+        return True
+
+    def reload(self, table=None, row_id=None):
+        """Tabloyu yeniden okuyup görüntüyü değiştirir (on_write callback'i)"""
+        with self._lock:
+            try:
+                loaded = self._load()
+            except Exception:
+                # Yazma sonrası eski görüntü sunulmasın - sonraki erişim veritabanından okur
+                self._snapshot = None
+                raise
+            if not loaded:
+                self._snapshot = None
+
+    def _current(self):
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() < self._expires:
+            record_cache('birim', True)
+            return snapshot
+        record_cache('birim', False)
+        with self._lock:
+            if self._snapshot is None or time.monotonic() >= self._expires:
+                if not self._load() and self._snapshot is not None:
+                    # Süresi dolan görüntü yenilenemediyse eskisiyle devam, bir süre sonra tekrar denenir
+                    self._expires = time.monotonic() + config.Config.BIRIM_CACHE_TTL
+            snapshot = self._snapshot or (self._version, {}, [])
+        return snapshot
+
+    @property
+    def version(self):
+        return self._current()[0]
+
+    def rows(self):
+        """Tüm birim satırları (adi sırasıyla)"""
+        return [dict(row) for row in self._current()[2]]
+
+    def get(self, birim_id):
+        """ID'ye göre birim satırı - yoksa None"""
+        if birim_id is None:
+            return None
+        row = self._current()[1].get(int(birim_id))
+        return dict(row) if row else None
+
+    def adi(self, birim_id):
+        """Birim adı - ürün ve fatura satırlarındaki birim_adi alanı için"""
+        if birim_id is None:
+            return None
+        row = self._current()[1].get(int(birim_id))
+        return row['adi'] if row else None
+
+
+birim_cache = BirimCache()
+on_write('birim', birim_cache.reload)
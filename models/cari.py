@@ -1,49 +1,94 @@
+import logging
 from utils.database import db
+from utils.cache import notify_write
+from utils.pagination import decode_cursor, keyset_page, estimate_count
+from utils.fields import select_list, pick
+from utils.rows import SlottedRow
+
+logger = logging.getLogger(__name__)
+
+class Cari(SlottedRow):
+    __slots__ = ('id', 'adi_soyadi', 'tc_kimlik_no', 'aciklama')
+
+    # ?fields= ile istenebilecek alanlar (tablo kolonları)
+    FIELDS = ('id', 'adi_soyadi', 'tc_kimlik_no', 'aciklama')
 
-class Cari:
     def __init__(self, id=None, adi_soyadi=None, tc_kimlik_no=None, aciklama=None):
         self.id = id
         self.adi_soyadi = adi_soyadi
         self.tc_kimlik_no = tc_kimlik_no
         self.aciklama = aciklama
     
+    @staticmethod
+    def _filter_clause(filters):
+        """Filtrelerden WHERE koşullarını ve parametreleri oluşturur"""
+        query = ""
+        params = []
+
+        if filters:
+            if filters.get('adi_soyadi'):
+                query += " AND adi_soyadi LIKE %s"
+                params.append(f"%{filters['adi_soyadi']}%")
+            if filters.get('tc_kimlik_no'):
+                query += " AND tc_kimlik_no LIKE %s"
+                params.append(f"%{filters['tc_kimlik_no']}%")
+
+        return query, params
+
     @classmethod
-    def get_all(cls, filters=None):
+    def get_all(cls, filters=None, fields=None):
         """Tüm carileri getirir (filtreleme desteği ile)"""
         try:
-            query = "SELECT * FROM cari WHERE 1=1"
-            params = []
-            
-            if filters:
-                if filters.get('adi_soyadi'):
-                    query += " AND adi_soyadi LIKE %s"
-                    params.append(f"%{filters['adi_soyadi']}%")
-                if filters.get('tc_kimlik_no'):
-                    query += " AND tc_kimlik_no LIKE %s"
-                    params.append(f"%{filters['tc_kimlik_no']}%")
-            
+            where, params = cls._filter_clause(filters)
+            query = f"SELECT {select_list(fields, cls.FIELDS)} FROM cari WHERE 1=1" + where
             query += " ORDER BY adi_soyadi"
-            result = db.execute_query(query, params, fetch=True)
-            
-            if result:
-                return [cls(**item) for item in result]
-            return []
+            columns, rows = db.fetch_rows(query, params)
+            return cls.from_rows(columns, rows)
         except Exception as e:
-            print(f"❌ Cari get_all hatası: {e}")
+            logger.error("Cari get_all hatası: %s", e)
             return []
-    
+
+    @classmethod
+    def get_page(cls, filters=None, limit=50, after=None, fields=None):
+        """Keyset sayfalama ile carileri getirir - (liste, sonraki cursor) döner"""
+        where, params = cls._filter_clause(filters)
+        query = f"SELECT {select_list(fields, cls.FIELDS, ('adi_soyadi',))} FROM cari WHERE 1=1" + where
+
+        if after:
+            adi_soyadi, cari_id = decode_cursor(after, 2)
+            query += " AND (adi_soyadi > %s OR (adi_soyadi = %s AND id > %s))"
+            params += [adi_soyadi, adi_soyadi, cari_id]
+
+        query += " ORDER BY adi_soyadi, id LIMIT %s"
+        params.append(limit + 1)
+        columns, result = db.fetch_rows(query, params)
+
+        adi_index, id_index = columns.index('adi_soyadi'), columns.index('id')
+        rows, next_cursor = keyset_page(result, limit, lambda row: (row[adi_index], row[id_index]))
+        return cls.from_rows(columns, rows), next_cursor
+
+    @classmethod
+    def count(cls, filters=None, estimate=False):
+        """Cari sayısını döndürür - filtresiz tahmini sayım tablo taramaz"""
+        where, params = cls._filter_clause(filters)
+        if estimate and not where:
+            return estimate_count('cari')
+
+        result = db.execute_query("SELECT COUNT(*) as count FROM cari WHERE 1=1" + where, params, fetch=True)
+        return result[0]['count'] if result else 0
+
     @classmethod
-    def get_by_id(cls, cari_id):
+    def get_by_id(cls, cari_id, fields=None):
         """ID'ye göre cari getirir"""
         try:
-            query = "SELECT * FROM cari WHERE id = %s"
+            query = f"SELECT {select_list(fields, cls.FIELDS)} FROM cari WHERE id = %s"
             result = db.execute_query(query, (cari_id,), fetch=True)
             
             if result and len(result) > 0:
                 return cls(**result[0])
             return None
         except Exception as e:
-            print(f"❌ Cari get_by_id hatası: {e}")
+            logger.error("Cari get_by_id hatası: %s", e)
             return None
     
     def create(self):
@@ -53,6 +98,7 @@ class Cari:
         
         # execute_query exception fırlatabilir
         new_id = db.execute_query(query, params)
+        notify_write('cari', new_id)
         self.id = new_id
         return True
     
@@ -63,9 +109,10 @@ class Cari:
             params = (self.adi_soyadi, self.tc_kimlik_no, self.aciklama, self.id)
             
             result = db.execute_query(query, params)
+            notify_write('cari', self.id)
             return result is not None
         except Exception as e:
-            print(f"❌ Cari update hatası: {e}")
+            logger.error("Cari update hatası: %s", e)
             return False
     
     def delete(self):
@@ -73,13 +120,16 @@ class Cari:
         try:
             query = "DELETE FROM cari WHERE id = %s"
             result = db.execute_query(query, (self.id,))
+            notify_write('cari', self.id)
             return result is not None
         except Exception as e:
-            print(f"❌ Cari delete hatası: {e}")
+            logger.error("Cari delete hatası: %s", e)
             return False
     
-    def to_dict(self):
-        """Cari bilgilerini dictionary'ye çevirir"""
+    def to_dict(self, fields=None):
+        """Cari bilgilerini dictionary'ye çevirir - fields verilirse sadece o alanlar"""
+        if fields is not None:
+            return pick(self, fields)
         return {
             'id': self.id,
             'adi_soyadi': self.adi_soyadi,
@@ -0,0 +1,150 @@
+import threading
+from utils.database import db
+
+
+class CariOzet:
+    """Cari bazında fatura özeti (cari_ozet tablosu)
+
+    Satırlar fatura oluşturma/silme transaction'ı içinde artımlı olarak
+    güncellenir; okuma tek satırlık birincil anahtar sorgusudur. Tutarsızlık
+    (ör. elle yapılan SQL değişiklikleri) durumunda rebuild() ile fatura
+    tablosundan yeniden hesaplanır.
+    """
+
+    _table_ready = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def ensure_table(cls):
+        """Özet tablosunu ilk kullanımda oluşturur
+
+        DDL MySQL'de örtük commit yaptığından fatura transaction'ı başlamadan
+        ayrı bir bağlantıda çağrılmalıdır. Tablo yeni oluşturulduysa mevcut
+        faturalardan doldurulur; aksi halde önceki faturalar özette eksik kalır
+        ve silinmeleri sayaçları eksiye düşürür.
+        """
+        if cls._table_ready:
+            return
+        with cls._lock:
+            if cls._table_ready:
+                return
+            exists = db.execute_query("SHOW TABLES LIKE 'cari_ozet'", fetch=True)
+            db.execute_query("""
+            CREATE TABLE IF NOT EXISTS cari_ozet (
+                cari_id INT NOT NULL PRIMARY KEY,
+                fatura_sayisi INT NOT NULL DEFAULT 0,
+                toplam_tutar DECIMAL(15,2) NOT NULL DEFAULT 0,
+                toplam_kdv DECIMAL(15,2) NOT NULL DEFAULT 0,
+                ilk_fatura_tarihi DATE NULL,
+                son_fatura_tarihi DATE NULL
+            ) ENGINE=InnoDB
+            """)
+            if not exists:
+                cls._recompute()
+            cls._table_ready = True
+
+    @staticmethod
+    def apply_create(cursor, cari_id, fatura_tarihi, toplam_tutar, toplam_kdv):
+        """Yeni faturayı özete ekler - çağıranın transaction'ı içinde"""
+        cursor.execute("""
+        INSERT INTO cari_ozet (cari_id, fatura_sayisi, toplam_tutar, toplam_kdv, ilk_fatura_tarihi, son_fatura_tarihi)
+        VALUES (%s, 1, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            fatura_sayisi = fatura_sayisi + 1,
+            toplam_tutar = toplam_tutar + VALUES(toplam_tutar),
+            toplam_kdv = toplam_kdv + VALUES(toplam_kdv),
+            ilk_fatura_tarihi = LEAST(COALESCE(ilk_fatura_tarihi, VALUES(ilk_fatura_tarihi)), VALUES(ilk_fatura_tarihi)),
+            son_fatura_tarihi = GREATEST(COALESCE(son_fatura_tarihi, VALUES(son_fatura_tarihi)), VALUES(son_fatura_tarihi))
+        """, (cari_id, toplam_tutar, toplam_kdv, fatura_tarihi, fatura_tarihi))
+
+    @staticmethod
+    def apply_delete(cursor, cari_id, fatura_tarihi, toplam_tutar, toplam_kdv):
+        """Silinen faturayı özetten düşer - fatura satırı silindikten sonra, aynı transaction'da
+
+        İlk/son tarih sadece silinen fatura sınırdaysa carinin faturalarından yeniden okunur.
+        """
+        # Tarihler DATE() ile karşılaştırılır - kolon DATETIME olsa da sınır kontrolü doğru çalışır
+        cursor.execute("""
+        SELECT DATE(ilk_fatura_tarihi) as ilk, DATE(son_fatura_tarihi) as son, DATE(%s) as silinen
+        FROM cari_ozet WHERE cari_id = %s FOR UPDATE
+        """, (fatura_tarihi, cari_id))
+        row = cursor.fetchone()
+        if not row:
+            return
+
+        cursor.execute("""
+        UPDATE cari_ozet
+        SET fatura_sayisi = GREATEST(fatura_sayisi - 1, 0),
+            toplam_tutar = GREATEST(toplam_tutar - %s, 0),
+            toplam_kdv = GREATEST(toplam_kdv - %s, 0)
+        WHERE cari_id = %s
+        """, (toplam_tutar, toplam_kdv, cari_id))
+
+        if row['silinen'] in (row['ilk'], row['son']):
+            cursor.execute("""
+            UPDATE cari_ozet o
+            JOIN (SELECT MIN(fatura_tarihi) as ilk, MAX(fatura_tarihi) as son
+                  FROM fatura WHERE cari_id = %s) f
+            SET o.ilk_fatura_tarihi = f.ilk, o.son_fatura_tarihi = f.son
+            WHERE o.cari_id = %s
+            """, (cari_id, cari_id))
+
+    @classmethod
+    def get(cls, cari_id, son_fatura_limit=5):
+        """Carinin özeti ve son faturaları"""
+        cls.ensure_table()
+        result = db.execute_query("SELECT * FROM cari_ozet WHERE cari_id = %s", (cari_id,), fetch=True)
+        row = result[0] if result else {}
+
+        son_faturalar = db.execute_query("""
+        SELECT id, fatura_no, fatura_tarihi, toplam_tutar
+        FROM fatura WHERE cari_id = %s
+        ORDER BY fatura_tarihi DESC, id DESC LIMIT %s
+        """, (cari_id, son_fatura_limit), fetch=True) or []
+
+        return {
+            'cari_id': cari_id,
+            'fatura_sayisi': int(row.get('fatura_sayisi') or 0),
+            'toplam_tutar': float(row.get('toplam_tutar') or 0),
+            'toplam_kdv': float(row.get('toplam_kdv') or 0),
+            'ilk_fatura_tarihi': str(row['ilk_fatura_tarihi']) if row.get('ilk_fatura_tarihi') else None,
+            'son_fatura_tarihi': str(row['son_fatura_tarihi']) if row.get('son_fatura_tarihi') else None,
+            'son_faturalar': [{
+                'id': fatura['id'],
+                'fatura_no': fatura['fatura_no'],
+                'fatura_tarihi': str(fatura['fatura_tarihi']) if fatura['fatura_tarihi'] else None,
+                'toplam_tutar': float(fatura['toplam_tutar'] or 0)
+            } for fatura in son_faturalar]
+        }
+
+    @classmethod
+    def rebuild(cls, cari_id=None):
+        """Özet satırlarını fatura tablosundan yeniden hesaplar - güncellenen cari sayısını döner"""
+        cls.ensure_table()
+        return cls._recompute(cari_id)
+
+    @staticmethod
+    def _recompute(cari_id=None):
+        where = " WHERE cari_id = %s" if cari_id else ""
+        params = (cari_id,) if cari_id else ()
+
+        connection = db.get_connection()
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            cursor.execute("DELETE FROM cari_ozet" + where, params)
+            cursor.execute("""
+            INSERT INTO cari_ozet (cari_id, fatura_sayisi, toplam_tutar, toplam_kdv, ilk_fatura_tarihi, son_fatura_tarihi)
+            SELECT cari_id, COUNT(*), COALESCE(SUM(toplam_tutar), 0), COALESCE(SUM(toplam_kdv), 0),
+                   MIN(fatura_tarihi), MAX(fatura_tarihi)
+            FROM fatura""" + where + " GROUP BY cari_id", params)
+            count = cursor.rowcount
+            connection.commit()
+            return count
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+            connection.close()
@@ -1,8 +1,28 @@
+import logging
+from pymysql.cursors import SSDictCursor
 from utils.database import db
+from utils.cache import notify_write
+from utils.pagination import decode_cursor, keyset_page, estimate_count
+from utils.fields import select_list, pick
+from utils.rows import SlottedRow, as_float
+from utils.sequence import fatura_no_sequence
 from datetime import datetime
-from models.fatura_detay import FaturaDetay
+from models.fatura_detay import FaturaDetay, InvalidReferenceError
+from models.birim import birim_cache
+from models.cari_ozet import CariOzet
+from models.satis_rollup import SatisRollup
+
+logger = logging.getLogger(__name__)
+
+class Fatura(SlottedRow):
+    __slots__ = ('id', 'fatura_tarihi', 'fatura_no', 'cari_id', 'toplam_miktar', 'toplam_kdv',
+                 'toplam_tutar', 'aciklama', 'cari_adi', 'detaylar')
+    _COERCE = {'toplam_miktar': as_float(0.0), 'toplam_kdv': as_float(0.0), 'toplam_tutar': as_float(0.0)}
+
+    # Tablo kolonları ve ?fields= ile istenebilecek alanlar (cari_adi join ile, detaylar ayrı sorguyla)
+    COLUMNS = ('id', 'fatura_tarihi', 'fatura_no', 'cari_id', 'toplam_miktar', 'toplam_kdv', 'toplam_tutar', 'aciklama')
+    FIELDS = COLUMNS + ('cari_adi', 'detaylar')
 
-class Fatura:
     def __init__(self, id=None, fatura_tarihi=None, fatura_no=None, cari_id=None, 
                  toplam_miktar=None, toplam_kdv=None, toplam_tutar=None, aciklama=None, **kwargs):
         # **kwargs ekleyerek beklenmeyen parametreleri yakalıyoruz
@@ -19,17 +39,12 @@ class Fatura:
         self.cari_adi = None
         self.detaylar = []
     
-    @classmethod
-    def get_all(cls, filters=None):
-        """Tüm faturaları getirir (cari bilgisi ile)"""
-        query = """
-        SELECT f.*, c.adi_soyadi as cari_adi 
-        FROM fatura f 
-        LEFT JOIN cari c ON f.cari_id = c.id 
-        WHERE 1=1
-        """
+    @staticmethod
+    def _filter_clause(filters):
+        """Filtrelerden WHERE koşullarını ve parametreleri oluşturur"""
+        query = ""
         params = []
-        
+
         if filters:
             if filters.get('fatura_no'):
                 query += " AND f.fatura_no LIKE %s"
@@ -37,35 +52,75 @@ class Fatura:
             if filters.get('cari_adi'):
                 query += " AND c.adi_soyadi LIKE %s"
                 params.append(f"%{filters['cari_adi']}%")
+            if filters.get('cari_id'):
+                query += " AND f.cari_id = %s"
+                params.append(filters['cari_id'])
             if filters.get('baslangic_tarihi'):
                 query += " AND f.fatura_tarihi >= %s"
                 params.append(filters['baslangic_tarihi'])
             if filters.get('bitis_tarihi'):
                 query += " AND f.fatura_tarihi <= %s"
                 params.append(filters['bitis_tarihi'])
+
+        return query, params
+
+    @classmethod
+    def _select_from(cls, fields, filters=None, required=()):
+        """SELECT kolonları ve FROM kısmı - cari join'i sadece cari_adi istenirse/filtrelenirse"""
+        query = f"SELECT {select_list(fields, cls.COLUMNS, required, 'f.')}"
+        if fields is None or 'cari_adi' in fields:
+            return query + ", c.adi_soyadi as cari_adi FROM fatura f LEFT JOIN cari c ON f.cari_id = c.id"
+        if filters and filters.get('cari_adi'):
+            return query + " FROM fatura f LEFT JOIN cari c ON f.cari_id = c.id"
+        return query + " FROM fatura f"
+
+    @classmethod
+    def get_all(cls, filters=None, fields=None):
+        """Tüm faturaları getirir (cari bilgisi ile)"""
+        where, params = cls._filter_clause(filters)
+        query = cls._select_from(fields, filters) + " WHERE 1=1" + where
         
         query += " ORDER BY f.fatura_tarihi DESC, f.id DESC"
-        result = db.execute_query(query, params, fetch=True)
-        
-        if result:
-            faturalar = []
-            for item in result:
-                fatura = cls(**item)  # Artık **kwargs ile cari_adi'yi handle ediyor
-                fatura.cari_adi = item.get('cari_adi')  # Manuel olarak atıyoruz
-                faturalar.append(fatura)
-            return faturalar
-        return []
+        columns, rows = db.fetch_rows(query, params)
+        return cls.from_rows(columns, rows)  # cari_adi kolonu doğrudan slota yazılır
+
+    @classmethod
+    def get_page(cls, filters=None, limit=50, after=None, fields=None):
+        """Keyset sayfalama ile faturaları getirir - (liste, sonraki cursor) döner"""
+        where, params = cls._filter_clause(filters)
+        query = cls._select_from(fields, filters, ('fatura_tarihi',)) + " WHERE 1=1" + where
+
+        if after:
+            fatura_tarihi, fatura_id = decode_cursor(after, 2)
+            query += " AND (f.fatura_tarihi < %s OR (f.fatura_tarihi = %s AND f.id < %s))"
+            params += [fatura_tarihi, fatura_tarihi, fatura_id]
+
+        query += " ORDER BY f.fatura_tarihi DESC, f.id DESC LIMIT %s"
+        params.append(limit + 1)
+        columns, result = db.fetch_rows(query, params)
+
+        tarih_index, id_index = columns.index('fatura_tarihi'), columns.index('id')
+        rows, next_cursor = keyset_page(result, limit, lambda row: (row[tarih_index], row[id_index]))
+        return cls.from_rows(columns, rows), next_cursor
+
+    @classmethod
+    def count(cls, filters=None, estimate=False):
+        """Fatura sayısını döndürür - filtresiz tahmini sayım tablo taramaz"""
+        where, params = cls._filter_clause(filters)
+        if estimate and not where:
+            return estimate_count('fatura')
+
+        query = "SELECT COUNT(*) as count FROM fatura f"
+        if filters and filters.get('cari_adi'):
+            query += " LEFT JOIN cari c ON f.cari_id = c.id"
+        result = db.execute_query(query + " WHERE 1=1" + where, params, fetch=True)
+        return result[0]['count'] if result else 0
     
     @classmethod
-    def get_by_id(cls, fatura_id):
-        """ID'ye göre faturayı ve detaylarını getirir"""
+    def get_by_id(cls, fatura_id, fields=None):
+        """ID'ye göre faturayı ve detaylarını getirir (detaylar istenmemişse getirilmez)"""
         # Fatura başlık bilgisi
-        query = """
-        SELECT f.*, c.adi_soyadi as cari_adi 
-        FROM fatura f 
-        LEFT JOIN cari c ON f.cari_id = c.id 
-        WHERE f.id = %s
-        """
+        query = cls._select_from(fields) + " WHERE f.id = %s"
         result = db.execute_query(query, (fatura_id,), fetch=True)
         
         if not result or len(result) == 0:
@@ -76,10 +131,54 @@ class Fatura:
         fatura.cari_adi = item.get('cari_adi')  # Manuel atama
         
         # Fatura detaylarını getir
-        fatura.detaylar = FaturaDetay.get_by_fatura_id(fatura_id)
+        if fields is None or 'detaylar' in fields:
+            fatura.detaylar = FaturaDetay.get_by_fatura_id(fatura_id)
         
         return fatura
     
+    @classmethod
+    def iter_export(cls, filters=None):
+        """Fatura + detay satırlarını sunucu taraflı (unbuffered) cursor ile tek tek üretir"""
+        where, params = cls._filter_clause(filters)
+        query = """
+        SELECT f.id as fatura_id, f.fatura_no, f.fatura_tarihi, f.cari_id, c.adi_soyadi as cari_adi,
+               f.toplam_miktar, f.toplam_kdv, f.toplam_tutar, f.aciklama as fatura_aciklama,
+               fd.id as detay_id, fd.urun_id, u.adi as urun_adi, fd.miktar, fd.birim_id, NULL as birim_adi,
+               fd.birim_fiyat, fd.kdv_orani, fd.brut_tutar, fd.net_tutar, fd.aciklama as detay_aciklama
+        FROM fatura f 
+        LEFT JOIN cari c ON f.cari_id = c.id 
+        LEFT JOIN fatura_detay fd ON fd.fatura_id = f.id 
+        LEFT JOIN urun u ON fd.urun_id = u.id 
+        WHERE 1=1
+        """ + where + " ORDER BY f.fatura_tarihi, f.id, fd.id"
+
+        connection = db.get_connection()
+        cursor = connection.cursor(SSDictCursor)
+        completed = False
+        try:
+            cursor.execute(query, params)
+            for row in cursor:
+                row['birim_adi'] = birim_cache.adi(row['birim_id'])
+                yield row
+            completed = True
+        finally:
+            if completed:
+                cursor.close()
+            else:
+                # Yarıda kalan unbuffered sonucu okumak yerine bağlantıyı havuzdan çıkar
+                connection.broken = True
+            connection.close()
+    
+    @staticmethod
+    def load_detaylar(faturalar):
+        """Fatura listesinin detaylarını tek toplu sorguyla doldurur (N+1 yerine)"""
+        if not faturalar:
+            return faturalar
+        grouped = FaturaDetay.get_by_fatura_ids([fatura.id for fatura in faturalar])
+        for fatura in faturalar:
+            fatura.detaylar = grouped.get(fatura.id, [])
+        return faturalar
+    
     def calculate_totals(self, detaylar):
         """Toplamları hesaplar"""
         toplam_miktar = 0.0
@@ -97,8 +196,21 @@ class Fatura:
         self.toplam_kdv = toplam_kdv
         self.toplam_tutar = toplam_net
     
+    @staticmethod
+    def next_fatura_no():
+        """Günün serisinden sıradaki fatura numarasını ayırır (FTRYYYYMMDDNNNN)"""
+        tarih = datetime.now().strftime("%Y%m%d")
+        seri = f"FTR{tarih}"
+        return f"{seri}{fatura_no_sequence.next(seri):04d}"
+    
     def create_with_details(self, detaylar):
         """Faturayı ve detaylarını oluşturur (transaction)"""
+        # 1. Fatura numarası ayır - sayaç bağlantısı transaction açılmadan önce kullanılıp bırakılır
+        if not self.fatura_no:
+            self.fatura_no = self.next_fatura_no()
+        CariOzet.ensure_table()
+        SatisRollup.ensure_tables()
+        
         connection = db.get_connection()
         if not connection:
             return False
@@ -107,18 +219,13 @@ class Fatura:
         try:
             cursor = connection.cursor()
             
-            # 1. Fatura numarası oluştur (basit bir yöntem)
-            if not self.fatura_no:
-                tarih = datetime.now().strftime("%Y%m%d")
-                count_query = "SELECT COUNT(*) as count FROM fatura WHERE fatura_tarihi >= %s"
-                count_result = db.execute_query(count_query, (f"{tarih[:4]}-{tarih[4:6]}-{tarih[6:8]}",), fetch=True)
-                count = count_result[0]['count'] + 1 if count_result else 1
-                self.fatura_no = f"FTR{tarih}{count:04d}"
+            # 2. Cari/ürün/birim referanslarını tek sorguda doğrula
+            FaturaDetay.validate_references(cursor, self.cari_id, detaylar)
             
-            # 2. Toplamları hesapla
+            # 3. Toplamları hesapla
             self.calculate_totals(detaylar)
             
-            # 3. Fatura başlığını ekle
+            # 4. Fatura başlığını ekle
             fatura_query = """
             INSERT INTO fatura (fatura_tarihi, fatura_no, cari_id, toplam_miktar, toplam_kdv, toplam_tutar, aciklama) 
             VALUES (%s, %s, %s, %s, %s, %s, %s)
@@ -131,27 +238,25 @@ class Fatura:
             cursor.execute(fatura_query, fatura_params)
             fatura_id = cursor.lastrowid
             
-            # 4. Fatura detaylarını ekle
-            for detay in detaylar:
-                detay_query = """
-                INSERT INTO fatura_detay (fatura_id, urun_id, miktar, birim_id, birim_fiyat, kdv_orani, brut_tutar, net_tutar, aciklama) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                detay_params = (
-                    fatura_id, detay['urun_id'], detay['miktar'], detay['birim_id'],
-                    detay['birim_fiyat'], detay['kdv_orani'], detay['brut_tutar'], 
-                    detay['net_tutar'], detay.get('aciklama', '')
-                )
-                cursor.execute(detay_query, detay_params)
+            # 5. Fatura detaylarını toplu ekle
+            FaturaDetay.insert_many(cursor, fatura_id, detaylar)
             
-            # 5. Commit transaction
+            # 6. Cari özetini ve günlük satış özetlerini aynı transaction içinde güncelle
+            CariOzet.apply_create(cursor, self.cari_id, self.fatura_tarihi, self.toplam_tutar, self.toplam_kdv)
+            SatisRollup.apply(cursor, fatura_id, 1)
+            
+            # 7. Commit transaction
             connection.commit()
             self.id = fatura_id
+            notify_write('fatura', fatura_id)
             return True
             
+        except InvalidReferenceError:
+            connection.rollback()
+            raise
         except Exception as e:
             connection.rollback()
-            print(f"Fatura oluşturma hatası: {e}")
+            logger.error("Fatura oluşturma hatası: %s", e)
             return False
         finally:
             if cursor:
@@ -159,8 +264,13 @@ class Fatura:
             if connection:
                 connection.close()
     
-    def to_dict(self):
-        """Fatura bilgilerini dictionary'ye çevirir"""
+    def to_dict(self, fields=None):
+        """Fatura bilgilerini dictionary'ye çevirir - fields verilirse sadece o alanlar"""
+        if fields is not None:
+            return pick(self, fields, {
+                'fatura_tarihi': lambda f: str(f.fatura_tarihi) if f.fatura_tarihi else None,
+                'detaylar': lambda f: [detay.to_dict() for detay in f.detaylar]
+            })
         return {
             'id': self.id,
             'fatura_tarihi': str(self.fatura_tarihi) if self.fatura_tarihi else None,
@@ -1,6 +1,26 @@
 from utils.database import db
+from models.birim import birim_cache
+from utils.rows import SlottedRow, as_float, as_int
+import config
+
+
+class InvalidReferenceError(Exception):
+    """Fatura satırlarında var olmayan cari/ürün/birim referansı"""
+
+    def __init__(self, table, ids):
+        self.table = table
+        self.ids = sorted(ids)
+        super().__init__(f"Geçersiz {table} referansı: {', '.join(str(i) for i in self.ids)}")
+
+
+class FaturaDetay(SlottedRow):
+    __slots__ = ('id', 'fatura_id', 'urun_id', 'miktar', 'birim_id', 'birim_fiyat', 'kdv_orani',
+                 'brut_tutar', 'net_tutar', 'aciklama', 'urun_adi', 'birim_adi')
+    _COERCE = {
+        'miktar': as_float(0.0), 'birim_fiyat': as_float(0.0), 'kdv_orani': as_int(0),
+        'brut_tutar': as_float(0.0), 'net_tutar': as_float(0.0)
+    }
 
-class FaturaDetay:
     def __init__(self, id=None, fatura_id=None, urun_id=None, miktar=None, birim_id=None,
                  birim_fiyat=None, kdv_orani=None, brut_tutar=None, net_tutar=None, aciklama=None, **kwargs):
         # **kwargs ekleyerek beklenmeyen parametreleri yakalıyoruz
@@ -23,10 +43,9 @@ class FaturaDetay:
     def get_by_fatura_id(cls, fatura_id):
         """Fatura ID'ye göre detayları getirir"""
         query = """
-        SELECT fd.*, u.adi as urun_adi, b.adi as birim_adi 
+        SELECT fd.*, u.adi as urun_adi 
         FROM fatura_detay fd 
         LEFT JOIN urun u ON fd.urun_id = u.id 
-        LEFT JOIN birim b ON fd.birim_id = b.id 
         WHERE fd.fatura_id = %s
         ORDER BY fd.id
         """
@@ -37,11 +56,85 @@ class FaturaDetay:
             for item in result:
                 detay = cls(**item)  # **kwargs ile
                 detay.urun_adi = item.get('urun_adi')  # Manuel atama
-                detay.birim_adi = item.get('birim_adi')  # Manuel atama
+                detay.birim_adi = birim_cache.adi(detay.birim_id)  # Bellekteki birim tablosundan
                 detaylar.append(detay)
             return detaylar
         return []
+
+    @classmethod
+    def get_by_fatura_ids(cls, fatura_ids, chunk_size=1000):
+        """Birden fazla faturanın detaylarını IN sorgusuyla toplu getirir - {fatura_id: [detay]}"""
+        grouped = {fatura_id: [] for fatura_id in fatura_ids}
+        ids = list(grouped)
+
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            query = f"""
+            SELECT fd.*, u.adi as urun_adi 
+            FROM fatura_detay fd 
+            LEFT JOIN urun u ON fd.urun_id = u.id 
+            WHERE fd.fatura_id IN ({placeholders})
+            ORDER BY fd.fatura_id, fd.id
+            """
+            columns, rows = db.fetch_rows(query, chunk)
+
+            for detay in cls.from_rows(columns, rows):
+                detay.birim_adi = birim_cache.adi(detay.birim_id)
+                grouped[detay.fatura_id].append(detay)
+
+        return grouped
     
+    @staticmethod
+    def validate_references(cursor, cari_id, detaylar):
+        """Cari, ürün ve birim ID'lerini tek sorguda kontrol eder - eksik varsa InvalidReferenceError"""
+        wanted = {
+            'cari': {int(cari_id)} if cari_id else set(),
+            'urun': {int(d['urun_id']) for d in detaylar if d.get('urun_id')},
+            'birim': {int(d['birim_id']) for d in detaylar if d.get('birim_id')}
+        }
+
+        parts = []
+        params = []
+        for table, ids in wanted.items():
+            if ids:
+                placeholders = ', '.join(['%s'] * len(ids))
+                parts.append(f"SELECT '{table}' as tablo, id FROM {table} WHERE id IN ({placeholders})")
+                params.extend(ids)
+        if not parts:
+            return
+
+        cursor.execute(" UNION ALL ".join(parts), params)
+        found = {table: set() for table in wanted}
+        for row in cursor.fetchall():
+            found[row['tablo']].add(row['id'])
+
+        for table, ids in wanted.items():
+            missing = ids - found[table]
+            if missing:
+                raise InvalidReferenceError(table, missing)
+
+    @staticmethod
+    def insert_many(cursor, fatura_id, detaylar, chunk_size=None):
+        """Detayları sınırlı parçalar halinde çok satırlı INSERT ile ekler"""
+        chunk_size = chunk_size or config.Config.FATURA_DETAY_CHUNK_SIZE
+        query = """
+        INSERT INTO fatura_detay (fatura_id, urun_id, miktar, birim_id, birim_fiyat, kdv_orani, brut_tutar, net_tutar, aciklama) 
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        rows = [
+            (
+                fatura_id, detay['urun_id'], detay['miktar'], detay['birim_id'],
+                detay['birim_fiyat'], detay['kdv_orani'], detay['brut_tutar'],
+                detay['net_tutar'], detay.get('aciklama', '')
+            )
+            for detay in detaylar
+        ]
+
+        # PyMySQL executemany INSERT ... VALUES sorgusunu tek çok satırlı sorguya çevirir
+        for start in range(0, len(rows), chunk_size):
+            cursor.executemany(query, rows[start:start + chunk_size])
+
     @staticmethod
     def calculate_totals(miktar, birim_fiyat, kdv_orani):
         """Brut ve net tutarları hesaplar"""
@@ -0,0 +1,217 @@
+import threading
+from utils.database import db
+
+# Günlük satış özet tabloları - anahtar (tarih, urun_id) ve (tarih, cari_id)
+ROLLUP_TABLES = {
+    'satis_gun_urun': """
+    CREATE TABLE IF NOT EXISTS satis_gun_urun (
+        tarih DATE NOT NULL,
+        urun_id INT NOT NULL,
+        satir_sayisi INT NOT NULL DEFAULT 0,
+        miktar DECIMAL(15,3) NOT NULL DEFAULT 0,
+        brut_tutar DECIMAL(15,2) NOT NULL DEFAULT 0,
+        kdv_tutar DECIMAL(15,2) NOT NULL DEFAULT 0,
+        net_tutar DECIMAL(15,2) NOT NULL DEFAULT 0,
+        PRIMARY KEY (tarih, urun_id),
+        KEY idx_urun_tarih (urun_id, tarih)
+    ) ENGINE=InnoDB
+    """,
+    'satis_gun_cari': """
+    CREATE TABLE IF NOT EXISTS satis_gun_cari (
+        tarih DATE NOT NULL,
+        cari_id INT NOT NULL,
+        fatura_sayisi INT NOT NULL DEFAULT 0,
+        miktar DECIMAL(15,3) NOT NULL DEFAULT 0,
+        kdv_tutar DECIMAL(15,2) NOT NULL DEFAULT 0,
+        net_tutar DECIMAL(15,2) NOT NULL DEFAULT 0,
+        PRIMARY KEY (tarih, cari_id),
+        KEY idx_cari_tarih (cari_id, tarih)
+    ) ENGINE=InnoDB
+    """
+}
+
+# Fatura satırlarından ürün/cari özet satırlarını üreten SELECT'ler ({where} ve çarpan %s)
+_URUN_SELECT = """
+SELECT f.fatura_tarihi, fd.urun_id, COUNT(*) * %s, SUM(fd.miktar) * %s, SUM(fd.brut_tutar) * %s,
+       SUM(fd.net_tutar - fd.brut_tutar) * %s, SUM(fd.net_tutar) * %s
+FROM fatura f JOIN fatura_detay fd ON fd.fatura_id = f.id
+WHERE {where}
+GROUP BY f.fatura_tarihi, fd.urun_id
+"""
+
+_CARI_SELECT = """
+SELECT f.fatura_tarihi, f.cari_id, COUNT(*) * %s, SUM(f.toplam_miktar) * %s,
+       SUM(f.toplam_kdv) * %s, SUM(f.toplam_tutar) * %s
+FROM fatura f
+WHERE {where}
+GROUP BY f.fatura_tarihi, f.cari_id
+"""
+
+_URUN_INSERT = """
+INSERT INTO satis_gun_urun (tarih, urun_id, satir_sayisi, miktar, brut_tutar, kdv_tutar, net_tutar)
+""" + _URUN_SELECT
+
+_CARI_INSERT = """
+INSERT INTO satis_gun_cari (tarih, cari_id, fatura_sayisi, miktar, kdv_tutar, net_tutar)
+""" + _CARI_SELECT
+
+# Güncelleme kısmındaki sütunlar tablo adıyla nitelenir - SELECT'teki fatura_detay/fatura
+# sütunlarıyla aynı adları taşıdıklarından nitelenmezse MySQL belirsiz sütun hatası (1052) verir
+_URUN_UPSERT = """
+ON DUPLICATE KEY UPDATE
+    satis_gun_urun.satir_sayisi = satis_gun_urun.satir_sayisi + VALUES(satir_sayisi),
+    satis_gun_urun.miktar = satis_gun_urun.miktar + VALUES(miktar),
+    satis_gun_urun.brut_tutar = satis_gun_urun.brut_tutar + VALUES(brut_tutar),
+    satis_gun_urun.kdv_tutar = satis_gun_urun.kdv_tutar + VALUES(kdv_tutar),
+    satis_gun_urun.net_tutar = satis_gun_urun.net_tutar + VALUES(net_tutar)
+"""
+
+_CARI_UPSERT = """
+ON DUPLICATE KEY UPDATE
+    satis_gun_cari.fatura_sayisi = satis_gun_cari.fatura_sayisi + VALUES(fatura_sayisi),
+    satis_gun_cari.miktar = satis_gun_cari.miktar + VALUES(miktar),
+    satis_gun_cari.kdv_tutar = satis_gun_cari.kdv_tutar + VALUES(kdv_tutar),
+    satis_gun_cari.net_tutar = satis_gun_cari.net_tutar + VALUES(net_tutar)
+"""
+
+
+class SatisRollup:
+    """Günlük satış özetleri (tarih x ürün, tarih x cari)
+
+    Fatura oluşturma/silme transaction'ı içinde faturanın kendi satırlarıyla
+    artımlı güncellenir. Raporlar sadece bu tablolardan okur; maliyetleri
+    fatura sayısına değil gün x ürün/cari sayısına bağlıdır.
+    """
+
+    _tables_ready = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def ensure_tables(cls):
+        """Özet tablolarını ilk kullanımda oluşturur - fatura transaction'ı dışında çağrılmalıdır"""
+        if cls._tables_ready:
+            return
+        with cls._lock:
+            if not cls._tables_ready:
+                for ddl in ROLLUP_TABLES.values():
+                    db.execute_query(ddl)
+                cls._tables_ready = True
+
+    @staticmethod
+    def apply(cursor, fatura_id, sign=1):
+        """Tek faturanın katkısını özetlere ekler (sign=1) veya çıkarır (sign=-1)
+
+        Silmede fatura satırları silinmeden önce, aynı transaction içinde çağrılır.
+        """
+        where = "f.id = %s"
+        cursor.execute(_URUN_INSERT.format(where=where) + _URUN_UPSERT, [sign] * 5 + [fatura_id])
+        cursor.execute(_CARI_INSERT.format(where=where) + _CARI_UPSERT, [sign] * 4 + [fatura_id])
+
+        if sign < 0:
+            # Boşalan gün satırlarını temizle (sadece faturanın günü - birincil anahtar öneki)
+            cursor.execute("SELECT fatura_tarihi FROM fatura WHERE id = %s", (fatura_id,))
+            row = cursor.fetchone()
+            if row:
+                cursor.execute("DELETE FROM satis_gun_urun WHERE tarih = %s AND satir_sayisi <= 0",
+                               (row['fatura_tarihi'],))
+                cursor.execute("DELETE FROM satis_gun_cari WHERE tarih = %s AND fatura_sayisi <= 0",
+                               (row['fatura_tarihi'],))
+
+    @classmethod
+    def rebuild(cls, baslangic=None, bitis=None):
+        """Tarih aralığının özetlerini faturalardan yeniden hesaplar (geriye dönük doldurma/onarım)
+
+        Aralık verilmezse tüm tablolar yeniden kurulur. Yeniden yazılan gün sayısını döner.
+        """
+        cls.ensure_tables()
+        conditions = []
+        params = []
+        if baslangic:
+            conditions.append("tarih >= %s")
+            params.append(baslangic)
+        if bitis:
+            conditions.append("tarih <= %s")
+            params.append(bitis)
+        rollup_where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        fatura_where = " AND ".join(c.replace('tarih', 'f.fatura_tarihi') for c in conditions) or "1=1"
+
+        connection = db.get_connection()
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            cursor.execute("DELETE FROM satis_gun_urun" + rollup_where, params)
+            cursor.execute("DELETE FROM satis_gun_cari" + rollup_where, params)
+            cursor.execute(_URUN_INSERT.format(where=fatura_where), [1] * 5 + params)
+            cursor.execute(_CARI_INSERT.format(where=fatura_where), [1] * 4 + params)
+            cursor.execute("SELECT COUNT(DISTINCT tarih) as gun FROM satis_gun_cari" + rollup_where, params)
+            gun = cursor.fetchone()['gun']
+            connection.commit()
+            return gun
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+            connection.close()
+
+    @classmethod
+    def report(cls, grup, baslangic=None, bitis=None, limit=100):
+        """Özet tablolarından satış raporu - grup: gun, ay, urun, cari"""
+        cls.ensure_tables()
+        conditions = []
+        params = []
+        if baslangic:
+            conditions.append("r.tarih >= %s")
+            params.append(baslangic)
+        if bitis:
+            conditions.append("r.tarih <= %s")
+            params.append(bitis)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+        if grup in ('gun', 'ay'):
+            key = "r.tarih" if grup == 'gun' else "DATE_FORMAT(r.tarih, '%%Y-%%m')"
+            query = f"""
+            SELECT {key} as donem, SUM(r.fatura_sayisi) as fatura_sayisi, SUM(r.miktar) as miktar,
+                   SUM(r.kdv_tutar) as kdv_tutar, SUM(r.net_tutar) as net_tutar
+            FROM satis_gun_cari r{where}
+            GROUP BY donem ORDER BY donem
+            """
+        elif grup == 'urun':
+            query = f"""
+            SELECT s.urun_id, u.adi as urun_adi, s.satir_sayisi, s.miktar, s.brut_tutar, s.kdv_tutar, s.net_tutar
+            FROM (
+                SELECT r.urun_id, SUM(r.satir_sayisi) as satir_sayisi, SUM(r.miktar) as miktar,
+                       SUM(r.brut_tutar) as brut_tutar, SUM(r.kdv_tutar) as kdv_tutar, SUM(r.net_tutar) as net_tutar
+                FROM satis_gun_urun r{where}
+                GROUP BY r.urun_id ORDER BY net_tutar DESC LIMIT %s
+            ) s LEFT JOIN urun u ON u.id = s.urun_id
+            ORDER BY s.net_tutar DESC
+            """
+            params.append(limit)
+        elif grup == 'cari':
+            query = f"""
+            SELECT s.cari_id, c.adi_soyadi as cari_adi, s.fatura_sayisi, s.miktar, s.kdv_tutar, s.net_tutar
+            FROM (
+                SELECT r.cari_id, SUM(r.fatura_sayisi) as fatura_sayisi, SUM(r.miktar) as miktar,
+                       SUM(r.kdv_tutar) as kdv_tutar, SUM(r.net_tutar) as net_tutar
+                FROM satis_gun_cari r{where}
+                GROUP BY r.cari_id ORDER BY net_tutar DESC LIMIT %s
+            ) s LEFT JOIN cari c ON c.id = s.cari_id
+            ORDER BY s.net_tutar DESC
+            """
+            params.append(limit)
+        else:
+            raise ValueError("grup gun, ay, urun veya cari olmalıdır")
+
+        rows = db.execute_query(query, params, fetch=True) or []
+        for row in rows:
+            for key in ('miktar', 'brut_tutar', 'kdv_tutar', 'net_tutar'):
+                if key in row:
+                    row[key] = float(row[key] or 0)
+            for key in ('fatura_sayisi', 'satir_sayisi'):
+                if key in row:
+                    row[key] = int(row[key] or 0)
+            if 'donem' in row:
+                row['donem'] = str(row['donem'])
+        return rows
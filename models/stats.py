@@ -0,0 +1,49 @@
+from datetime import date, timedelta
+from utils.database import db
+from utils.cache import TTLCache, on_write
+import config
+
+_cache = TTLCache(config.Config.STATS_CACHE_TTL, name='stats')
+
+# Sayımlar bu tablolara yazıldığında geçersiz olur
+for _table in ('cari', 'urun', 'birim', 'fatura'):
+    on_write(_table, _cache.clear)
+
+
+class Stats:
+    @staticmethod
+    def _load():
+        """Tüm istatistikleri tek sorguda COUNT/SUM ile hesaplar"""
+        today = date.today()
+        tomorrow = today + timedelta(days=1)
+        month_start = today.replace(day=1)
+
+        query = """
+        SELECT
+            (SELECT COUNT(*) FROM cari) as cari_sayisi,
+            (SELECT COUNT(*) FROM urun) as urun_sayisi,
+            (SELECT COUNT(*) FROM birim) as birim_sayisi,
+            (SELECT COUNT(*) FROM fatura) as fatura_sayisi,
+            (SELECT COUNT(*) FROM fatura WHERE fatura_tarihi >= %s AND fatura_tarihi < %s) as bugun_fatura_sayisi,
+            (SELECT COALESCE(SUM(toplam_tutar), 0) FROM fatura WHERE fatura_tarihi >= %s AND fatura_tarihi < %s) as bugun_toplam,
+            (SELECT COALESCE(SUM(toplam_tutar), 0) FROM fatura WHERE fatura_tarihi >= %s AND fatura_tarihi < %s) as ay_toplam
+        """
+        params = (today, tomorrow, today, tomorrow, month_start, tomorrow)
+        result = db.execute_query(query, params, fetch=True)
+        row = result[0] if result else {}
+
+        return {
+            'cari_sayisi': int(row.get('cari_sayisi') or 0),
+            'urun_sayisi': int(row.get('urun_sayisi') or 0),
+            'birim_sayisi': int(row.get('birim_sayisi') or 0),
+            'fatura_sayisi': int(row.get('fatura_sayisi') or 0),
+            'bugun_fatura_sayisi': int(row.get('bugun_fatura_sayisi') or 0),
+            'bugun_toplam': float(row.get('bugun_toplam') or 0),
+            'ay_toplam': float(row.get('ay_toplam') or 0),
+            'tarih': str(today)
+        }
+
+    @classmethod
+    def get(cls):
+        """Dashboard istatistiklerini döndürür (kısa süreli cache ile)"""
+        return _cache.get('dashboard', cls._load)
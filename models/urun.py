@@ -1,6 +1,18 @@
 from utils.database import db
+from models.birim import birim_cache
+from utils.cache import notify_write
+from utils.pagination import decode_cursor, keyset_page, estimate_count
+from utils.fields import select_list, pick
+from utils.rows import SlottedRow, as_int
+
+class Urun(SlottedRow):
+    __slots__ = ('id', 'barkod', 'kisa_adi', 'adi', 'birim_id', 'kdv', 'aciklama', 'birim_adi')
+    _COERCE = {'kdv': as_int(0)}
+
+    # Tablo kolonları ve ?fields= ile istenebilecek alanlar (birim_adi bellekteki birim tablosundan)
+    COLUMNS = ('id', 'barkod', 'kisa_adi', 'adi', 'birim_id', 'kdv', 'aciklama')
+    FIELDS = COLUMNS + ('birim_adi',)
 
-class Urun:
     def __init__(self, id=None, barkod=None, kisa_adi=None, adi=None, birim_id=None, kdv=None, aciklama=None, **kwargs):
         # **kwargs ekleyerek beklenmeyen parametreleri yakalıyoruz
         self.id = id
@@ -14,17 +26,12 @@ class Urun:
         # İlişkili veriler
         self.birim_adi = None
 
-    @classmethod
-    def get_all(cls, filters=None):
-        """Tüm ürünleri getirir (birim bilgisi ile)"""
-        query = """
-        SELECT u.*, b.adi as birim_adi 
-        FROM urun u 
-        LEFT JOIN birim b ON u.birim_id = b.id 
-        WHERE 1=1
-        """
+    @staticmethod
+    def _filter_clause(filters):
+        """Filtrelerden WHERE koşullarını ve parametreleri oluşturur"""
+        query = ""
         params = []
-        
+
         if filters:
             if filters.get('barkod'):
                 query += " AND u.barkod LIKE %s"
@@ -38,26 +45,76 @@ class Urun:
             if filters.get('birim_id'):
                 query += " AND u.birim_id = %s"
                 params.append(filters['birim_id'])
+
+        return query, params
+
+    @classmethod
+    def _select(cls, fields, required=()):
+        """İstenen alanlar için u.* yerine kullanılacak kolon listesi"""
+        if fields and 'birim_adi' in fields:
+            required = tuple(required) + ('birim_id',)
+        return select_list(fields, cls.COLUMNS, required, 'u.')
+
+    @classmethod
+    def get_all(cls, filters=None, fields=None):
+        """Tüm ürünleri getirir (birim adı bellekteki birim tablosundan)"""
+        where, params = cls._filter_clause(filters)
+        query = f"""
+        SELECT {cls._select(fields)} 
+        FROM urun u 
+        WHERE 1=1
+        """ + where
         
         query += " ORDER BY u.adi"
-        result = db.execute_query(query, params, fetch=True)
+        columns, rows = db.fetch_rows(query, params)
         
-        if result:
-            urunler = []
-            for item in result:
-                urun = cls(**item)
-                urun.birim_adi = item.get('birim_adi')
-                urunler.append(urun)
-            return urunler
-        return []
+        urunler = cls.from_rows(columns, rows)
+        for urun in urunler:
+            urun.birim_adi = birim_cache.adi(urun.birim_id)
+        return urunler
+
+    @classmethod
+    def get_page(cls, filters=None, limit=50, after=None, fields=None):
+        """Keyset sayfalama ile ürünleri getirir - (liste, sonraki cursor) döner"""
+        where, params = cls._filter_clause(filters)
+        query = f"""
+        SELECT {cls._select(fields, ('adi',))} 
+        FROM urun u 
+        WHERE 1=1
+        """ + where
+
+        if after:
+            adi, urun_id = decode_cursor(after, 2)
+            query += " AND (u.adi > %s OR (u.adi = %s AND u.id > %s))"
+            params += [adi, adi, urun_id]
+
+        query += " ORDER BY u.adi, u.id LIMIT %s"
+        params.append(limit + 1)
+        columns, result = db.fetch_rows(query, params)
+
+        adi_index, id_index = columns.index('adi'), columns.index('id')
+        rows, next_cursor = keyset_page(result, limit, lambda row: (row[adi_index], row[id_index]))
+        urunler = cls.from_rows(columns, rows)
+        for urun in urunler:
+            urun.birim_adi = birim_cache.adi(urun.birim_id)
+        return urunler, next_cursor
+
+    @classmethod
+    def count(cls, filters=None, estimate=False):
+        """Ürün sayısını döndürür - filtresiz tahmini sayım tablo taramaz"""
+        where, params = cls._filter_clause(filters)
+        if estimate and not where:
+            return estimate_count('urun')
+
+        result = db.execute_query("SELECT COUNT(*) as count FROM urun u WHERE 1=1" + where, params, fetch=True)
+        return result[0]['count'] if result else 0
     
     @classmethod
-    def get_by_id(cls, urun_id):
+    def get_by_id(cls, urun_id, fields=None):
         """ID'ye göre ürün getirir"""
-        query = """
-        SELECT u.*, b.adi as birim_adi 
+        query = f"""
+        SELECT {cls._select(fields)} 
         FROM urun u 
-        LEFT JOIN birim b ON u.birim_id = b.id 
         WHERE u.id = %s
         """
         result = db.execute_query(query, (urun_id,), fetch=True)
@@ -65,16 +122,40 @@ class Urun:
         if result and len(result) > 0:
             item = result[0]
             urun = cls(**item)
-            urun.birim_adi = item.get('birim_adi')
+            urun.birim_adi = birim_cache.adi(urun.birim_id)
             return urun
         return None
     
+    @classmethod
+    def get_by_barkods(cls, barkodlar):
+        """Barkodlara tam eşleşme ile ürünleri getirir - {barkod: Urun} döner
+
+        LIKE yerine eşitlik kullanıldığından barkod üzerindeki UNIQUE indeks kullanılır.
+        """
+        if not barkodlar:
+            return {}
+        placeholders = ', '.join(['%s'] * len(barkodlar))
+        query = f"""
+        SELECT u.* 
+        FROM urun u 
+        WHERE u.barkod IN ({placeholders})
+        """
+        result = db.execute_query(query, list(barkodlar), fetch=True) or []
+        
+        urunler = {}
+        for item in result:
+            urun = cls(**item)
+            urun.birim_adi = birim_cache.adi(urun.birim_id)
+            urunler[urun.barkod] = urun
+        return urunler
+    
     def create(self):
         """Yeni ürün oluşturur"""
         query = "INSERT INTO urun (barkod, kisa_adi, adi, birim_id, kdv, aciklama) VALUES (%s, %s, %s, %s, %s, %s)"
         params = (self.barkod, self.kisa_adi, self.adi, self.birim_id, self.kdv, self.aciklama)
         
         new_id = db.execute_query(query, params)
+        notify_write('urun', new_id)
         if new_id:
             self.id = new_id
             return True
@@ -86,6 +167,7 @@ class Urun:
         params = (self.barkod, self.kisa_adi, self.adi, self.birim_id, self.kdv, self.aciklama, self.id)
         
         result = db.execute_query(query, params)
+        notify_write('urun', self.id)
         return result is not None
     
     def delete(self):
@@ -99,10 +181,13 @@ class Urun:
         
         query = "DELETE FROM urun WHERE id = %s"
         result = db.execute_query(query, (self.id,))
+        notify_write('urun', self.id)
         return result is not None
     
-    def to_dict(self):
-        """Ürün bilgilerini dictionary'ye çevirir"""
+    def to_dict(self, fields=None):
+        """Ürün bilgilerini dictionary'ye çevirir - fields verilirse sadece o alanlar"""
+        if fields is not None:
+            return pick(self, fields)
         return {
             'id': self.id,
             'barkod': self.barkod,
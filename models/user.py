@@ -1,5 +1,10 @@
+import logging
 import bcrypt
 from utils.database import db
+from utils.cache import notify_write
+import config
+
+logger = logging.getLogger(__name__)
 
 class User:
     def __init__(self, id=None, kullanici_adi=None, eposta=None, sifre_hash=None, 
@@ -14,10 +19,10 @@ class User:
         self.kayit_tarihi = kayit_tarihi
     
     @staticmethod
-    def hash_password(password):
-        """Şifreyi hash'ler"""
+    def hash_password(password, rounds=None):
+        """Şifreyi hash'ler - maliyet varsayılan olarak AUTH_BCRYPT_ROUNDS"""
         password_bytes = password.encode('utf-8')
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=rounds or config.Config.AUTH_BCRYPT_ROUNDS)
         hashed = bcrypt.hashpw(password_bytes, salt)
         return hashed.decode('utf-8')
     
@@ -30,17 +35,27 @@ class User:
             password_bytes = password.encode('utf-8')
             stored_hash_bytes = self.sifre_hash.encode('utf-8')
             
-            # Hash uzunluğunu kontrol et
-            print(f"🔍 Şifre kontrolü: {self.kullanici_adi}")
-            print(f"📏 Stored hash length: {len(self.sifre_hash)}")
-            
-            result = bcrypt.checkpw(password_bytes, stored_hash_bytes)
-            print(f"✅ Şifre doğrulama sonucu: {result}")
-            return result
+            return bcrypt.checkpw(password_bytes, stored_hash_bytes)
             
         except Exception as e:
-            print(f"❌ Şifre kontrol hatası: {e}")
+            logger.error("Şifre kontrol hatası (%s): %s", self.kullanici_adi, type(e).__name__)
+            return False
+    
+    @staticmethod
+    def needs_rehash(sifre_hash, rounds=None):
+        """Hash'in maliyeti ($2b$<maliyet>$...) istenenden düşükse True - tanınmayan biçimde False"""
+        try:
+            cost = int(sifre_hash.split('$')[2])
+        except (AttributeError, IndexError, ValueError):
             return False
+        return cost < (rounds or config.Config.AUTH_BCRYPT_ROUNDS)
+    
+    def update_password_hash(self, sifre_hash):
+        """Şifre hash'ini günceller (girişte maliyet yükseltme)"""
+        query = "UPDATE kullanici SET sifre_hash = %s WHERE id = %s"
+        db.execute_query(query, (sifre_hash, self.id))
+        self.sifre_hash = sifre_hash
+        notify_write('kullanici', self.id)
     
     @classmethod
     def get_by_username(cls, username):
@@ -50,7 +65,7 @@ class User:
         
         if result and len(result) > 0:
             user_data = result[0]
-            print(f"✅ Kullanıcı verisi alındı: {user_data['kullanici_adi']}")
+            logger.debug("Kullanıcı verisi alındı: %s", user_data['kullanici_adi'])
             return cls(**user_data)
         return None
     
@@ -0,0 +1,29 @@
+"""Cari özet tablosunu (cari_ozet) fatura tablosundan yeniden hesaplar
+
+İlk kurulumda (geçmiş faturaların aktarılması) veya elle yapılan SQL
+değişikliklerinden sonra kullanılır. Yoğun saatler dışında çalıştırılmalıdır.
+
+Kullanım:
+    python rebuild_cari_ozet.py              # tüm cariler
+    python rebuild_cari_ozet.py --cari-id 42 # tek cari
+"""
+import argparse
+import sys
+from models.cari_ozet import CariOzet
+
+def main():
+    parser = argparse.ArgumentParser(description='Cari özet tablosunu yeniden hesaplar')
+    parser.add_argument('--cari-id', type=int, default=None, help='Sadece bu cari')
+    args = parser.parse_args()
+
+    try:
+        count = CariOzet.rebuild(args.cari_id)
+    except Exception as e:
+        print(f"❌ Yeniden hesaplama hatası: {e}")
+        return 1
+
+    print(f"✅ {count} cari özeti yeniden hesaplandı")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""Günlük satış özet tablolarını (satis_gun_urun, satis_gun_cari) faturalardan yeniden hesaplar
+
+Geriye dönük doldurma (ilk kurulum) ve onarım (elle yapılan SQL değişiklikleri,
+yarıda kalan işlemler) için kullanılır. Aralık verilirse sadece o günler
+yeniden yazılır; gece çalışan bir iş olarak dünü yeniden hesaplamak için:
+
+    python rebuild_satis_rollup.py --gun-once 1
+
+Kullanım:
+    python rebuild_satis_rollup.py                                   # tüm geçmiş
+    python rebuild_satis_rollup.py --baslangic 2025-01-01 --bitis 2025-01-31
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+from models.satis_rollup import SatisRollup
+
+def main():
+    parser = argparse.ArgumentParser(description='Günlük satış özetlerini yeniden hesaplar')
+    parser.add_argument('--baslangic', default=None, help='Başlangıç tarihi (YYYY-MM-DD)')
+    parser.add_argument('--bitis', default=None, help='Bitiş tarihi (YYYY-MM-DD)')
+    parser.add_argument('--gun-once', type=int, default=None,
+                        help='Sadece N gün önceki günü yeniden hesapla (ör. 1 = dün)')
+    args = parser.parse_args()
+
+    baslangic, bitis = args.baslangic, args.bitis
+    if args.gun_once is not None:
+        baslangic = bitis = (date.today() - timedelta(days=args.gun_once)).isoformat()
+
+    try:
+        gun = SatisRollup.rebuild(baslangic, bitis)
+    except Exception as e:
+        print(f"❌ Yeniden hesaplama hatası: {e}")
+        return 1
+
+    aralik = f"{baslangic or 'başlangıç'} - {bitis or 'son'}"
+    print(f"✅ {aralik}: {gun} günlük satış özeti yeniden hesaplandı")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
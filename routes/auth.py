@@ -1,38 +1,20 @@
+import logging
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from models.user import User
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from services import auth as auth_service
+from services.errors import ServiceError
 from utils.database import db
-import traceback
+
+logger = logging.getLogger(__name__)
 
 auth_bp = Blueprint('auth', __name__)
 
 @auth_bp.route('/api/auth/login', methods=['POST'])
 def login():
     try:
-        data = request.get_json()
-        
-        if not data or not data.get('username') or not data.get('password'):
-            return jsonify({'error': 'Kullanıcı adı ve şifre gereklidir'}), 400
-        
-        print(f"🔐 Login denemesi: {data['username']}")
-        
-        # Kullanıcıyı bul
-        user = User.get_by_username(data['username'])
-        if not user:
-            print("❌ Kullanıcı bulunamadı")
-            return jsonify({'error': 'Kullanıcı bulunamadı'}), 401
+        data = request.get_json() or {}
         
-        print(f"✅ Kullanıcı bulundu: {user.kullanici_adi}")
-        
-        # Şifreyi kontrol et
-        is_valid_password = user.check_password(data['password'])
-        print(f"🔑 Şifre kontrolü: {is_valid_password}")
-        
-        if not is_valid_password:
-            return jsonify({'error': 'Geçersiz şifre'}), 401
-        
-        # JWT token oluştur
-        access_token = create_access_token(identity=user.kullanici_adi)
+        access_token, user = auth_service.login(data.get('username'), data.get('password'))
         
         return jsonify({
             'success': True,
@@ -41,26 +23,27 @@ def login():
             'user': user.to_dict()
         }), 200
         
+    except ServiceError as e:
+        # 503: giriş sırası dolu ya da doğrulama yavaş - istemci kısa süre sonra tekrar denesin
+        headers = {'Retry-After': '1'} if e.status == 503 else {}
+        return jsonify({'error': e.message}), e.status, headers
     except Exception as e:
-        print(f"❌ Giriş hatası: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Giriş hatası: %s", e)
         return jsonify({'error': f'Giriş hatası: {str(e)}'}), 500
 
 @auth_bp.route('/api/auth/me', methods=['GET'])
 @jwt_required()
 def get_current_user():
     try:
-        current_username = get_jwt_identity()
-        user = User.get_by_username(current_username)
-        
-        if not user:
-            return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
+        user = auth_service.current_user(get_jwt_identity())
         
         return jsonify({
             'success': True,
             'user': user.to_dict()
         }), 200
         
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
         return jsonify({'error': f'Kullanıcı bilgisi alınamadı: {str(e)}'}), 500
 
@@ -1,6 +1,11 @@
 from flask import Blueprint, request, jsonify, render_template, redirect, url_for, flash
 from flask_jwt_extended import jwt_required
 from models.birim import Birim
+from utils.pagination import parse_page_args, count_total, page_response
+from services import birim as birim_service
+from services.errors import ServiceError
+from utils.etag import conditional
+from utils.fields import parse_fields
 
 birim_bp = Blueprint('birim', __name__)
 
@@ -8,6 +13,7 @@ birim_bp = Blueprint('birim', __name__)
 
 @birim_bp.route('/api/birim', methods=['GET'])
 @jwt_required()
+@conditional(('birim',))
 def get_birimler():
     try:
         filters = {}
@@ -16,31 +22,44 @@ def get_birimler():
         if request.args.get('adi'):
             filters['adi'] = request.args.get('adi')
         
-        birimler = Birim.get_all(filters)
+        fields = parse_fields(request.args.get('fields'), Birim.FIELDS)
+        page = parse_page_args(request.args)
+        if page:
+            limit, after, count = page
+            birimler, next_cursor = birim_service.get_page(filters, limit, after, fields)
+            total = count_total(Birim, filters, count)
+            return jsonify(page_response([birim.to_dict(fields) for birim in birimler], next_cursor, limit, total)), 200
+        
+        birimler = birim_service.list_all(filters, fields)
         
         return jsonify({
             'success': True,
-            'data': [birim.to_dict() for birim in birimler],
+            'data': [birim.to_dict(fields) for birim in birimler],
             'total': len(birimler)
         }), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'Birim listeleme hatası: {str(e)}'}), 500
 
 @birim_bp.route('/api/birim/<int:birim_id>', methods=['GET'])
 @jwt_required()
+@conditional(('birim',), row_arg='birim_id')
 def get_birim(birim_id):
     try:
-        birim = Birim.get_by_id(birim_id)
-        
-        if not birim:
-            return jsonify({'error': 'Birim bulunamadı'}), 404
+        fields = parse_fields(request.args.get('fields'), Birim.FIELDS)
+        birim = birim_service.get(birim_id, fields)
         
         return jsonify({
             'success': True,
-            'data': birim.to_dict()
+            'data': birim.to_dict(fields)
         }), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
         return jsonify({'error': f'Birim getirme hatası: {str(e)}'}), 500
 
@@ -48,64 +67,33 @@ def get_birim(birim_id):
 @jwt_required()
 def create_birim():
     try:
-        data = request.get_json()
-        
-        if not data or not data.get('adi'):
-            return jsonify({'error': 'Birim adı gereklidir'}), 400
-        
-        yeni_birim = Birim(
-            kisa_adi=data.get('kisa_adi'),
-            adi=data.get('adi'),
-            kg_karsiligi=data.get('kg_karsiligi', 1.0),
-            aciklama=data.get('aciklama')
-        )
-        
-        if yeni_birim.create():
-            return jsonify({
-                'success': True,
-                'message': 'Birim başarıyla oluşturuldu',
-                'data': yeni_birim.to_dict()
-            }), 201
-        else:
-            return jsonify({'error': 'Birim oluşturulamadı'}), 500
+        yeni_birim = birim_service.create(request.get_json())
+        
+        return jsonify({
+            'success': True,
+            'message': 'Birim başarıyla oluşturuldu',
+            'data': yeni_birim.to_dict()
+        }), 201
             
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
-        error_message = str(e)
-        print(f"❌ Birim oluşturma hatası: {error_message}")
-        
-        if "1062" in error_message and "kisa_adi_adi" in error_message:
-            return jsonify({'error': 'Bu birim adı veya kısa adı zaten kayıtlıdır'}), 400
-        else:
-            return jsonify({'error': f'Birim oluşturma hatası: {error_message}'}), 500
+        return jsonify({'error': f'Birim oluşturma hatası: {str(e)}'}), 500
 
 @birim_bp.route('/api/birim/<int:birim_id>', methods=['PUT'])
 @jwt_required()
 def update_birim(birim_id):
     try:
-        data = request.get_json()
+        birim = birim_service.update(birim_id, request.get_json() or {})
         
-        birim = Birim.get_by_id(birim_id)
-        if not birim:
-            return jsonify({'error': 'Birim bulunamadı'}), 404
-        
-        if 'kisa_adi' in data:
-            birim.kisa_adi = data['kisa_adi']
-        if 'adi' in data:
-            birim.adi = data['adi']
-        if 'kg_karsiligi' in data:
-            birim.kg_karsiligi = data['kg_karsiligi']
-        if 'aciklama' in data:
-            birim.aciklama = data['aciklama']
-        
-        if birim.update():
-            return jsonify({
-                'success': True,
-                'message': 'Birim başarıyla güncellendi',
-                'data': birim.to_dict()
-            }), 200
-        else:
-            return jsonify({'error': 'Birim güncellenemedi'}), 500
+        return jsonify({
+            'success': True,
+            'message': 'Birim başarıyla güncellendi',
+            'data': birim.to_dict()
+        }), 200
             
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
         return jsonify({'error': f'Birim güncelleme hatası: {str(e)}'}), 500
 
@@ -113,24 +101,17 @@ def update_birim(birim_id):
 @jwt_required()
 def delete_birim(birim_id):
     try:
-        birim = Birim.get_by_id(birim_id)
-        if not birim:
-            return jsonify({'error': 'Birim bulunamadı'}), 404
+        birim_service.delete(birim_id)
         
-        if birim.delete():
-            return jsonify({
-                'success': True,
-                'message': 'Birim başarıyla silindi'
-            }), 200
-        else:
-            return jsonify({'error': 'Birim silinemedi'}), 500
+        return jsonify({
+            'success': True,
+            'message': 'Birim başarıyla silindi'
+        }), 200
             
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
-        error_msg = str(e)
-        if "kullanımdadır" in error_msg:
-            return jsonify({'error': error_msg}), 400
-        return jsonify({'error': f'Birim silme hatası: {error_msg}'}), 500
-    
+        return jsonify({'error': f'Birim silme hatası: {str(e)}'}), 500
 
 
 # ✅ WEB ARAYÜZÜ ROUTE'LARI
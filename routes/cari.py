@@ -1,6 +1,14 @@
+import logging
 from flask import Blueprint, request, jsonify, render_template, redirect, url_for, flash
 from flask_jwt_extended import jwt_required, current_user
 from models.cari import Cari
+from utils.pagination import parse_page_args, count_total, page_response
+from services import cari as cari_service
+from services.errors import ServiceError
+from utils.etag import conditional
+from utils.fields import parse_fields
+
+logger = logging.getLogger(__name__)
 
 cari_bp = Blueprint('cari', __name__)
 
@@ -8,6 +16,7 @@ cari_bp = Blueprint('cari', __name__)
 
 @cari_bp.route('/api/cari', methods=['GET'])
 @jwt_required()
+@conditional(('cari',))
 def get_cariler():
     try:
         # Filtreleme parametreleri
@@ -17,54 +26,84 @@ def get_cariler():
         if request.args.get('tc_kimlik_no'):
             filters['tc_kimlik_no'] = request.args.get('tc_kimlik_no')
         
-        cariler = Cari.get_all(filters)
+        fields = parse_fields(request.args.get('fields'), Cari.FIELDS)
+        page = parse_page_args(request.args)
+        if page:
+            limit, after, count = page
+            cariler, next_cursor = cari_service.get_page(filters, limit, after, fields)
+            total = count_total(Cari, filters, count)
+            return jsonify(page_response([cari.to_dict(fields) for cari in cariler], next_cursor, limit, total)), 200
+        
+        cariler = cari_service.list_all(filters, fields)
         
         return jsonify({
             'success': True,
-            'data': [cari.to_dict() for cari in cariler],
+            'data': [cari.to_dict(fields) for cari in cariler],
             'total': len(cariler)
         }), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        print(f"❌ Cari listeleme hatası: {e}")
         return jsonify({'error': f'Cari listeleme hatası: {str(e)}'}), 500
 
+@cari_bp.route('/api/cari/ara', methods=['GET'])
+@jwt_required()
+def ara_cari():
+    """Otomatik tamamlama - ?q=...&limit=10"""
+    try:
+        sonuclar = cari_service.search(request.args.get('q', ''), request.args.get('limit', 10))
+        
+        return jsonify({
+            'success': True,
+            'data': sonuclar
+        }), 200
+        
+    except ValueError:
+        return jsonify({'error': 'limit bir sayı olmalıdır'}), 400
+    except Exception as e:
+        return jsonify({'error': f'Cari arama hatası: {str(e)}'}), 500
+
 @cari_bp.route('/api/cari/<int:cari_id>', methods=['GET'])
 @jwt_required()
+@conditional(('cari',), row_arg='cari_id')
 def get_cari(cari_id):
     try:
-        cari = Cari.get_by_id(cari_id)
-        
-        if not cari:
-            return jsonify({'error': 'Cari bulunamadı'}), 404
+        fields = parse_fields(request.args.get('fields'), Cari.FIELDS)
+        cari = cari_service.get(cari_id, fields)
         
         return jsonify({
             'success': True,
-            'data': cari.to_dict()
+            'data': cari.to_dict(fields)
         }), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
         return jsonify({'error': f'Cari getirme hatası: {str(e)}'}), 500
 
+@cari_bp.route('/api/cari/<int:cari_id>/ozet', methods=['GET'])
+@jwt_required()
+def get_cari_ozet(cari_id):
+    """Cari fatura özeti - cari_ozet tablosundan tek satır okuma"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': cari_service.ozet(cari_id)
+        }), 200
+        
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
+    except Exception as e:
+        return jsonify({'error': f'Cari özeti hatası: {str(e)}'}), 500
+
 @cari_bp.route('/api/cari', methods=['POST'])
 @jwt_required()
 def create_cari():
     try:
-        data = request.get_json()
-        
-        # Validasyon
-        if not data or not data.get('adi_soyadi'):
-            return jsonify({'error': 'Cari adı gereklidir'}), 400
-        
-        # Yeni cari oluştur
-        yeni_cari = Cari(
-            adi_soyadi=data.get('adi_soyadi'),
-            tc_kimlik_no=data.get('tc_kimlik_no'),
-            aciklama=data.get('aciklama')
-        )
-        
-        # create() metodu artık exception fırlatabilir
-        yeni_cari.create()
+        yeni_cari = cari_service.create(request.get_json())
         
         return jsonify({
             'success': True,
@@ -72,50 +111,25 @@ def create_cari():
             'data': yeni_cari.to_dict()
         }), 201
             
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
-        # DETAYLI HATA MESAJI
-        error_message = str(e)
-        print(f"❌ Cari oluşturma hatası: {error_message}")
-        
-        # MySQL hata kodlarına göre özelleştirilmiş mesajlar
-        if "1062" in error_message and "unq_adi" in error_message:
-            return jsonify({'error': 'Bu cari adı zaten kayıtlıdır'}), 400
-        elif "1062" in error_message and "tc_kimlik_no" in error_message:
-            return jsonify({'error': 'Bu TC kimlik numarası zaten kayıtlıdır'}), 400
-        elif "foreign key" in error_message.lower():
-            return jsonify({'error': 'İlişkili kayıt hatası'}), 400
-        else:
-            # Genel hata mesajı
-            return jsonify({'error': f'Cari oluşturulamadı: {error_message}'}), 500
+        return jsonify({'error': f'Cari oluşturma hatası: {str(e)}'}), 500
 
 @cari_bp.route('/api/cari/<int:cari_id>', methods=['PUT'])
 @jwt_required()
 def update_cari(cari_id):
     try:
-        data = request.get_json()
-        
-        # Cari'yi bul
-        cari = Cari.get_by_id(cari_id)
-        if not cari:
-            return jsonify({'error': 'Cari bulunamadı'}), 404
-        
-        # Güncelleme
-        if 'adi_soyadi' in data:
-            cari.adi_soyadi = data['adi_soyadi']
-        if 'tc_kimlik_no' in data:
-            cari.tc_kimlik_no = data['tc_kimlik_no']
-        if 'aciklama' in data:
-            cari.aciklama = data['aciklama']
+        cari = cari_service.update(cari_id, request.get_json() or {})
         
-        if cari.update():
-            return jsonify({
-                'success': True,
-                'message': 'Cari başarıyla güncellendi',
-                'data': cari.to_dict()
-            }), 200
-        else:
-            return jsonify({'error': 'Cari güncellenemedi'}), 500
+        return jsonify({
+            'success': True,
+            'message': 'Cari başarıyla güncellendi',
+            'data': cari.to_dict()
+        }), 200
             
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
         return jsonify({'error': f'Cari güncelleme hatası: {str(e)}'}), 500
 
@@ -123,23 +137,17 @@ def update_cari(cari_id):
 @jwt_required()
 def delete_cari(cari_id):
     try:
-        cari = Cari.get_by_id(cari_id)
-        if not cari:
-            return jsonify({'error': 'Cari bulunamadı'}), 404
+        cari_service.delete(cari_id)
         
-        if cari.delete():
-            return jsonify({
-                'success': True,
-                'message': 'Cari başarıyla silindi'
-            }), 200
-        else:
-            return jsonify({'error': 'Cari silinemedi'}), 500
+        return jsonify({
+            'success': True,
+            'message': 'Cari başarıyla silindi'
+        }), 200
             
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
-        error_message = str(e)
-        if "kullanımdadır" in error_message or "foreign key" in error_message:
-            return jsonify({'error': 'Bu cari kullanımdadır, önce ilişkili faturaları silin'}), 400
-        return jsonify({'error': f'Cari silme hatası: {error_message}'}), 500
+        return jsonify({'error': f'Cari silme hatası: {str(e)}'}), 500
 
 
 # ✅ WEB ARAYÜZÜ ROUTE'LARI
@@ -247,11 +255,14 @@ def cari_detay(cari_id):
             flash('Cari bulunamadı!', 'danger')
             return redirect(url_for('cari.cari_listesi'))
         
-        # Burada cariye ait faturaları da getirebiliriz
-        # from models.fatura import Fatura
-        # faturalar = Fatura.query.filter_by(cari_id=cari_id).all()
+        # Fatura özeti (sayı, toplamlar, son faturalar) özet tablosundan
+        try:
+            ozet = cari_service.ozet(cari_id)
+        except Exception as e:
+            logger.error("Cari özeti hatası: %s", e)
+            ozet = None
         
-        return render_template('cari_detay.html', cari=cari)
+        return render_template('cari_detay.html', cari=cari, ozet=ozet)
         
     except Exception as e:
         flash(f'Hata: {str(e)}', 'danger')
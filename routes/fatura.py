@@ -1,14 +1,21 @@
-from flask import Blueprint, request, jsonify
+import logging
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from flask_jwt_extended import jwt_required
 from models.fatura import Fatura
+from utils.pagination import parse_page_args, count_total, page_response
 from models.fatura_detay import FaturaDetay
-from datetime import datetime
-from utils.database import db
+from services import fatura as fatura_service
+from services.errors import ServiceError
+from utils.etag import conditional
+from utils.fields import parse_fields
+
+logger = logging.getLogger(__name__)
 
 fatura_bp = Blueprint('fatura', __name__)
 
 @fatura_bp.route('/api/fatura', methods=['GET'])
 @jwt_required()
+@conditional(('fatura', 'cari', 'urun', 'birim'))
 def get_faturalar():
     try:
         filters = {}
@@ -20,32 +27,84 @@ def get_faturalar():
             filters['baslangic_tarihi'] = request.args.get('baslangic_tarihi')
         if request.args.get('bitis_tarihi'):
             filters['bitis_tarihi'] = request.args.get('bitis_tarihi')
-        
-        faturalar = Fatura.get_all(filters)
+        if request.args.get('cari_id'):
+            filters['cari_id'] = request.args.get('cari_id')
+        
+        # ?include=detaylar: sayfadaki tüm faturaların detayları tek sorguda
+        include = request.args.get('include', '').split(',')
+        include_detaylar = 'detaylar' in include
+        
+        fields = parse_fields(request.args.get('fields'), Fatura.FIELDS)
+        if fields is not None:
+            if include_detaylar and 'detaylar' not in fields:
+                fields.append('detaylar')
+            include_detaylar = 'detaylar' in fields
+        page = parse_page_args(request.args)
+        if page:
+            limit, after, count = page
+            faturalar, next_cursor = fatura_service.get_page(filters, limit, after, fields)
+            if include_detaylar:
+                fatura_service.load_detaylar(faturalar)
+            total = count_total(Fatura, filters, count)
+            return jsonify(page_response([fatura.to_dict(fields) for fatura in faturalar], next_cursor, limit, total)), 200
+        
+        faturalar = fatura_service.list_all(filters, fields)
+        if include_detaylar:
+            fatura_service.load_detaylar(faturalar)
         
         return jsonify({
             'success': True,
-            'data': [fatura.to_dict() for fatura in faturalar],
+            'data': [fatura.to_dict(fields) for fatura in faturalar],
             'total': len(faturalar)
         }), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'Fatura listeleme hatası: {str(e)}'}), 500
 
+@fatura_bp.route('/api/fatura/export', methods=['GET'])
+@jwt_required()
+def export_faturalar():
+    """Faturaları detaylarıyla CSV/NDJSON olarak akış halinde dışa aktarır"""
+    try:
+        filters = {}
+        for key in ('baslangic_tarihi', 'bitis_tarihi', 'cari_id'):
+            if request.args.get(key):
+                filters[key] = request.args.get(key)
+        
+        fmt = request.args.get('format', 'csv').lower()
+        chunks = fatura_service.export(filters, fmt)
+        
+        mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+        return Response(
+            stream_with_context(chunks),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename=faturalar.{fmt}'}
+        )
+        
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
+    except Exception as e:
+        return jsonify({'error': f'Fatura dışa aktarma hatası: {str(e)}'}), 500
+
 @fatura_bp.route('/api/fatura/<int:fatura_id>', methods=['GET'])
 @jwt_required()
+@conditional(('fatura', 'cari', 'urun', 'birim'), row_arg='fatura_id')
 def get_fatura(fatura_id):
     try:
-        fatura = Fatura.get_by_id(fatura_id)
-        
-        if not fatura:
-            return jsonify({'error': 'Fatura bulunamadı'}), 404
+        fields = parse_fields(request.args.get('fields'), Fatura.FIELDS)
+        fatura = fatura_service.get(fatura_id, fields)
         
         return jsonify({
             'success': True,
-            'data': fatura.to_dict()
+            'data': fatura.to_dict(fields)
         }), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
         return jsonify({'error': f'Fatura getirme hatası: {str(e)}'}), 500
 
@@ -55,98 +114,36 @@ def create_fatura():
     try:
         data = request.get_json()
         
-        # Validasyon
-        if not data or not data.get('fatura_tarihi') or not data.get('cari_id'):
-            return jsonify({'error': 'Fatura tarihi ve cari bilgisi gereklidir'}), 400
-        
-        if not data.get('detaylar') or len(data.get('detaylar', [])) == 0:
-            return jsonify({'error': 'Fatura detayları gereklidir'}), 400
-        
-        print(f"🔧 Fatura Verisi: {data}")  # Debug
-        
-        # Detay hesaplamalarını yap
-        for detay in data['detaylar']:
-            totals = FaturaDetay.calculate_totals(
-                detay['miktar'], 
-                detay['birim_fiyat'], 
-                detay['kdv_orani']
-            )
-            detay.update(totals)
-        
-        # Fatura oluştur
-        yeni_fatura = Fatura(
-            fatura_tarihi=data.get('fatura_tarihi'),
-            fatura_no=data.get('fatura_no'),
-            cari_id=data.get('cari_id'),
-            aciklama=data.get('aciklama')
-        )
+        # Gövdenin tamamı loglanmaz - sadece özet (DEBUG, LOG_DEBUG_SAMPLE_RATE ile seyreltilir)
+        if isinstance(data, dict):
+            logger.debug("Fatura isteği", extra={'cari_id': data.get('cari_id'), 'satir': len(data.get('detaylar') or [])})
         
-        if yeni_fatura.create_with_details(data['detaylar']):
-            # Oluşturulan faturayı tekrar getir (detayları ile)
-            fatura_tam = Fatura.get_by_id(yeni_fatura.id)
-            
-            return jsonify({
-                'success': True,
-                'message': 'Fatura başarıyla oluşturuldu',
-                'data': fatura_tam.to_dict()
-            }), 201
-        else:
-            return jsonify({'error': 'Fatura oluşturulamadı'}), 500
+        fatura_tam = fatura_service.create(data)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Fatura başarıyla oluşturuldu',
+            'data': fatura_tam.to_dict()
+        }), 201
             
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
-        error_message = str(e)
-        print(f"❌ Fatura oluşturma hatası: {error_message}")
-        
-        # MySQL hata kodlarına göre özelleştirilmiş mesajlar
-        if "1062" in error_message and "fatura_no" in error_message:
-            return jsonify({'error': 'Bu fatura numarası zaten kayıtlıdır'}), 400
-        elif "foreign key" in error_message and "cari_id" in error_message:
-            return jsonify({'error': 'Seçilen cari bulunamadı'}), 400
-        elif "foreign key" in error_message and "urun_id" in error_message:
-            return jsonify({'error': 'Seçilen ürün bulunamadı'}), 400
-        else:
-            return jsonify({'error': f'Fatura oluşturma hatası: {error_message}'}), 500
+        return jsonify({'error': f'Fatura oluşturma hatası: {str(e)}'}), 500
 
 @fatura_bp.route('/api/fatura/<int:fatura_id>', methods=['DELETE'])
 @jwt_required()
 def delete_fatura(fatura_id):
     try:
-        # Önce faturayı bul
-        fatura = Fatura.get_by_id(fatura_id)
-        if not fatura:
-            return jsonify({'error': 'Fatura bulunamadı'}), 404
-        
-        # Transaction ile sil
-        connection = db.get_connection()
-        if not connection:
-            return jsonify({'error': 'Veritabanı bağlantı hatası'}), 500
-            
-        cursor = None
-        try:
-            cursor = connection.cursor()
-            
-            # 1. Önce detayları sil
-            cursor.execute("DELETE FROM fatura_detay WHERE fatura_id = %s", (fatura_id,))
-            
-            # 2. Sonra faturayı sil
-            cursor.execute("DELETE FROM fatura WHERE id = %s", (fatura_id,))
-            
-            connection.commit()
-            
-            return jsonify({
-                'success': True,
-                'message': 'Fatura başarıyla silindi'
-            }), 200
-            
-        except Exception as e:
-            connection.rollback()
-            return jsonify({'error': f'Fatura silme hatası: {str(e)}'}), 500
-        finally:
-            if cursor:
-                cursor.close()
-            if connection:
-                connection.close()
+        fatura_service.delete(fatura_id)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Fatura başarıyla silindi'
+        }), 200
             
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
         return jsonify({'error': f'Fatura silme hatası: {str(e)}'}), 500
 
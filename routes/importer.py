@@ -0,0 +1,33 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from services.importer import import_stream
+from services.errors import ServiceError
+
+import_bp = Blueprint('importer', __name__)
+
+def detect_format():
+    """?format= parametresinden ya da Content-Type'tan formatı belirler"""
+    fmt = request.args.get('format')
+    if fmt:
+        return fmt.lower()
+    content_type = (request.mimetype or '').lower()
+    if 'ndjson' in content_type or 'jsonlines' in content_type:
+        return 'ndjson'
+    return 'csv'
+
+@import_bp.route('/api/<any(urun, cari, birim):resource>/import', methods=['POST'])
+@jwt_required()
+def bulk_import(resource):
+    """CSV/NDJSON gövdesini akış halinde okuyup toplu upsert yapar"""
+    try:
+        report = import_stream(resource, request.stream, detect_format())
+        
+        return jsonify({
+            'success': report['failed'] == 0,
+            'data': report
+        }), 200
+        
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
+    except Exception as e:
+        return jsonify({'error': f'Toplu yükleme hatası: {str(e)}'}), 500
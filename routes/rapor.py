@@ -0,0 +1,32 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from services import rapor as rapor_service
+from services.errors import ServiceError
+from utils.etag import conditional
+
+rapor_bp = Blueprint('rapor', __name__)
+
+@rapor_bp.route('/api/rapor/satis', methods=['GET'])
+@jwt_required()
+@conditional(('fatura', 'urun', 'cari'))
+def satis_raporu():
+    """Satış raporu - ?grup=gun|ay|urun|cari&baslangic_tarihi=...&bitis_tarihi=...&limit=100"""
+    try:
+        grup = request.args.get('grup', 'gun')
+        rapor = rapor_service.satis(
+            grup,
+            request.args.get('baslangic_tarihi'),
+            request.args.get('bitis_tarihi'),
+            request.args.get('limit', 100)
+        )
+        
+        return jsonify({
+            'success': True,
+            'grup': grup,
+            'data': rapor
+        }), 200
+        
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
+    except Exception as e:
+        return jsonify({'error': f'Rapor hatası: {str(e)}'}), 500
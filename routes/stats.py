@@ -0,0 +1,17 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+from models.stats import Stats
+
+stats_bp = Blueprint('stats', __name__)
+
+@stats_bp.route('/api/stats', methods=['GET'])
+@jwt_required()
+def get_stats():
+    try:
+        return jsonify({
+            'success': True,
+            'data': Stats.get()
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': f'İstatistik hatası: {str(e)}'}), 500
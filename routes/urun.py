@@ -1,6 +1,11 @@
 from flask import Blueprint, request, jsonify, render_template, redirect, url_for, flash
 from flask_jwt_extended import jwt_required
 from models.urun import Urun
+from utils.pagination import parse_page_args, count_total, page_response
+from services import urun as urun_service
+from services.errors import ServiceError
+from utils.etag import conditional
+from utils.fields import parse_fields
 from models.birim import Birim
 
 urun_bp = Blueprint('urun', __name__)
@@ -9,6 +14,7 @@ urun_bp = Blueprint('urun', __name__)
 
 @urun_bp.route('/api/urun', methods=['GET'])
 @jwt_required()
+@conditional(('urun', 'birim'))
 def get_urunler():
     try:
         filters = {}
@@ -19,31 +25,95 @@ def get_urunler():
         if request.args.get('kisa_adi'):
             filters['kisa_adi'] = request.args.get('kisa_adi')
         
-        urunler = Urun.get_all(filters)
+        fields = parse_fields(request.args.get('fields'), Urun.FIELDS)
+        page = parse_page_args(request.args)
+        if page:
+            limit, after, count = page
+            urunler, next_cursor = urun_service.get_page(filters, limit, after, fields)
+            total = count_total(Urun, filters, count)
+            return jsonify(page_response([urun.to_dict(fields) for urun in urunler], next_cursor, limit, total)), 200
+        
+        urunler = urun_service.list_all(filters, fields)
         
         return jsonify({
             'success': True,
-            'data': [urun.to_dict() for urun in urunler],
+            'data': [urun.to_dict(fields) for urun in urunler],
             'total': len(urunler)
         }), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'Ürün listeleme hatası: {str(e)}'}), 500
 
+@urun_bp.route('/api/urun/ara', methods=['GET'])
+@jwt_required()
+def ara_urun():
+    """Otomatik tamamlama - ?q=...&limit=10"""
+    try:
+        sonuclar = urun_service.search(request.args.get('q', ''), request.args.get('limit', 10))
+        
+        return jsonify({
+            'success': True,
+            'data': sonuclar
+        }), 200
+        
+    except ValueError:
+        return jsonify({'error': 'limit bir sayı olmalıdır'}), 400
+    except Exception as e:
+        return jsonify({'error': f'Ürün arama hatası: {str(e)}'}), 500
+
+@urun_bp.route('/api/urun/barkod/<path:barkod>', methods=['GET'])
+@jwt_required()
+def get_urun_by_barkod(barkod):
+    """Kasa okuyucuları için barkoda tam eşleşme"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': urun_service.get_by_barkod(barkod)
+        }), 200
+        
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
+    except Exception as e:
+        return jsonify({'error': f'Ürün getirme hatası: {str(e)}'}), 500
+
+@urun_bp.route('/api/urun/barkod', methods=['POST'])
+@jwt_required()
+def get_urunler_by_barkod():
+    """Toplu barkod sorgusu - {"barkodlar": [...]}"""
+    try:
+        data = request.get_json(silent=True) or {}
+        found, missing = urun_service.get_by_barkods(data.get('barkodlar'))
+        
+        return jsonify({
+            'success': True,
+            'data': found,
+            'bulunamayan': missing
+        }), 200
+        
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
+    except Exception as e:
+        return jsonify({'error': f'Ürün getirme hatası: {str(e)}'}), 500
+
 @urun_bp.route('/api/urun/<int:urun_id>', methods=['GET'])
 @jwt_required()
+@conditional(('urun', 'birim'), row_arg='urun_id')
 def get_urun(urun_id):
     try:
-        urun = Urun.get_by_id(urun_id)
-        
-        if not urun:
-            return jsonify({'error': 'Ürün bulunamadı'}), 404
+        fields = parse_fields(request.args.get('fields'), Urun.FIELDS)
+        urun = urun_service.get(urun_id, fields)
         
         return jsonify({
             'success': True,
-            'data': urun.to_dict()
+            'data': urun.to_dict(fields)
         }), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
         return jsonify({'error': f'Ürün getirme hatası: {str(e)}'}), 500
 
@@ -51,74 +121,33 @@ def get_urun(urun_id):
 @jwt_required()
 def create_urun():
     try:
-        data = request.get_json()
+        yeni_urun = urun_service.create(request.get_json())
         
-        if not data or not data.get('adi'):
-            return jsonify({'error': 'Ürün adı gereklidir'}), 400
-        
-        yeni_urun = Urun(
-            barkod=data.get('barkod'),
-            kisa_adi=data.get('kisa_adi'),
-            adi=data.get('adi'),
-            birim_id=data.get('birim_id'),
-            kdv=data.get('kdv', 0),
-            aciklama=data.get('aciklama')
-        )
-        
-        if yeni_urun.create():
-            return jsonify({
-                'success': True,
-                'message': 'Ürün başarıyla oluşturuldu',
-                'data': yeni_urun.to_dict()
-            }), 201
-        else:
-            return jsonify({'error': 'Ürün oluşturulamadı'}), 500
+        return jsonify({
+            'success': True,
+            'message': 'Ürün başarıyla oluşturuldu',
+            'data': yeni_urun.to_dict()
+        }), 201
             
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
-        error_message = str(e)
-        print(f"❌ Ürün oluşturma hatası: {error_message}")
-        
-        if "1062" in error_message and "barkod" in error_message:
-            return jsonify({'error': 'Bu barkod zaten kayıtlıdır'}), 400
-        elif "1062" in error_message and "adi" in error_message:
-            return jsonify({'error': 'Bu ürün adı zaten kayıtlıdır'}), 400
-        elif "foreign key" in error_message and "birim_id" in error_message:
-            return jsonify({'error': 'Seçilen birim bulunamadı'}), 400
-        else:
-            return jsonify({'error': f'Ürün oluşturma hatası: {error_message}'}), 500
+        return jsonify({'error': f'Ürün oluşturma hatası: {str(e)}'}), 500
 
 @urun_bp.route('/api/urun/<int:urun_id>', methods=['PUT'])
 @jwt_required()
 def update_urun(urun_id):
     try:
-        data = request.get_json()
-        
-        urun = Urun.get_by_id(urun_id)
-        if not urun:
-            return jsonify({'error': 'Ürün bulunamadı'}), 404
-        
-        if 'barkod' in data:
-            urun.barkod = data['barkod']
-        if 'kisa_adi' in data:
-            urun.kisa_adi = data['kisa_adi']
-        if 'adi' in data:
-            urun.adi = data['adi']
-        if 'birim_id' in data:
-            urun.birim_id = data['birim_id']
-        if 'kdv' in data:
-            urun.kdv = data['kdv']
-        if 'aciklama' in data:
-            urun.aciklama = data['aciklama']
+        urun = urun_service.update(urun_id, request.get_json() or {})
         
-        if urun.update():
-            return jsonify({
-                'success': True,
-                'message': 'Ürün başarıyla güncellendi',
-                'data': urun.to_dict()
-            }), 200
-        else:
-            return jsonify({'error': 'Ürün güncellenemedi'}), 500
+        return jsonify({
+            'success': True,
+            'message': 'Ürün başarıyla güncellendi',
+            'data': urun.to_dict()
+        }), 200
             
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
         return jsonify({'error': f'Ürün güncelleme hatası: {str(e)}'}), 500
 
@@ -126,24 +155,18 @@ def update_urun(urun_id):
 @jwt_required()
 def delete_urun(urun_id):
     try:
-        urun = Urun.get_by_id(urun_id)
-        if not urun:
-            return jsonify({'error': 'Ürün bulunamadı'}), 404
+        urun_service.delete(urun_id)
         
-        if urun.delete():
-            return jsonify({
-                'success': True,
-                'message': 'Ürün başarıyla silindi'
-            }), 200
-        else:
-            return jsonify({'error': 'Ürün silinemedi'}), 500
+        return jsonify({
+            'success': True,
+            'message': 'Ürün başarıyla silindi'
+        }), 200
             
+    except ServiceError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
-        error_msg = str(e)
-        if "kullanımdadır" in error_msg:
-            return jsonify({'error': error_msg}), 400
-        return jsonify({'error': f'Ürün silme hatası: {error_msg}'}), 500
-    
+        return jsonify({'error': f'Ürün silme hatası: {str(e)}'}), 500
+
 
 # ✅ WEB ARAYÜZÜ ROUTE'LARI
 
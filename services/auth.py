@@ -0,0 +1,100 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from flask_jwt_extended import create_access_token
+from models.user import User
+from services.errors import ServiceError
+from utils.cache import on_write, TTLCache
+import config
+
+logger = logging.getLogger(__name__)
+
+# bcrypt (CPU yoğun, ~100 ms+) istek thread'lerinde değil, sınırlı bir havuzda çalışır
+_hash_pool = ThreadPoolExecutor(max_workers=config.Config.AUTH_HASH_WORKERS, thread_name_prefix='bcrypt')
+
+# Aynı anda işlenen + havuzda bekleyen giriş sayısı sınırı (giriş fırtınasında worker'lar tükenmesin)
+_admission = threading.BoundedSemaphore(config.Config.AUTH_MAX_PENDING)
+
+# Kimlik (kullanıcı adı) -> şifre hash'i taşımayan kullanıcı profili; bulunamayanlar da (None) saklanır
+profile_cache = TTLCache(config.Config.USER_CACHE_TTL, name='kullanici')
+on_write('kullanici', profile_cache.clear)
+
+
+def _release_admission(future):
+    _admission.release()
+
+
+def _verify(user, password):
+    """Havuzda çalışır - (şifre doğru mu, maliyeti yükseltilmiş yeni hash ya da None)"""
+    if not user.check_password(password):
+        return False, None
+    if User.needs_rehash(user.sifre_hash):
+        return True, User.hash_password(password)
+    return True, None
+
+
+def login(username, password):
+    """Kullanıcıyı doğrular - (access_token, kullanıcı) döndürür"""
+    if not username or not password:
+        raise ServiceError('Kullanıcı adı ve şifre gereklidir', 400)
+
+    # Kabul kontrolü - sıra dolu ise kısa bir beklemeden sonra 503
+    if not _admission.acquire(timeout=config.Config.AUTH_ADMISSION_WAIT):
+        logger.warning("Giriş reddedildi: %s (eşzamanlı giriş sınırı dolu)", username)
+        raise ServiceError('Çok fazla eşzamanlı giriş denemesi, lütfen tekrar deneyin', 503)
+
+    submitted = False
+    try:
+        # Kullanıcıyı bul (hash gerektiği için profil cache'i kullanılmaz)
+        user = User.get_by_username(username)
+        if not user:
+            logger.warning("Başarısız giriş: %s (kullanıcı bulunamadı)", username)
+            raise ServiceError('Kullanıcı bulunamadı', 401)
+
+        # Şifreyi havuzda kontrol et - kabul sırası doğrulama bitince boşalır
+        future = _hash_pool.submit(_verify, user, password)
+        submitted = True
+        future.add_done_callback(_release_admission)
+    finally:
+        if not submitted:
+            _admission.release()
+
+    try:
+        is_valid_password, new_hash = future.result(timeout=config.Config.AUTH_VERIFY_TIMEOUT)
+    except FutureTimeout:
+        logger.warning("Giriş zaman aşımı: %s (şifre doğrulama kuyruğu yavaş)", username)
+        raise ServiceError('Şifre doğrulama zaman aşımına uğradı, lütfen tekrar deneyin', 503)
+
+    if not is_valid_password:
+        logger.warning("Başarısız giriş: %s (geçersiz şifre)", username)
+        raise ServiceError('Geçersiz şifre', 401)
+
+    # Eski maliyetli hash'i yenisiyle değiştir - hata girişi engellemez
+    if new_hash:
+        try:
+            user.update_password_hash(new_hash)
+            logger.info("Şifre hash'i yenilendi: %s", username)
+        except Exception as e:
+            logger.error("Şifre hash'i yenilenemedi (%s): %s", username, e)
+
+    # JWT token oluştur
+    access_token = create_access_token(identity=user.kullanici_adi)
+    return access_token, user
+
+
+def cached_user(username):
+    """Kimliğin profilini cache'ten (USER_CACHE_TTL) ya da veritabanından getirir - yoksa None"""
+    def load():
+        user = User.get_by_username(username)
+        if user:
+            user.sifre_hash = None
+        return user
+    return profile_cache.get(username, load)
+
+
+def current_user(username):
+    """JWT kimliğine karşılık gelen kullanıcıyı getirir - yoksa 404"""
+    user = cached_user(username)
+    if not user:
+        raise ServiceError('Kullanıcı bulunamadı', 404)
+    return user
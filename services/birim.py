@@ -0,0 +1,79 @@
+import logging
+from models.birim import Birim
+from services.errors import ServiceError
+
+logger = logging.getLogger(__name__)
+
+
+def list_all(filters=None, fields=None):
+    """Birimleri listeler"""
+    return Birim.get_all(filters, fields)
+
+
+def get_page(filters, limit, after, fields=None):
+    """Keyset sayfalı birim listesi - (liste, sonraki cursor)"""
+    return Birim.get_page(filters, limit, after, fields)
+
+
+def get(birim_id, fields=None):
+    """ID'ye göre birim getirir - yoksa 404"""
+    birim = Birim.get_by_id(birim_id, fields)
+    if not birim:
+        raise ServiceError('Birim bulunamadı', 404)
+    return birim
+
+
+def create(data):
+    """Yeni birim oluşturur"""
+    if not data or not data.get('adi'):
+        raise ServiceError('Birim adı gereklidir', 400)
+
+    yeni_birim = Birim(
+        kisa_adi=data.get('kisa_adi'),
+        adi=data.get('adi'),
+        kg_karsiligi=data.get('kg_karsiligi', 1.0),
+        aciklama=data.get('aciklama')
+    )
+
+    try:
+        created = yeni_birim.create()
+    except Exception as e:
+        error_message = str(e)
+        logger.error("Birim oluşturma hatası: %s", error_message)
+
+        if "1062" in error_message and "kisa_adi_adi" in error_message:
+            raise ServiceError('Bu birim adı veya kısa adı zaten kayıtlıdır', 400)
+        raise ServiceError(f'Birim oluşturma hatası: {error_message}', 500)
+
+    if not created:
+        raise ServiceError('Birim oluşturulamadı', 500)
+    return yeni_birim
+
+
+def update(birim_id, data):
+    """Birim günceller"""
+    birim = get(birim_id)
+
+    for field in ('kisa_adi', 'adi', 'kg_karsiligi', 'aciklama'):
+        if field in data:
+            setattr(birim, field, data[field])
+
+    if not birim.update():
+        raise ServiceError('Birim güncellenemedi', 500)
+    return birim
+
+
+def delete(birim_id):
+    """Birim siler"""
+    birim = get(birim_id)
+
+    try:
+        deleted = birim.delete()
+    except Exception as e:
+        error_message = str(e)
+        if "kullanımdadır" in error_message:
+            raise ServiceError(error_message, 400)
+        raise ServiceError(f'Birim silme hatası: {error_message}', 500)
+
+    if not deleted:
+        raise ServiceError('Birim silinemedi', 500)
@@ -0,0 +1,105 @@
+import logging
+from models.cari import Cari
+from models.cari_ozet import CariOzet
+from services.errors import ServiceError
+from utils.cache import on_write
+from utils.search import PrefixIndex
+import config
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MAX_LIMIT = 50
+
+# Fatura formundaki cari seçici için bellek içi önek indeksi
+cari_index = PrefixIndex('cari', ['adi_soyadi', 'tc_kimlik_no'], ['adi_soyadi', 'tc_kimlik_no'])
+on_write('cari', cari_index.refresh)
+
+
+def list_all(filters=None, fields=None):
+    """Carileri listeler"""
+    return Cari.get_all(filters, fields)
+
+
+def get_page(filters, limit, after, fields=None):
+    """Keyset sayfalı cari listesi - (liste, sonraki cursor)"""
+    return Cari.get_page(filters, limit, after, fields)
+
+
+def search(query, limit=10):
+    """Ad soyad veya TC kimlik no önekine göre en iyi eşleşen cariler"""
+    return cari_index.search(query, min(max(int(limit), 1), SEARCH_MAX_LIMIT))
+
+
+def get(cari_id, fields=None):
+    """ID'ye göre cari getirir - yoksa 404"""
+    cari = Cari.get_by_id(cari_id, fields)
+    if not cari:
+        raise ServiceError('Cari bulunamadı', 404)
+    return cari
+
+
+def ozet(cari_id):
+    """Carinin fatura özeti (sayı, toplamlar, ilk/son tarih, son faturalar) - cari yoksa 404"""
+    get(cari_id, ['id'])
+    return CariOzet.get(cari_id, config.Config.CARI_OZET_SON_FATURA)
+
+
+def create(data):
+    """Yeni cari oluşturur"""
+    if not data or not data.get('adi_soyadi'):
+        raise ServiceError('Cari adı gereklidir', 400)
+
+    yeni_cari = Cari(
+        adi_soyadi=data.get('adi_soyadi'),
+        tc_kimlik_no=data.get('tc_kimlik_no') or None,
+        aciklama=data.get('aciklama')
+    )
+
+    try:
+        yeni_cari.create()
+    except Exception as e:
+        error_message = str(e)
+        logger.error("Cari oluşturma hatası: %s", error_message)
+
+        # MySQL hata kodlarına göre özelleştirilmiş mesajlar
+        if "1062" in error_message and "unq_adi" in error_message:
+            raise ServiceError('Bu cari adı zaten kayıtlıdır', 400)
+        elif "1062" in error_message and "tc_kimlik_no" in error_message:
+            raise ServiceError('Bu TC kimlik numarası zaten kayıtlıdır', 400)
+        elif "foreign key" in error_message.lower():
+            raise ServiceError('İlişkili kayıt hatası', 400)
+        raise ServiceError(f'Cari oluşturulamadı: {error_message}', 500)
+
+    return yeni_cari
+
+
+def update(cari_id, data):
+    """Cari günceller"""
+    cari = get(cari_id)
+
+    if 'adi_soyadi' in data:
+        cari.adi_soyadi = data['adi_soyadi']
+    if 'tc_kimlik_no' in data:
+        cari.tc_kimlik_no = data['tc_kimlik_no']
+    if 'aciklama' in data:
+        cari.aciklama = data['aciklama']
+
+    if not cari.update():
+        raise ServiceError('Cari güncellenemedi', 500)
+    return cari
+
+
+def delete(cari_id):
+    """Cari siler"""
+    cari = get(cari_id)
+
+    try:
+        deleted = cari.delete()
+    except Exception as e:
+        error_message = str(e)
+        if "kullanımdadır" in error_message or "foreign key" in error_message:
+            raise ServiceError('Bu cari kullanımdadır, önce ilişkili faturaları silin', 400)
+        raise ServiceError(f'Cari silme hatası: {error_message}', 500)
+
+    if not deleted:
+        raise ServiceError('Cari silinemedi', 500)
@@ -0,0 +1,126 @@
+import logging
+import requests
+from flask import session
+from services import auth, cari, urun, birim, fatura
+from services.errors import ServiceError
+import config
+
+logger = logging.getLogger(__name__)
+
+# Kaynak adı -> servis modülü / API yolu
+SERVICES = {
+    'cari': cari,
+    'urun': urun,
+    'birim': birim,
+    'fatura': fatura
+}
+
+
+class LocalClient:
+    """Web paneli için servis katmanını aynı process içinde doğrudan çağırır"""
+
+    def login(self, username, password):
+        """(veri, hata) döner - veri: access_token ve user"""
+        try:
+            access_token, user = auth.login(username, password)
+            return {'access_token': access_token, 'user': user.to_dict()}, None
+        except ServiceError as e:
+            return None, e.message
+        except Exception as e:
+            return None, str(e)
+
+    def list(self, resource):
+        """Kaynağın tüm kayıtlarını dict listesi olarak döner - (liste, hata)"""
+        try:
+            return [item.to_dict() for item in SERVICES[resource].list_all()], None
+        except ServiceError as e:
+            return [], e.message
+        except Exception as e:
+            return [], str(e)
+
+    def create(self, resource, data):
+        """Yeni kayıt oluşturur - (kayıt, hata)"""
+        try:
+            return SERVICES[resource].create(data).to_dict(), None
+        except ServiceError as e:
+            return None, e.message
+        except Exception as e:
+            return None, str(e)
+
+
+class RemoteClient:
+    """Uzak API'yi HTTP üzerinden çağırır (WEB_API_MODE=remote)"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def _headers(self):
+        """API istekleri için header'ları hazırla"""
+        token = session.get('token')
+        if token:
+            return {
+                'Authorization': f'Bearer {token}',
+                'Content-Type': 'application/json'
+            }
+        return {}
+
+    def _request(self, method, endpoint, data=None):
+        """HTTP isteği yapar - (json gövde, durum kodu, hata)"""
+        url = f"{self.base_url}{endpoint}"
+        try:
+            if method == 'POST':
+                response = requests.post(url, json=data, headers=self._headers(), timeout=10)
+            else:
+                response = requests.get(url, headers=self._headers(), timeout=10)
+        except requests.exceptions.RequestException as e:
+            logger.error("API Hatası: %s", e)
+            return None, None, f'Bağlantı hatası: {e}'
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        return body, response.status_code, None
+
+    def _error(self, body, status):
+        """API'den gelen hata mesajını çıkarır"""
+        if body and body.get('error'):
+            return body['error']
+        return f"İşlem başarısız oldu (HTTP {status})"
+
+    def login(self, username, password):
+        body, status, error = self._request('POST', '/api/auth/login', {
+            'username': username,
+            'password': password
+        })
+        if error:
+            return None, error
+        if status == 200:
+            return {'access_token': body['access_token'], 'user': body['user']}, None
+        return None, self._error(body, status)
+
+    def list(self, resource):
+        body, status, error = self._request('GET', f'/api/{resource}')
+        if error:
+            return [], error
+        if status == 200:
+            return body.get('data', []), None
+        return [], self._error(body, status)
+
+    def create(self, resource, data):
+        body, status, error = self._request('POST', f'/api/{resource}', data)
+        if error:
+            return None, error
+        if status == 201:
+            return body.get('data'), None
+        return None, self._error(body, status)
+
+
+_local_client = LocalClient()
+
+
+def get_client():
+    """Ayarlara göre panel istemcisini döner (varsayılan: local)"""
+    if config.Config.WEB_API_MODE == 'remote':
+        return RemoteClient(config.Config.WEB_API_BASE_URL)
+    return _local_client
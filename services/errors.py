@@ -0,0 +1,7 @@
+class ServiceError(Exception):
+    """Servis katmanı hatası - HTTP durum kodunu da taşır"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
@@ -0,0 +1,215 @@
+import csv
+import io
+import json
+import logging
+from decimal import Decimal
+from models.fatura import Fatura
+from models.fatura_detay import FaturaDetay, InvalidReferenceError
+from models.cari_ozet import CariOzet
+from models.satis_rollup import SatisRollup
+from services.errors import ServiceError
+from utils.database import db
+from utils.cache import notify_write
+
+logger = logging.getLogger(__name__)
+
+
+def list_all(filters=None, fields=None):
+    """Faturaları listeler"""
+    return Fatura.get_all(filters, fields)
+
+
+def get_page(filters, limit, after, fields=None):
+    """Keyset sayfalı fatura listesi - (liste, sonraki cursor)"""
+    return Fatura.get_page(filters, limit, after, fields)
+
+
+def load_detaylar(faturalar):
+    """Faturaların detaylarını toplu sorguyla ekler"""
+    return Fatura.load_detaylar(faturalar)
+
+
+EXPORT_HEADER_FIELDS = [
+    'fatura_id', 'fatura_no', 'fatura_tarihi', 'cari_id', 'cari_adi',
+    'toplam_miktar', 'toplam_kdv', 'toplam_tutar', 'fatura_aciklama'
+]
+EXPORT_LINE_FIELDS = [
+    'detay_id', 'urun_id', 'urun_adi', 'miktar', 'birim_id', 'birim_adi',
+    'birim_fiyat', 'kdv_orani', 'brut_tutar', 'net_tutar', 'detay_aciklama'
+]
+EXPORT_FLUSH_ROWS = 500  # bu kadar satırda bir parça gönderilir
+
+
+def _json_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+def _export_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_HEADER_FIELDS + EXPORT_LINE_FIELDS)
+    # Başlık hemen gönderilir - ilk byte sorgu bitmeden istemciye ulaşır
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    fields = EXPORT_HEADER_FIELDS + EXPORT_LINE_FIELDS
+    pending = 0
+    for row in rows:
+        writer.writerow([row[field] for field in fields])
+        pending += 1
+        if pending >= EXPORT_FLUSH_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+def _export_ndjson(rows):
+    # Satırlar fatura_id'ye göre sıralı gelir - her fatura bitince tek JSON satırı yazılır
+    parts = []
+    current = None
+    sent = False
+    for row in rows:
+        if current is None or current['fatura_id'] != row['fatura_id']:
+            if current is not None:
+                parts.append(json.dumps(current, ensure_ascii=False) + '\n')
+            current = {field: _json_value(row[field]) for field in EXPORT_HEADER_FIELDS}
+            current['detaylar'] = []
+        if row['detay_id'] is not None:
+            current['detaylar'].append({field: _json_value(row[field]) for field in EXPORT_LINE_FIELDS})
+        # İlk fatura hemen, sonrakiler parça parça gönderilir
+        if parts and (len(parts) >= EXPORT_FLUSH_ROWS or not sent):
+            yield ''.join(parts)
+            parts = []
+            sent = True
+    if current is not None:
+        parts.append(json.dumps(current, ensure_ascii=False) + '\n')
+    if parts:
+        yield ''.join(parts)
+
+
+def export(filters, fmt):
+    """Faturaları detaylarıyla CSV/NDJSON parçaları olarak akıtır (sabit bellek)"""
+    if fmt == 'csv':
+        return _export_csv(Fatura.iter_export(filters))
+    if fmt == 'ndjson':
+        return _export_ndjson(Fatura.iter_export(filters))
+    raise ServiceError("Desteklenen formatlar: csv, ndjson", 400)
+
+
+def get(fatura_id, fields=None):
+    """ID'ye göre faturayı detaylarıyla getirir - yoksa 404"""
+    fatura = Fatura.get_by_id(fatura_id, fields)
+    if not fatura:
+        raise ServiceError('Fatura bulunamadı', 404)
+    return fatura
+
+
+def create(data):
+    """Faturayı detaylarıyla oluşturur ve tam halini döndürür"""
+    # Validasyon
+    if not data or not data.get('fatura_tarihi') or not data.get('cari_id'):
+        raise ServiceError('Fatura tarihi ve cari bilgisi gereklidir', 400)
+
+    if not data.get('detaylar') or len(data.get('detaylar', [])) == 0:
+        raise ServiceError('Fatura detayları gereklidir', 400)
+
+    try:
+        # Detay hesaplamalarını yap
+        for detay in data['detaylar']:
+            totals = FaturaDetay.calculate_totals(
+                detay['miktar'],
+                detay['birim_fiyat'],
+                detay['kdv_orani']
+            )
+            detay.update(totals)
+
+        # Fatura oluştur
+        yeni_fatura = Fatura(
+            fatura_tarihi=data.get('fatura_tarihi'),
+            fatura_no=data.get('fatura_no'),
+            cari_id=data.get('cari_id'),
+            aciklama=data.get('aciklama')
+        )
+
+        created = yeni_fatura.create_with_details(data['detaylar'])
+    except InvalidReferenceError as e:
+        messages = {
+            'cari': 'Seçilen cari bulunamadı',
+            'urun': 'Seçilen ürün bulunamadı',
+            'birim': 'Seçilen birim bulunamadı'
+        }
+        raise ServiceError(f"{messages[e.table]} (ID: {', '.join(str(i) for i in e.ids)})", 400)
+    except Exception as e:
+        error_message = str(e)
+        logger.error("Fatura oluşturma hatası: %s", error_message)
+
+        # MySQL hata kodlarına göre özelleştirilmiş mesajlar
+        if "1062" in error_message and "fatura_no" in error_message:
+            raise ServiceError('Bu fatura numarası zaten kayıtlıdır', 400)
+        elif "foreign key" in error_message and "cari_id" in error_message:
+            raise ServiceError('Seçilen cari bulunamadı', 400)
+        elif "foreign key" in error_message and "urun_id" in error_message:
+            raise ServiceError('Seçilen ürün bulunamadı', 400)
+        raise ServiceError(f'Fatura oluşturma hatası: {error_message}', 500)
+
+    if not created:
+        raise ServiceError('Fatura oluşturulamadı', 500)
+
+    # Oluşturulan faturayı tekrar getir (detayları ile)
+    return Fatura.get_by_id(yeni_fatura.id)
+
+
+def delete(fatura_id):
+    """Faturayı detaylarıyla birlikte tek transaction'da siler (cari özeti de güncellenir)"""
+    fatura = get(fatura_id, ['id', 'cari_id', 'fatura_tarihi', 'toplam_tutar', 'toplam_kdv'])
+    CariOzet.ensure_table()
+    SatisRollup.ensure_tables()
+
+    connection = db.get_connection()
+    if not connection:
+        raise ServiceError('Veritabanı bağlantı hatası', 500)
+
+    cursor = None
+    try:
+        cursor = connection.cursor()
+
+        # 1. Faturayı kilitle - eşzamanlı iki silme özetlerden iki kez düşmesin
+        cursor.execute("SELECT id FROM fatura WHERE id = %s FOR UPDATE", (fatura_id,))
+        if not cursor.fetchone():
+            raise ServiceError('Fatura bulunamadı', 404)
+
+        # Satış özetlerinden faturanın katkısını çıkar (satırlar henüz silinmeden)
+        SatisRollup.apply(cursor, fatura_id, -1)
+
+        # 2. Detayları sil
+        cursor.execute("DELETE FROM fatura_detay WHERE fatura_id = %s", (fatura_id,))
+
+        # 3. Sonra faturayı sil
+        cursor.execute("DELETE FROM fatura WHERE id = %s", (fatura_id,))
+
+        # 4. Cari özetinden düş
+        if cursor.rowcount:
+            CariOzet.apply_delete(cursor, fatura.cari_id, fatura.fatura_tarihi, fatura.toplam_tutar, fatura.toplam_kdv)
+
+        connection.commit()
+        notify_write('fatura', fatura_id)
+
+    except ServiceError:
+        connection.rollback()
+        raise
+    except Exception as e:
+        connection.rollback()
+        raise ServiceError(f'Fatura silme hatası: {str(e)}', 500)
+    finally:
+        if cursor:
+            cursor.close()
+        if connection:
+            connection.close()
@@ -0,0 +1,215 @@
+import csv
+import io
+import json
+from utils.database import db
+from utils.cache import notify_write
+from services.errors import ServiceError
+import config
+
+
+def _text(value):
+    value = (value or '').strip() if isinstance(value, str) else value
+    return value if value not in ('', None) else None
+
+
+def _int(value):
+    value = _text(value)
+    return int(value) if value is not None else None
+
+
+def _float(value):
+    value = _text(value)
+    return float(str(value).replace(',', '.')) if value is not None else None
+
+
+def _validate_urun(row):
+    if not row['adi']:
+        raise ValueError('Ürün adı gereklidir')
+    row['kdv'] = row['kdv'] or 0
+    if not 0 <= row['kdv'] <= 100:
+        raise ValueError('KDV 0-100 arasında olmalıdır')
+
+
+def _validate_cari(row):
+    if not row['adi_soyadi']:
+        raise ValueError('Cari adı gereklidir')
+    tc = row['tc_kimlik_no']
+    if tc is not None and (len(tc) != 11 or not tc.isdigit()):
+        raise ValueError('TC kimlik numarası 11 haneli olmalıdır')
+
+
+def _validate_birim(row):
+    if not row['kisa_adi'] or not row['adi']:
+        raise ValueError('Kısa ad ve birim adı gereklidir')
+    if row['kg_karsiligi'] is None:
+        row['kg_karsiligi'] = 1.0
+
+
+# Kaynak -> (tablo, kolonlar ve dönüştürücüler, doğrulama)
+# Upsert, tablodaki UNIQUE anahtarlar (barkod/adi, adi_soyadi/tc_kimlik_no, kisa_adi+adi) üzerinden çalışır.
+IMPORT_SPECS = {
+    'urun': ('urun', [
+        ('barkod', _text), ('kisa_adi', _text), ('adi', _text),
+        ('birim_id', _int), ('kdv', _int), ('aciklama', _text)
+    ], _validate_urun),
+    'cari': ('cari', [
+        ('adi_soyadi', _text), ('tc_kimlik_no', _text), ('aciklama', _text)
+    ], _validate_cari),
+    'birim': ('birim', [
+        ('kisa_adi', _text), ('adi', _text), ('kg_karsiligi', _float), ('aciklama', _text)
+    ], _validate_birim),
+}
+
+
+def iter_csv(stream):
+    """Binary stream'i satır satır CSV olarak okur - (satır no, dict)
+
+    Satır no, kaydın bittiği fiziksel satırdır (tırnaklı alan birden çok satıra yayılabilir).
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    for record in reader:
+        yield reader.line_num, record
+
+
+def iter_ndjson(stream):
+    """Binary stream'i satır satır NDJSON olarak okur - (satır no, dict)"""
+    for line_no, line in enumerate(io.TextIOWrapper(stream, encoding='utf-8-sig'), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_no, ValueError('Geçersiz JSON satırı')
+            continue
+        yield line_no, record if isinstance(record, dict) else ValueError('Satır bir JSON nesnesi olmalıdır')
+
+
+def iter_records(stream, fmt):
+    if fmt == 'csv':
+        return iter_csv(stream)
+    if fmt == 'ndjson':
+        return iter_ndjson(stream)
+    raise ServiceError("Desteklenen formatlar: csv, ndjson", 400)
+
+
+class Importer:
+    """Satırları doğrular ve parça parça transaction'larla upsert eder"""
+
+    def __init__(self, resource, chunk_size=None, max_errors=None):
+        if resource not in IMPORT_SPECS:
+            raise ServiceError(f'Toplu yükleme desteklenmiyor: {resource}', 404)
+        self.resource = resource
+        self.table, self.columns, self.validate = IMPORT_SPECS[resource]
+        self.chunk_size = chunk_size or config.Config.IMPORT_CHUNK_SIZE
+        self.max_errors = max_errors or config.Config.IMPORT_MAX_ERRORS
+
+        names = [name for name, _ in self.columns]
+        placeholders = ', '.join(['%s'] * len(names))
+        updates = ', '.join(f"{name} = VALUES({name})" for name in names)
+        self.query = (f"INSERT INTO {self.table} ({', '.join(names)}) VALUES ({placeholders}) "
+                      f"ON DUPLICATE KEY UPDATE {updates}")
+
+        self.report = {'total': 0, 'imported': 0, 'failed': 0, 'errors': []}
+
+    def _error(self, line_no, message):
+        self.report['failed'] += 1
+        if len(self.report['errors']) < self.max_errors:
+            self.report['errors'].append({'row': line_no, 'error': message})
+
+    def _parse(self, line_no, record):
+        """Ham kaydı kolon sırasına göre dönüştürüp doğrular - hata varsa None"""
+        if isinstance(record, Exception):
+            self._error(line_no, str(record))
+            return None
+        try:
+            row = {name: convert(record.get(name)) for name, convert in self.columns}
+            self.validate(row)
+            return row
+        except (ValueError, TypeError) as e:
+            self._error(line_no, str(e))
+            return None
+
+    def _missing_birimler(self, cursor, chunk):
+        """Ürün parçasındaki birim_id'leri tek sorguda kontrol eder"""
+        ids = {row['birim_id'] for _, row in chunk if row['birim_id'] is not None}
+        if not ids:
+            return set()
+        cursor.execute(f"SELECT id FROM birim WHERE id IN ({', '.join(['%s'] * len(ids))})", list(ids))
+        return ids - {item['id'] for item in cursor.fetchall()}
+
+    def _flush(self, chunk):
+        """Bir parçayı tek transaction'da yazar - hata olursa satır satır tekrar dener"""
+        if not chunk:
+            return
+        names = [name for name, _ in self.columns]
+        connection = db.get_connection()
+        cursor = None
+        try:
+            cursor = connection.cursor()
+
+            if self.resource == 'urun':
+                missing = self._missing_birimler(cursor, chunk)
+                if missing:
+                    valid = []
+                    for line_no, row in chunk:
+                        if row['birim_id'] in missing:
+                            self._error(line_no, f"Birim bulunamadı: {row['birim_id']}")
+                        else:
+                            valid.append((line_no, row))
+                    chunk = valid
+
+            rows = [tuple(row[name] for name in names) for _, row in chunk]
+            try:
+                if rows:
+                    cursor.executemany(self.query, rows)
+                connection.commit()
+                self.report['imported'] += len(rows)
+            except Exception:
+                # Hatalı satırı bulmak için parçayı satır satır yaz
+                connection.rollback()
+                written = []
+                for (line_no, _), params in zip(chunk, rows):
+                    try:
+                        cursor.execute(self.query, params)
+                        written.append(line_no)
+                    except Exception as e:
+                        self._error(line_no, str(e))
+                # Satırlar ancak commit başarılıysa yüklenmiş sayılır
+                try:
+                    connection.commit()
+                except Exception as e:
+                    connection.rollback()
+                    for line_no in written:
+                        self._error(line_no, f"Commit başarısız: {e}")
+                else:
+                    self.report['imported'] += len(written)
+        finally:
+            if cursor:
+                cursor.close()
+            connection.close()
+
+    def run(self, records):
+        """(satır no, kayıt) akışını işler ve raporu döndürür"""
+        chunk = []
+        for line_no, record in records:
+            self.report['total'] += 1
+            row = self._parse(line_no, record)
+            if row is None:
+                continue
+            chunk.append((line_no, row))
+            if len(chunk) >= self.chunk_size:
+                self._flush(chunk)
+                chunk = []
+        self._flush(chunk)
+
+        if self.report['imported']:
+            notify_write(self.table)
+        self.report['errors_truncated'] = self.report['failed'] > len(self.report['errors'])
+        return self.report
+
+
+def import_stream(resource, stream, fmt):
+    """Stream'deki CSV/NDJSON kayıtlarını toplu olarak yükler"""
+    importer = Importer(resource)
+    return importer.run(iter_records(stream, fmt))
@@ -0,0 +1,16 @@
+from models.satis_rollup import SatisRollup
+from services.errors import ServiceError
+
+GRUPLAR = ('gun', 'ay', 'urun', 'cari')
+RAPOR_MAX_LIMIT = 1000
+
+
+def satis(grup, baslangic=None, bitis=None, limit=100):
+    """Günlük özet tablolarından satış raporu (gün/ay/ürün/cari kırılımı)"""
+    if grup not in GRUPLAR:
+        raise ServiceError(f"grup şunlardan biri olmalıdır: {', '.join(GRUPLAR)}", 400)
+    try:
+        limit = min(max(int(limit), 1), RAPOR_MAX_LIMIT)
+    except (TypeError, ValueError):
+        raise ServiceError('limit bir sayı olmalıdır', 400)
+    return SatisRollup.report(grup, baslangic, bitis, limit)
@@ -0,0 +1,133 @@
+import logging
+from models.urun import Urun
+from services.errors import ServiceError
+from utils.cache import on_write, LRUCache
+from utils.search import PrefixIndex
+import config
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MAX_LIMIT = 50
+
+# Fatura formundaki ürün seçici için bellek içi önek indeksi
+urun_index = PrefixIndex('urun', ['adi', 'kisa_adi', 'barkod'], ['adi', 'kisa_adi', 'barkod', 'birim_id', 'kdv'])
+on_write('urun', urun_index.refresh)
+
+# Kasa barkod okuyucuları için barkod -> ürün sözlüğü cache'i.
+# Ürün yazmalarında (barkod değişmiş olabilir) ve birim yazmalarında (birim_adi) boşaltılır.
+barkod_cache = LRUCache(config.Config.BARKOD_CACHE_SIZE, name='barkod',
+                        ttl=config.Config.BARKOD_CACHE_TTL, miss_ttl=config.Config.BARKOD_MISS_TTL)
+on_write('urun', barkod_cache.clear)
+on_write('birim', barkod_cache.clear)
+
+
+def list_all(filters=None, fields=None):
+    """Ürünleri listeler"""
+    return Urun.get_all(filters, fields)
+
+
+def get_page(filters, limit, after, fields=None):
+    """Keyset sayfalı ürün listesi - (liste, sonraki cursor)"""
+    return Urun.get_page(filters, limit, after, fields)
+
+
+def search(query, limit=10):
+    """Ad, kısa ad veya barkod önekine göre en iyi eşleşen ürünler"""
+    return urun_index.search(query, min(max(int(limit), 1), SEARCH_MAX_LIMIT))
+
+
+def _load_barkodlar(barkodlar):
+    return {barkod: urun.to_dict() for barkod, urun in Urun.get_by_barkods(barkodlar).items()}
+
+
+def get_by_barkod(barkod):
+    """Barkoda tam eşleşen ürün (sözlük) - yoksa 404"""
+    barkod = (barkod or '').strip()
+    urun = barkod_cache.get_many([barkod], _load_barkodlar)[barkod] if barkod else None
+    if not urun:
+        raise ServiceError('Ürün bulunamadı', 404)
+    return urun
+
+
+def get_by_barkods(barkodlar):
+    """Birden çok barkod için tek seferde arama - (bulunanlar, bulunamayanlar)"""
+    if not isinstance(barkodlar, list):
+        raise ServiceError('barkodlar bir liste olmalıdır', 400)
+    if len(barkodlar) > config.Config.BARKOD_BATCH_MAX:
+        raise ServiceError(f'En fazla {config.Config.BARKOD_BATCH_MAX} barkod sorgulanabilir', 400)
+
+    keys = list(dict.fromkeys(str(b).strip() for b in barkodlar if str(b).strip()))
+    result = barkod_cache.get_many(keys, _load_barkodlar)
+    found = {key: result[key] for key in keys if result[key]}
+    missing = [key for key in keys if not result[key]]
+    return found, missing
+
+
+def get(urun_id, fields=None):
+    """ID'ye göre ürün getirir - yoksa 404"""
+    urun = Urun.get_by_id(urun_id, fields)
+    if not urun:
+        raise ServiceError('Ürün bulunamadı', 404)
+    return urun
+
+
+def create(data):
+    """Yeni ürün oluşturur"""
+    if not data or not data.get('adi'):
+        raise ServiceError('Ürün adı gereklidir', 400)
+
+    yeni_urun = Urun(
+        barkod=data.get('barkod'),
+        kisa_adi=data.get('kisa_adi'),
+        adi=data.get('adi'),
+        birim_id=data.get('birim_id'),
+        kdv=data.get('kdv', 0),
+        aciklama=data.get('aciklama')
+    )
+
+    try:
+        created = yeni_urun.create()
+    except Exception as e:
+        error_message = str(e)
+        logger.error("Ürün oluşturma hatası: %s", error_message)
+
+        if "1062" in error_message and "barkod" in error_message:
+            raise ServiceError('Bu barkod zaten kayıtlıdır', 400)
+        elif "1062" in error_message and "adi" in error_message:
+            raise ServiceError('Bu ürün adı zaten kayıtlıdır', 400)
+        elif "foreign key" in error_message and "birim_id" in error_message:
+            raise ServiceError('Seçilen birim bulunamadı', 400)
+        raise ServiceError(f'Ürün oluşturma hatası: {error_message}', 500)
+
+    if not created:
+        raise ServiceError('Ürün oluşturulamadı', 500)
+    return yeni_urun
+
+
+def update(urun_id, data):
+    """Ürün günceller"""
+    urun = get(urun_id)
+
+    for field in ('barkod', 'kisa_adi', 'adi', 'birim_id', 'kdv', 'aciklama'):
+        if field in data:
+            setattr(urun, field, data[field])
+
+    if not urun.update():
+        raise ServiceError('Ürün güncellenemedi', 500)
+    return urun
+
+
+def delete(urun_id):
+    """Ürün siler"""
+    urun = get(urun_id)
+
+    try:
+        deleted = urun.delete()
+    except Exception as e:
+        error_message = str(e)
+        if "kullanımdadır" in error_message:
+            raise ServiceError(error_message, 400)
+        raise ServiceError(f'Ürün silme hatası: {error_message}', 500)
+
+    if not deleted:
+        raise ServiceError('Ürün silinemedi', 500)
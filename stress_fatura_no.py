@@ -0,0 +1,87 @@
+"""Fatura numarası dağıtıcısı için paralel yük testi
+
+Birden fazla process (worker) ve her birinde birden fazla thread aynı seriden
+numara ister. Sonunda tekrar eden numara olmadığı ve boşlukların
+izin verilen sınırı (varsayılan: worker sayısı x blok boyutu) aşmadığı kontrol edilir.
+
+Kullanım:
+    python stress_fatura_no.py --workers 4 --threads 8 --count 200 --block-size 10
+"""
+import argparse
+import multiprocessing
+import sys
+import threading
+import time
+
+
+def worker(seri, threads, count, block_size, queue):
+    """Tek bir worker process'i - kendi dağıtıcısıyla numara çeker"""
+    import config
+    from utils.sequence import SequenceAllocator
+
+    allocator = SequenceAllocator(config.Config.FATURA_NO_TABLE, block_size)
+    numbers = []
+    lock = threading.Lock()
+
+    def run():
+        local = [allocator.next(seri) for _ in range(count)]
+        with lock:
+            numbers.extend(local)
+
+    pool = [threading.Thread(target=run) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+
+    queue.put(numbers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fatura numarası dağıtıcısı yük testi')
+    parser.add_argument('--workers', type=int, default=4, help='Process sayısı')
+    parser.add_argument('--threads', type=int, default=8, help='Process başına thread sayısı')
+    parser.add_argument('--count', type=int, default=200, help='Thread başına istenen numara')
+    parser.add_argument('--block-size', type=int, default=10, help='Worker başına ayrılan blok')
+    parser.add_argument('--max-gap', type=int, default=None,
+                        help='İzin verilen toplam boşluk (varsayılan: workers x block-size)')
+    args = parser.parse_args()
+
+    seri = f"TEST{int(time.time() * 1000)}"
+    max_gap = args.max_gap if args.max_gap is not None else args.workers * args.block_size
+
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    processes = [
+        ctx.Process(target=worker, args=(seri, args.threads, args.count, args.block_size, queue))
+        for _ in range(args.workers)
+    ]
+
+    started = time.perf_counter()
+    for p in processes:
+        p.start()
+    numbers = []
+    for _ in processes:
+        numbers.extend(queue.get())
+    for p in processes:
+        p.join()
+    elapsed = time.perf_counter() - started
+
+    expected = args.workers * args.threads * args.count
+    unique = set(numbers)
+    duplicates = len(numbers) - len(unique)
+    gaps = (max(unique) - min(unique) + 1 - len(unique)) if unique else 0
+
+    print(f"🔢 Seri: {seri}")
+    print(f"📊 İstenen: {expected}, alınan: {len(numbers)}, tekil: {len(unique)}")
+    print(f"⏱️ Süre: {elapsed:.2f} sn ({len(numbers) / elapsed:.0f} numara/sn)")
+    print(f"🔁 Tekrar eden: {duplicates}")
+    print(f"🕳️ Boşluk: {gaps} (sınır: {max_gap})")
+
+    ok = len(numbers) == expected and duplicates == 0 and gaps <= max_gap
+    print("✅ Başarılı" if ok else "❌ Başarısız")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
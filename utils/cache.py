@@ -0,0 +1,168 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from utils.metrics import record_cache
+import config
+
+logger = logging.getLogger(__name__)
+
+# Tablo adı -> yazma sonrası çağrılacak fonksiyonlar
+_write_listeners = {}
+_listeners_lock = threading.Lock()
+
+# Tablo değişiklik sürümleri (ETag'ler için) - process ömrü boyunca artar
+_table_versions = {}  # tablo -> her yazmada artan sayaç
+_bulk_versions = {}   # tablo -> id'siz (toplu) yazmalarda artan sayaç
+_row_versions = OrderedDict()  # (tablo, id) -> o kayda yapılan yazma sayısı (en son yazılan sonda)
+_versions_lock = threading.Lock()
+
+
+def on_write(table, callback):
+    """Tabloya yazma yapıldığında çağrılacak fonksiyonu kaydeder"""
+    with _listeners_lock:
+        _write_listeners.setdefault(table, []).append(callback)
+
+
+def notify_write(table, row_id=None):
+    """Modeller create/update/delete sonrası çağırır - ilgili cache'leri geçersiz kılar
+
+    row_id verilirse dinleyiciler sadece o kaydı yenileyebilir; verilmezse
+    (toplu işlemler) tüm tablo değişmiş kabul edilir.
+    """
+    with _versions_lock:
+        _table_versions[table] = _table_versions.get(table, 0) + 1
+        if row_id is None:
+            _bulk_versions[table] = _bulk_versions.get(table, 0) + 1
+        else:
+            key = (table, int(row_id))
+            _row_versions[key] = _row_versions.get(key, 0) + 1
+            _row_versions.move_to_end(key)
+            # Sınır aşılınca en eski kayıt sürümü atılır; sayaç sıfırlanıp eski bir
+            # ETag'le eşleşmesin diye tablonun toplu sürümü artırılır
+            while len(_row_versions) > config.Config.ROW_VERSIONS_MAX:
+                (evicted, _), _ = _row_versions.popitem(last=False)
+                _bulk_versions[evicted] = _bulk_versions.get(evicted, 0) + 1
+
+    for callback in _write_listeners.get(table, ()):
+        try:
+            callback(table, row_id)
+        except Exception as e:
+            logger.error("Cache geçersiz kılma hatası (%s): %s", table, e)
+
+
+def table_version(table):
+    """Tablonun değişiklik sürümü - tabloya her yazmada artar"""
+    return _table_versions.get(table, 0)
+
+
+def row_version(table, row_id):
+    """Tek kaydın sürümü - (toplu yazma sürümü, kayıt yazma sürümü)"""
+    with _versions_lock:
+        return _bulk_versions.get(table, 0), _row_versions.get((table, int(row_id)), 0)
+
+
+class TTLCache:
+    """Süre sınırlı, thread-safe basit anahtar/değer cache'i"""
+
+    def __init__(self, ttl, name='ttl'):
+        self.ttl = ttl
+        self.name = name
+        self._data = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def get(self, key, loader):
+        """Anahtar cache'te ve süresi dolmamışsa döner, yoksa loader() ile yükler"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry and entry[0] > now:
+                record_cache(self.name, True)
+                return entry[1]
+            generation = self._generation
+        record_cache(self.name, False)
+
+        value = loader()
+        with self._lock:
+            # Yükleme sırasında clear() çağrıldıysa eski veriyi saklama
+            if generation == self._generation:
+                self._data[key] = (time.monotonic() + self.ttl, value)
+        return value
+
+    def clear(self, *args):
+        """Tüm cache'i temizler (on_write callback'i olarak da kullanılabilir)"""
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+
+
+class LRUCache:
+    """Boyut sınırlı, thread-safe LRU cache - en az kullanılan kayıt önce atılır
+
+    Bulunamayan anahtarlar da (None) saklanır; böylece tekrarlanan başarısız
+    sorgular da veritabanına gitmez. Yazma sonrası clear() ile boşaltılır.
+    Başka process'lerin yazmalarını görmek için kayıtlar ttl (bulunamayanlar
+    miss_ttl, 0 ise hiç saklanmaz) saniye sonra süresi dolmuş sayılır;
+    ttl None ise süre sınırı yoktur.
+    """
+
+    def __init__(self, max_size, name='lru', ttl=None, miss_ttl=None):
+        self.max_size = max(int(max_size), 1)
+        self.name = name
+        self.ttl = ttl
+        self.miss_ttl = ttl if miss_ttl is None else miss_ttl
+        self._data = OrderedDict()  # anahtar -> (bitiş zamanı, değer)
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def get_many(self, keys, loader):
+        """Anahtarları cache'ten döner; eksikleri tek loader(eksikler) çağrısıyla yükler
+
+        loader bulunan anahtarlar için {anahtar: değer} döndürmelidir.
+        """
+        result = {}
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            # Tekrarlanan anahtarlar bir kez sayılır/yüklenir (sıra korunur)
+            for key in dict.fromkeys(keys):
+                entry = self._data.get(key)
+                if entry is not None and entry[0] > now:
+                    self._data.move_to_end(key)
+                    result[key] = entry[1]
+                else:
+                    missing.append(key)
+            generation = self._generation
+
+        if result:
+            record_cache(self.name, True, len(result))
+
+        if missing:
+            record_cache(self.name, False, len(missing))
+            loaded = loader(missing)
+            now = time.monotonic()
+            with self._lock:
+                for key in missing:
+                    value = loaded.get(key)
+                    result[key] = value
+                    ttl = self.ttl if value is not None else self.miss_ttl
+                    # Yükleme sırasında clear() çağrıldıysa eski veriyi saklama
+                    if generation != self._generation or ttl == 0:
+                        self._data.pop(key, None)
+                        continue
+                    self._data[key] = (now + ttl if ttl is not None else float('inf'), value)
+                    self._data.move_to_end(key)
+                while len(self._data) > self.max_size:
+                    self._data.popitem(last=False)
+        return result
+
+    def get(self, key, loader):
+        """Tek anahtar için get_many kısayolu - loader(key) değeri ya da None döner"""
+        return self.get_many([key], lambda keys: {key: loader(key)})[key]
+
+    def clear(self, *args):
+        """Tüm cache'i temizler (on_write callback'i olarak da kullanılabilir)"""
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
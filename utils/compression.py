@@ -0,0 +1,59 @@
+import gzip
+from flask import request
+import config
+
+try:
+    import brotli
+except ImportError:  # brotli opsiyonel - yoksa sadece gzip sunulur
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/html', 'text/csv', 'text/plain', 'application/x-ndjson')
+
+
+def _accepted_encoding():
+    """İstemcinin kabul ettiği en iyi kodlama - br > gzip, yoksa None"""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=config.Config.COMPRESS_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=config.Config.COMPRESS_LEVEL)
+
+
+def compress_response(response):
+    """after_request - uygun yanıtları istemcinin kabul ettiği kodlamayla sıkıştırır"""
+    if (response.status_code < 200 or response.status_code >= 300
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if len(data) < config.Config.COMPRESS_MIN_SIZE:
+        return response
+
+    encoding = _accepted_encoding()
+    if encoding is None:
+        return response
+
+    response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+
+    # Sıkıştırılmış gösterim bayt bayt aynı olmadığından ETag zayıf olarak işaretlenir
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    """Sıkıştırmayı uygulamaya kaydeder (COMPRESS_ENABLED kapalıysa hiçbir şey yapmaz)"""
+    if config.Config.COMPRESS_ENABLED:
+        app.after_request(compress_response)
@@ -1,10 +1,265 @@
+import logging
+import threading
+import time
 import pymysql
 from pymysql import Error
+from pymysql.constants import SERVER_STATUS
+from utils.metrics import record_query, register_collector
+from utils.profiler import record as profile_query
 import config
 
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """Havuzdan belirtilen süre içinde bağlantı alınamadığında fırlatılır"""
+    pass
+
+
+class TimedCursor:
+    """Cursor sarmalayıcı - execute/executemany süresini metriklere ve sorgu profiline yazar"""
+
+    __slots__ = ('_cursor',)
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._cursor.close()
+
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = self._cursor.execute(query, args)
+            failed = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            record_query(query, elapsed, failed)
+            profile_query(query, args, elapsed)
+
+    def executemany(self, query, args):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = self._cursor.executemany(query, args)
+            failed = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            record_query(query, elapsed, failed)
+            profile_query(query, args, elapsed)
+
+
+class PooledConnection:
+    """Havuzdan alınan bağlantı - close() bağlantıyı kapatmaz, havuza iade eder"""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self._released = False
+        self.broken = False
+
+    def __getattr__(self, name):
+        # commit(), rollback() vb. gerçek bağlantıya yönlendirilir
+        return getattr(self._raw, name)
+
+    def cursor(self, cursor=None):
+        """Süre ölçümlü cursor döndürür (servis ve modellerdeki ham cursor'lar dahil)"""
+        return TimedCursor(self._raw.cursor(cursor) if cursor else self._raw.cursor())
+
+    def close(self):
+        """Bağlantıyı havuza iade eder (birden fazla çağrılabilir)"""
+        if self._released:
+            return
+        self._released = True
+        self._pool.release(self._raw, discard=self.broken)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """Thread-safe, sınırlı boyutlu MySQL bağlantı havuzu"""
+
+    def __init__(self, connect, min_size=1, max_size=10, max_lifetime=3600,
+                 checkout_timeout=10, ping_interval=30):
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max(max_size, 1)
+        self.max_lifetime = max_lifetime
+        self.checkout_timeout = checkout_timeout
+        self.ping_interval = ping_interval
+
+        self._lock = threading.Condition(threading.Lock())
+        self._idle = []  # (bağlantı, oluşturulma zamanı, iade zamanı)
+        self._created_at = {}  # id(bağlantı) -> oluşturulma zamanı
+        self._size = 0
+
+        self._stats = {
+            'created': 0,
+            'closed': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'ping_failures': 0,
+            'recycled': 0,
+        }
+
+    def _open(self):
+        """Yeni ham bağlantı açar (kilit dışında çağrılır)"""
+        raw = self._connect()
+        with self._lock:
+            self._created_at[id(raw)] = time.monotonic()
+            self._stats['created'] += 1
+        return raw
+
+    def _close_raw(self, raw):
+        """Ham bağlantıyı kapatır ve sayaçları günceller"""
+        try:
+            raw.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._created_at.pop(id(raw), None)
+            self._size -= 1
+            self._stats['closed'] += 1
+            self._lock.notify()
+
+    def _expired(self, created_at, now):
+        return self.max_lifetime and now - created_at > self.max_lifetime
+
+    def fill(self):
+        """Havuzu min_size kadar bağlantıyla doldurur"""
+        while True:
+            with self._lock:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                raw = self._open()
+            except Exception:
+                with self._lock:
+                    self._size -= 1
+                    self._lock.notify()
+                raise
+            with self._lock:
+                self._idle.append((raw, self._created_at[id(raw)], time.monotonic()))
+                self._lock.notify()
+
+    def acquire(self):
+        """Havuzdan bağlantı alır - gerekirse yeni açar ya da bekler"""
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            raw = None
+            create = False
+            with self._lock:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeout(
+                            f"Havuzdan {self.checkout_timeout} sn içinde bağlantı alınamadı "
+                            f"(boyut: {self._size}/{self.max_size})"
+                        )
+                    self._stats['waits'] += 1
+                    self._lock.wait(remaining)
+
+                if self._idle:
+                    # LIFO: en son iade edilen bağlantı en sıcak olanıdır
+                    raw, created_at, returned_at = self._idle.pop()
+                else:
+                    self._size += 1
+                    create = True
+
+            if create:
+                try:
+                    raw = self._open()
+                except Exception:
+                    with self._lock:
+                        self._size -= 1
+                        self._lock.notify()
+                    raise
+            else:
+                now = time.monotonic()
+                if self._expired(created_at, now):
+                    with self._lock:
+                        self._stats['recycled'] += 1
+                    self._close_raw(raw)
+                    continue
+                if self.ping_interval is not None and now - returned_at >= self.ping_interval:
+                    try:
+                        raw.ping(reconnect=False)
+                    except Exception:
+                        with self._lock:
+                            self._stats['ping_failures'] += 1
+                        self._close_raw(raw)
+                        continue
+
+            with self._lock:
+                self._stats['checkouts'] += 1
+            return PooledConnection(self, raw)
+
+    def release(self, raw, discard=False):
+        """Bağlantıyı havuza iade eder"""
+        if not discard:
+            try:
+                # Açık kalan transaction (SELECT dahil) sonraki kullanıcıya taşınmasın
+                if raw.open and raw.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+                    raw.rollback()
+            except Exception:
+                discard = True
+
+        now = time.monotonic()
+        with self._lock:
+            created_at = self._created_at.get(id(raw), now)
+            if not discard and raw.open and not self._expired(created_at, now):
+                self._idle.append((raw, created_at, now))
+                self._lock.notify()
+                return
+            if not discard:
+                self._stats['recycled'] += 1
+        self._close_raw(raw)
+
+    def close_all(self):
+        """Boştaki tüm bağlantıları kapatır"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for raw, _, _ in idle:
+            self._close_raw(raw)
+
+    def stats(self):
+        """Havuz istatistiklerini döndürür"""
+        with self._lock:
+            result = dict(self._stats)
+            result['size'] = self._size
+            result['idle'] = len(self._idle)
+            result['in_use'] = self._size - len(self._idle)
+            result['min_size'] = self.min_size
+            result['max_size'] = self.max_size
+            return result
+
+
 class Database:
-    def get_connection(self):
-        """MySQL bağlantısı oluşturur"""
+    def __init__(self):
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _connect(self):
+        """Yeni bir MySQL bağlantısı açar (havuz tarafından kullanılır)"""
         try:
             connection = pymysql.connect(
                 host=config.Config.MYSQL_HOST,
@@ -17,9 +272,55 @@ class Database:
             )
             return connection
         except Error as e:
-            print(f"❌ MySQL bağlantı hatası: {e}")
+            logger.error("MySQL bağlantı hatası: %s", e)
             raise e  # Exception'ı yukarı fırlat
-    
+
+    @property
+    def pool(self):
+        """Havuzu ilk kullanımda oluşturur"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    pool = ConnectionPool(
+                        self._connect,
+                        min_size=config.Config.DB_POOL_MIN_SIZE,
+                        max_size=config.Config.DB_POOL_MAX_SIZE,
+                        max_lifetime=config.Config.DB_POOL_MAX_LIFETIME,
+                        checkout_timeout=config.Config.DB_POOL_TIMEOUT,
+                        ping_interval=config.Config.DB_POOL_PING_INTERVAL
+                    )
+                    try:
+                        pool.fill()
+                    except Error as e:
+                        logger.error("Havuz doldurulamadı: %s", e)
+                    self._pool = pool
+        return self._pool
+
+    def get_connection(self):
+        """Havuzdan MySQL bağlantısı alır - close() bağlantıyı havuza iade eder"""
+        return self.pool.acquire()
+
+    def collect_metrics(self):
+        """/metrics için havuz sayaçları - havuz henüz oluşturulmadıysa boş"""
+        if self._pool is None:
+            return []
+        stats = self._pool.stats()
+        return [
+            ('db_connections_opened_total', 'counter', 'Açılan MySQL bağlantıları', [({}, stats['created'])]),
+            ('db_connections_closed_total', 'counter', 'Kapatılan MySQL bağlantıları', [({}, stats['closed'])]),
+            ('db_pool_checkouts_total', 'counter', 'Havuzdan alınan bağlantılar', [({}, stats['checkouts'])]),
+            ('db_pool_waits_total', 'counter', 'Bağlantı için bekleme sayısı', [({}, stats['waits'])]),
+            ('db_pool_timeouts_total', 'counter', 'Bağlantı bekleme zaman aşımları', [({}, stats['timeouts'])]),
+            ('db_pool_connections', 'gauge', 'Havuzdaki bağlantılar', [
+                ({'state': 'idle'}, stats['idle']),
+                ({'state': 'in_use'}, stats['in_use'])
+            ]),
+        ]
+
+    def pool_stats(self):
+        """Bağlantı havuzu istatistikleri"""
+        return self.pool.stats()
+
     def execute_query(self, query, params=None, fetch=False):
         """Sorgu çalıştırma yardımcı fonksiyonu - EXCEPTION FIRLATIR"""
         connection = self.get_connection()
@@ -43,12 +344,20 @@ class Database:
             return result
             
         except Error as e:
-            print(f"❌ Sorgu hatası: {e}")
-            connection.rollback()
+            logger.error("Sorgu hatası: %s", e)
+            if isinstance(e, (pymysql.err.OperationalError, pymysql.err.InterfaceError)):
+                connection.broken = True
+            try:
+                connection.rollback()
+            except Error:
+                connection.broken = True
             raise e  # Exception'ı yukarı fırlat
         except Exception as e:
-            print(f"❌ Genel sorgu hatası: {e}")
-            connection.rollback()
+            logger.error("Genel sorgu hatası: %s", e)
+            try:
+                connection.rollback()
+            except Error:
+                connection.broken = True
             raise e  # Exception'ı yukarı fırlat
         finally:
             if cursor:
@@ -56,5 +365,28 @@ class Database:
             if connection:
                 connection.close()
 
+    def fetch_rows(self, query, params=None):
+        """SELECT sorgusunu tuple cursor ile çalıştırır - (kolon adları, satırlar) döner
+
+        Satır başına dict oluşturulmaz; sıcak liste yolları SlottedRow.from_rows ile kullanır.
+        """
+        connection = self.get_connection()
+        cursor = None
+        try:
+            cursor = connection.cursor(pymysql.cursors.Cursor)
+            cursor.execute(query, params or ())
+            columns = tuple(column[0] for column in cursor.description)
+            return columns, cursor.fetchall()
+        except Error as e:
+            logger.error("Sorgu hatası: %s", e)
+            if isinstance(e, (pymysql.err.OperationalError, pymysql.err.InterfaceError)):
+                connection.broken = True
+            raise e
+        finally:
+            if cursor:
+                cursor.close()
+            connection.close()
+
 # Global database instance
-db = Database()
\ No newline at end of file
+db = Database()
+register_collector(db.collect_metrics)
\ No newline at end of file
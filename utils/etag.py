@@ -0,0 +1,71 @@
+import hashlib
+import os
+import time
+from functools import wraps
+from flask import request, make_response
+from utils.cache import table_version, row_version
+from utils.metrics import record_cache
+import config
+
+# Process başlangıç damgası - yeniden başlatma sonrası sayaçlar sıfırlansa da
+# eski ETag'ler yeni verilerle eşleşmez
+_EPOCH = f"{os.getpid()}-{time.time_ns()}"
+
+
+def _digest(*parts):
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()[:32]
+
+
+def _window():
+    """ETAG_MAX_AGE'lik zaman dilimi - sürüm sayaçları sadece bu process'in yazmalarını
+    gördüğünden, başka worker ya da betiklerin yazmaları en geç bir dilim sonra yansır"""
+    max_age = config.Config.ETAG_MAX_AGE
+    return int(time.time() // max_age) if max_age > 0 else 0
+
+
+def list_etag(tables):
+    """Liste yanıtı ETag'i - tabloların sürümleri ve istek adresi (filtreler, sayfa) üzerinden"""
+    versions = [f"{table}:{table_version(table)}" for table in tables]
+    return _digest(_EPOCH, _window(), request.full_path, *versions)
+
+
+def row_etag(table, row_id, related=()):
+    """Detay yanıtı ETag'i - kaydın kendi sürümü ve ilişkili tabloların sürümleri üzerinden"""
+    bulk, row = row_version(table, row_id)
+    versions = [f"{name}:{table_version(name)}" for name in related]
+    return _digest(_EPOCH, _window(), request.full_path, table, row_id, bulk, row, *versions)
+
+
+def conditional(tables, row_arg=None):
+    """GET endpoint'lerine ETag ve If-None-Match (304) desteği ekler
+
+    tables[0] ana tablodur; row_arg verilirse (ör. 'cari_id') detay ETag'i,
+    verilmezse liste ETag'i üretilir. Diğer tablolar yanıttaki ilişkili
+    alanlar (birim_adi, cari_adi, ...) içindir. Sürüm veriden önce okunur;
+    arada yazma olursa yanıt eski ETag'le gider ve sonraki istek 200 alır.
+    Başka process'lerin yazmaları sayaçlara yansımaz; ETag'ler ETAG_MAX_AGE
+    dilimlerinde yenilendiği için bu yazmalar da en geç o süre sonra görülür.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if row_arg:
+                etag = row_etag(tables[0], kwargs[row_arg], tables[1:])
+            else:
+                etag = list_etag(tables)
+
+            # Sıkıştırılmış yanıtlar zayıf ETag taşır - If-None-Match zayıf karşılaştırılır
+            if request.if_none_match.contains_weak(etag):
+                record_cache('etag', True)
+                response = make_response('', 304)
+                response.set_etag(etag)
+                return response
+
+            if request.if_none_match:
+                record_cache('etag', False)
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,32 @@
+def parse_fields(value, allowed):
+    """?fields=a,b,c parametresini doğrular - parametre yoksa None (tüm alanlar)
+
+    id her zaman dahil edilir; izin verilmeyen alan varsa ValueError fırlatır.
+    """
+    if value is None:
+        return None
+    requested = [name.strip() for name in value.split(',') if name.strip()]
+    invalid = [name for name in requested if name not in allowed]
+    if invalid:
+        raise ValueError(f"Geçersiz alan: {', '.join(invalid)} (izin verilenler: {', '.join(allowed)})")
+    return list(dict.fromkeys(['id'] + requested))
+
+
+def select_list(fields, columns, required=(), prefix=''):
+    """İstenen alanlardan SELECT kolon listesi - fields None ise prefix*
+
+    required: istenmese de okunması gereken kolonlar (sayfalama anahtarı,
+    türetilmiş alanların kaynağı vb.)
+    """
+    if fields is None:
+        return f"{prefix}*"
+    return ', '.join(prefix + column for column in columns if column in fields or column in required)
+
+
+def pick(obj, fields, converters=None):
+    """Nesneden sadece istenen alanlarla sözlük üretir"""
+    converters = converters or {}
+    return {
+        name: converters[name](obj) if name in converters else getattr(obj, name, None)
+        for name in fields
+    }
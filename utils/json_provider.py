@@ -0,0 +1,46 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson opsiyonel - yoksa standart kütüphane kullanılır
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """orjson kuruluysa onunla, değilse standart json ile serileştiren JSON sağlayıcı
+
+    Tarih, Decimal vb. tipler Flask'ın varsayılan dönüşümünden (default) geçer;
+    böylece iki yolda da çıktı aynı değerleri üretir. orjson UTF-8 çıktı verir
+    (ensure_ascii yok), bu da Türkçe metinlerde yanıtı küçültür.
+    """
+
+    @property
+    def backend(self):
+        return 'orjson' if orjson is not None else 'json'
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj, indent=bool(kwargs.get('indent'))).decode('utf-8')
+
+    def _dumps_bytes(self, obj, indent=False):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        # str'e çevirmeden doğrudan bytes olarak yanıt gövdesine yaz
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._dumps_bytes(obj, indent=indent), mimetype=self.mimetype)
@@ -0,0 +1,188 @@
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from utils.metrics import Counter
+import config
+
+LOG_DROPPED = Counter('log_records_dropped_total', 'Kuyruk dolu olduğu için atılan log kayıtları', ('level',))
+
+# Standart LogRecord alanları - bunların dışındakiler (extra=...) JSON'a alan olarak yazılır
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'request_id'}
+
+# Metin formatında seviye -> panel/konsolda alışılmış emoji
+_LEVEL_ICONS = {
+    logging.DEBUG: '🔧',
+    logging.INFO: 'ℹ️',
+    logging.WARNING: '⚠️',
+    logging.ERROR: '❌',
+    logging.CRITICAL: '❌'
+}
+
+_listener = None
+_setup_lock = threading.Lock()
+
+
+def _current_request_id():
+    """Flask istek bağlamındaysa isteğin kimliği, değilse None"""
+    try:
+        from flask import g, has_request_context
+    except ImportError:
+        return None
+    if not has_request_context():
+        return None
+    return g.get('request_id')
+
+
+class ContextFilter(logging.Filter):
+    """Kayda çağıran thread'deki istek kimliğini ekler (kuyruğa girmeden önce)"""
+
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = _current_request_id()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """DEBUG kayıtlarının sadece rate oranını geçirir - yüksek hacimli debug loglarını seyreltir"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """Tek satır JSON kayıt: zaman, seviye, logger, mesaj, istek kimliği ve extra alanlar"""
+
+    def format(self, record):
+        entry = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        if getattr(record, 'request_id', None):
+            entry['request_id'] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Geliştirme için okunabilir tek satır - seviye emojisi ve istek kimliği ile"""
+
+    def format(self, record):
+        line = f"{_LEVEL_ICONS.get(record.levelno, '')} {record.getMessage()}"
+        request_id = getattr(record, 'request_id', None)
+        if request_id:
+            line += f" [{request_id[:8]}]"
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line += '\n' + record.exc_text
+        return line
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Kaydı sınırlı kuyruğa bırakır - kuyruk doluysa beklemez, kaydı atar ve sayar
+
+    Mesaj biçimlendirme ve traceback metni çağıran thread'de bir kez hazırlanır;
+    JSON'a çevirme ve stdout'a yazma QueueListener thread'inde yapılır.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_DROPPED.inc((record.levelname,))
+
+
+def parse_levels(value):
+    """'utils.database=DEBUG,services.auth=WARNING' -> {logger adı: seviye}"""
+    levels = {}
+    for part in (value or '').split(','):
+        name, _, level = part.strip().partition('=')
+        if name and level:
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging():
+    """Kök logger'ı kuyruk tabanlı handler'la yapılandırır (bir kez)"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(TextFormatter() if config.Config.LOG_FORMAT == 'text' else JsonFormatter())
+
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=config.Config.LOG_QUEUE_SIZE))
+        handler.addFilter(SamplingFilter(config.Config.LOG_DEBUG_SAMPLE_RATE))
+        handler.addFilter(ContextFilter())
+
+        root = logging.getLogger()
+        root.handlers[:] = [handler]
+        root.setLevel(config.Config.LOG_LEVEL.upper())
+        for name, level in parse_levels(config.Config.LOG_LEVELS).items():
+            logging.getLogger(name).setLevel(level)
+
+        _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=True)
+        _listener.start()
+
+
+def shutdown_logging():
+    """Kuyrukta kalan kayıtları yazar ve dinleyici thread'i durdurur"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def init_logging(app):
+    """Logging'i kurar; her isteğe X-Request-ID (gelen başlık ya da yeni uuid) atar"""
+    import atexit
+    from flask import g, request
+
+    setup_logging()
+    atexit.register(shutdown_logging)
+
+    @app.before_request
+    def _assign_request_id():
+        incoming = request.headers.get('X-Request-ID', '')
+        # Dışarıdan gelen kimlik sadece makul uzunlukta ve güvenli karakterlerdeyse kullanılır
+        if incoming and len(incoming) <= 64 and incoming.isascii() and incoming.replace('-', '').isalnum():
+            g.request_id = incoming
+        else:
+            g.request_id = uuid.uuid4().hex
+
+    @app.after_request
+    def _echo_request_id(response):
+        request_id = g.get('request_id')
+        if request_id:
+            response.headers['X-Request-ID'] = request_id
+        return response
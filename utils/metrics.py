@@ -0,0 +1,226 @@
+import bisect
+import logging
+import threading
+import time
+import weakref
+
+logger = logging.getLogger(__name__)
+
+# Gecikme histogramları için varsayılan kova sınırları (saniye)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# SQL işlem etiketi için bilinen anahtar kelimeler - diğerleri 'other' (etiket sayısı sınırlı kalsın)
+SQL_OPERATIONS = ('select', 'insert', 'update', 'delete', 'replace', 'create', 'show')
+
+_registry = []
+_collectors = []
+_registry_lock = threading.Lock()
+
+
+class _Metric:
+    """Thread başına parçalanmış (sharded) metrik
+
+    Her thread sadece kendi sözlüğüne yazar; sıcak yolda kilit alınmaz.
+    Kilit sadece thread ilk kez yazdığında (parça kaydı), thread sonlandığında
+    ve okumada kullanılır. Sonlanan thread'in parçası ortak taban parçaya
+    eklenip listeden çıkarılır - istek başına thread açan sunucuda parça
+    sayısı (ve okuma maliyeti) canlı thread sayısıyla sınırlı kalır.
+    """
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._base = {}
+        self._shards = {}
+        self._shards_lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def _shard(self):
+        owner = getattr(self._local, 'owner', None)
+        if owner is None:
+            owner = self._local.owner = _ShardOwner()
+            # threading.local thread bitince owner'ı bırakır -> parça tabana katılır
+            weakref.finalize(owner, self._retire, owner.data)
+            with self._shards_lock:
+                self._shards[id(owner.data)] = owner.data
+        return owner.data
+
+    def _retire(self, shard):
+        with self._shards_lock:
+            self._shards.pop(id(shard), None)
+            self._merge(self._base, shard)
+
+    def _merge(self, target, shard):
+        raise NotImplementedError
+
+    def _snapshots(self):
+        # dict.copy() GIL altında tek adımda çalışır - yazan thread ile yarışmaz;
+        # kilit altında kopyalanır ki aynı anda tabana katılan parça iki kez sayılmasın
+        with self._shards_lock:
+            return [self._base.copy()] + [shard.copy() for shard in self._shards.values()]
+
+
+class _ShardOwner:
+    """Thread'e ait parçanın sahibi - ömrü thread-local'a bağlı (weakref için)"""
+    __slots__ = ('data', '__weakref__')
+
+    def __init__(self):
+        self.data = {}
+
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def inc(self, labels=(), amount=1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def _merge(self, target, shard):
+        for labels, value in shard.items():
+            target[labels] = target.get(labels, 0) + value
+
+    def collect(self):
+        merged = {}
+        for shard in self._snapshots():
+            self._merge(merged, shard)
+        return [(self.name, labels, value) for labels, value in merged.items()]
+
+
+class Histogram(_Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, labels, value):
+        shard = self._shard()
+        entry = shard.get(labels)
+        if entry is None:
+            # [kova sayıları..., +Inf sayısı, toplam]
+            entry = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        entry[bisect.bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+
+    def _merge(self, target, shard):
+        for labels, entry in shard.items():
+            total = target.setdefault(labels, [0] * (len(self.buckets) + 1) + [0.0])
+            for i, value in enumerate(list(entry)):
+                total[i] += value
+
+    def collect(self):
+        merged = {}
+        for shard in self._snapshots():
+            self._merge(merged, shard)
+
+        samples = []
+        for labels, entry in merged.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), entry[:-1]):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", labels + (('le', bound),), cumulative))
+            samples.append((f"{self.name}_count", labels, cumulative))
+            samples.append((f"{self.name}_sum", labels, entry[-1]))
+        return samples
+
+
+def register_collector(collector):
+    """Okuma anında değer üreten fonksiyon kaydeder - [(ad, tip, açıklama, [(etiketler, değer)])] döner"""
+    with _registry_lock:
+        _collectors.append(collector)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, labels):
+    pairs = []
+    for i, value in enumerate(labels):
+        if isinstance(value, tuple):
+            pairs.append(f'{value[0]}="{_escape(value[1])}"')
+        else:
+            pairs.append(f'{names[i]}="{_escape(value)}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def render():
+    """Tüm metrikleri Prometheus metin formatında (0.0.4) döndürür"""
+    with _registry_lock:
+        metrics = list(_registry)
+        collectors = list(_collectors)
+
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for name, labels, value in sorted(metric.collect(), key=lambda s: (s[1][:len(metric.labelnames)], s[0])):
+            lines.append(f"{name}{_format_labels(metric.labelnames, labels)} {value}")
+
+    for collector in collectors:
+        try:
+            families = collector()
+        except Exception as e:
+            logger.error("Metrik toplama hatası: %s", e)
+            continue
+        for name, metric_type, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+    return '\n'.join(lines) + '\n'
+
+
+HTTP_REQUESTS = Counter('http_requests_total', 'İşlenen HTTP istekleri', ('blueprint', 'endpoint', 'method', 'status'))
+HTTP_LATENCY = Histogram('http_request_duration_seconds', 'HTTP istek süresi', ('blueprint', 'endpoint'))
+DB_QUERIES = Counter('db_queries_total', 'Çalıştırılan SQL sorguları', ('operation',))
+DB_QUERY_ERRORS = Counter('db_query_errors_total', 'Hata ile sonuçlanan SQL sorguları', ('operation',))
+DB_QUERY_LATENCY = Histogram('db_query_duration_seconds', 'SQL sorgu süresi (execute)', ('operation',))
+CACHE_REQUESTS = Counter('cache_requests_total', 'Cache okumaları (result: hit/miss)', ('cache', 'result'))
+
+
+def sql_operation(query):
+    """Sorgunun ilk anahtar kelimesi - metrik etiketi olarak"""
+    head = query.lstrip()[:8].split(None, 1)
+    operation = head[0].lower() if head else ''
+    return operation if operation in SQL_OPERATIONS else 'other'
+
+
+def record_query(query, elapsed, failed=False):
+    operation = (sql_operation(query),)
+    DB_QUERIES.inc(operation)
+    DB_QUERY_LATENCY.observe(operation, elapsed)
+    if failed:
+        DB_QUERY_ERRORS.inc(operation)
+
+
+def record_cache(name, hit, count=1):
+    CACHE_REQUESTS.inc((name, 'hit' if hit else 'miss'), count)
+
+
+def init_metrics(app):
+    """İstek sayaç/süre kancalarını ve /metrics endpoint'ini uygulamaya ekler"""
+    from flask import request, g, Response
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop('_metrics_started', None)
+        if started is not None:
+            endpoint = request.endpoint or 'none'
+            blueprint = request.blueprint or ''
+            HTTP_REQUESTS.inc((blueprint, endpoint, request.method, str(response.status_code)))
+            HTTP_LATENCY.observe((blueprint, endpoint), time.perf_counter() - started)
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        return Response(render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
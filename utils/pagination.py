@@ -0,0 +1,92 @@
+import base64
+import json
+from utils.database import db
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+COUNT_MODES = ('none', 'exact', 'estimate')
+
+
+def encode_cursor(values):
+    """Keyset değerlerini opak cursor string'ine çevirir"""
+    raw = json.dumps([str(v) if v is not None and not isinstance(v, (int, float)) else v
+                      for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    """Cursor string'ini keyset değerlerine çevirir - geçersizse ValueError fırlatır"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except Exception:
+        raise ValueError('Geçersiz cursor')
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Geçersiz cursor')
+    return values
+
+
+def parse_page_args(args):
+    """İstek parametrelerinden (limit, after, count) okur
+
+    Ne limit ne de after verilmişse None döner (sayfalama kapalı).
+    """
+    limit = args.get('limit')
+    after = args.get('after') or None
+    count = args.get('count', 'none')
+
+    if limit is None and after is None:
+        return None
+
+    try:
+        limit = int(limit) if limit is not None else DEFAULT_LIMIT
+    except ValueError:
+        raise ValueError('limit bir sayı olmalıdır')
+    if limit < 1:
+        raise ValueError('limit en az 1 olmalıdır')
+    limit = min(limit, MAX_LIMIT)
+
+    if count not in COUNT_MODES:
+        raise ValueError(f"count şunlardan biri olmalıdır: {', '.join(COUNT_MODES)}")
+
+    return limit, after, count
+
+
+def keyset_page(rows, limit, key):
+    """limit+1 satırdan sayfayı ve sonraki cursor'ı ayırır"""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(key(rows[-1])) if has_more and rows else None
+    return rows, next_cursor
+
+
+def estimate_count(table):
+    """Tablo satır sayısını information_schema'dan tahmini olarak okur (COUNT(*) taraması yapmaz)"""
+    query = """
+    SELECT TABLE_ROWS as count FROM information_schema.TABLES
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """
+    result = db.execute_query(query, (table,), fetch=True)
+    if result and result[0]['count'] is not None:
+        return int(result[0]['count'])
+    return 0
+
+
+def count_total(model, filters, count):
+    """count parametresine göre toplam kayıt sayısını döndürür (none ise None)"""
+    if count == 'none':
+        return None
+    return model.count(filters, estimate=(count == 'estimate'))
+
+
+def page_response(items, next_cursor, limit, total=None):
+    """Sayfalı liste yanıtı için ortak gövde"""
+    body = {
+        'success': True,
+        'data': items,
+        'limit': limit,
+        'next_cursor': next_cursor
+    }
+    if total is not None:
+        body['total'] = total
+    return body
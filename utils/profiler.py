@@ -0,0 +1,150 @@
+import logging
+import re
+import threading
+import time
+from collections import deque, Counter
+import config
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: kapalıyken cursor kancası tek bir bool kontrolüyle döner
+ENABLED = config.Config.QUERY_PROFILER_ENABLED
+
+_state = threading.local()
+_recent = deque(maxlen=config.Config.PROFILER_HISTORY)
+_recent_lock = threading.Lock()
+
+_WHITESPACE = re.compile(r'\s+')
+_PLACEHOLDER_LIST = re.compile(r'%s(?:\s*,\s*%s)+')
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+
+def query_shape(query):
+    """Sorgunun şekli - boşluklar tek, literaller ?, değişken uzunluklu IN listeleri tek öğe"""
+    shape = _WHITESPACE.sub(' ', query).strip()
+    shape = _STRING_LITERAL.sub('?', shape)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    return _PLACEHOLDER_LIST.sub('%s, ...', shape)
+
+
+def redact(args):
+    """Parametre değerlerini gizler - sadece tip (ve metin uzunluğu) kalır"""
+    if args is None:
+        return []
+    if isinstance(args, dict):
+        return {key: redact([value])[0] for key, value in args.items()}
+    if isinstance(args, (list, tuple)) and args and isinstance(args[0], (list, tuple)):
+        return f"<{len(args)} satır>"  # executemany
+    result = []
+    for value in args if isinstance(args, (list, tuple)) else [args]:
+        if value is None:
+            result.append(None)
+        elif isinstance(value, str):
+            result.append(f"<str:{len(value)}>")
+        else:
+            result.append(f"<{type(value).__name__}>")
+    return result
+
+
+class RequestProfile:
+    """Tek isteğin sorgu kayıtları"""
+
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.started = time.time()
+        self.queries = []  # (şekil, süre sn)
+
+    def summary(self):
+        shapes = Counter(shape for shape, _ in self.queries)
+        threshold = config.Config.PROFILER_N1_THRESHOLD
+        slowest = sorted(self.queries, key=lambda q: q[1], reverse=True)[:5]
+        return {
+            'method': self.method,
+            'path': self.path,
+            'zaman': self.started,
+            'sorgu_sayisi': len(self.queries),
+            'db_suresi_ms': round(sum(elapsed for _, elapsed in self.queries) * 1000, 2),
+            'tekrar_eden': [
+                {'sorgu': shape, 'adet': count}
+                for shape, count in shapes.most_common() if count >= threshold
+            ],
+            'en_yavas': [{'sorgu': shape, 'sure_ms': round(elapsed * 1000, 2)} for shape, elapsed in slowest]
+        }
+
+
+def _explain(query, args):
+    """Yavaş SELECT için EXPLAIN çıktısı - ayrı bağlantıda, profil kaydı dışında"""
+    from utils.database import db
+    _state.busy = True
+    connection = db.get_connection()
+    cursor = None
+    try:
+        cursor = connection.cursor()
+        cursor.execute("EXPLAIN " + query, args)
+        return cursor.fetchall()
+    except Exception as e:
+        return f"EXPLAIN alınamadı: {e}"
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
+        _state.busy = False
+
+
+def record(query, args, elapsed):
+    """TimedCursor her execute/executemany sonrası çağırır"""
+    if not ENABLED or getattr(_state, 'busy', False):
+        return
+    shape = query_shape(query)
+    profile = getattr(_state, 'profile', None)
+    if profile is not None:
+        profile.queries.append((shape, elapsed))
+
+    elapsed_ms = elapsed * 1000
+    if elapsed_ms >= config.Config.SLOW_QUERY_MS:
+        logger.warning("Yavaş sorgu (%.0f ms): %s | parametreler: %s", elapsed_ms, shape, redact(args))
+        if config.Config.PROFILER_EXPLAIN and shape.upper().startswith('SELECT'):
+            plan = _explain(query, args)
+            for row in plan if isinstance(plan, (list, tuple)) else [plan]:
+                logger.warning("EXPLAIN: %s", row)
+
+
+def init_profiler(app):
+    """İstek başına sorgu profili, yanıt başlıkları ve /debug/queries sayfası (QUERY_PROFILER_ENABLED)"""
+    if not ENABLED:
+        return
+    from flask import request, jsonify
+    from flask_jwt_extended import jwt_required
+
+    @app.before_request
+    def _start_profile():
+        # Query string (filtre değerleri) kaydedilmez - sadece yol
+        _state.profile = RequestProfile(request.method, request.path)
+
+    @app.after_request
+    def _finish_profile(response):
+        profile = getattr(_state, 'profile', None)
+        _state.profile = None
+        if profile is None or request.endpoint == 'debug_queries':
+            return response
+
+        summary = profile.summary()
+        response.headers['X-DB-Query-Count'] = str(summary['sorgu_sayisi'])
+        response.headers['X-DB-Time-Ms'] = str(summary['db_suresi_ms'])
+        if summary['tekrar_eden']:
+            response.headers['X-DB-Repeated-Queries'] = str(len(summary['tekrar_eden']))
+            logger.warning("Olası N+1: %s %s - %s", request.method, request.path,
+                           ', '.join(f"{item['adet']}x {item['sorgu'][:80]}" for item in summary['tekrar_eden']))
+        with _recent_lock:
+            _recent.append(summary)
+        return response
+
+    @app.route('/debug/queries', methods=['GET'])
+    @jwt_required()
+    def debug_queries():
+        """Son isteklerin sorgu profilleri (en yeni önce)"""
+        with _recent_lock:
+            items = list(_recent)
+        return jsonify({'success': True, 'data': items[::-1]})
@@ -0,0 +1,92 @@
+def as_float(default):
+    """None/0 değerleri default'a, diğerlerini float'a çeviren dönüştürücü (__init__ ile aynı kural)"""
+    def convert(value):
+        return float(value) if value else default
+    # from_rows'un ürettiği fonksiyonda çağrı yerine satır içi yazılan ifade
+    convert.expression = f"float({{}}) if {{}} else {default!r}"
+    return convert
+
+
+def as_int(default):
+    """None/0 değerleri default'a, diğerlerini int'e çeviren dönüştürücü (__init__ ile aynı kural)"""
+    def convert(value):
+        return int(value) if value else default
+    convert.expression = f"int({{}}) if {{}} else {default!r}"
+    return convert
+
+
+class SlottedRow:
+    """__slots__ kullanan satır modelleri için tuple cursor'dan hızlı oluşturma
+
+    Alt sınıflar __slots__ ve gerekirse _COERCE ({slot: dönüştürücü}) tanımlar.
+    from_rows(), kolon listesi başına bir kez üretilip derlenen bir fonksiyonla
+    nesneleri doldurur: satır tuple'ı doğrudan yerel değişkenlere açılır,
+    slotlar sabit attribute atamalarıyla yazılır, dönüştürmeler satır içidir.
+    Böylece satır başına __init__ çağrısı, **kwargs ya da ara dict olmaz.
+    Sorguda olmayan slotlar, argümansız __init__'in verdiği varsayılanları alır.
+    """
+    __slots__ = ()
+    _COERCE = {}
+
+    @classmethod
+    def _plan(cls, columns):
+        plans = cls.__dict__.get('_plans')
+        if plans is None:
+            plans = {}
+            setattr(cls, '_plans', plans)
+        plan = plans.get(columns)
+        if plan is None:
+            plan = plans[columns] = cls._compile(columns)
+        return plan
+
+    @classmethod
+    def _compile(cls, columns):
+        """Kolon listesi için (satırlar) -> nesne listesi fonksiyonu üretir"""
+        slots = [name for klass in cls.__mro__ for name in klass.__dict__.get('__slots__', ())]
+        prototype = cls()
+        namespace = {'_cls': cls, '_new': object.__new__}
+        targets = ', '.join(f"c{index}" for index in range(len(columns)))
+        body = []
+        read = set()
+        for index, column in enumerate(columns):
+            if column not in slots or column in read:
+                continue
+            read.add(column)
+            value = f"c{index}"
+            convert = cls._COERCE.get(column)
+            if convert is not None:
+                expression = getattr(convert, 'expression', None)
+                if expression:
+                    value = expression.format(value, value)
+                else:
+                    namespace[f"_convert_{index}"] = convert
+                    value = f"_convert_{index}({value})"
+            body.append(f"        obj.{column} = {value}")
+        for name in slots:
+            if name in read:
+                continue
+            default = getattr(prototype, name)
+            if isinstance(default, (list, dict)):
+                # Değiştirilebilir varsayılanlar nesneler arasında paylaşılmasın
+                body.append(f"        obj.{name} = {type(default).__name__}()")
+            else:
+                namespace[f"_default_{name}"] = default
+                body.append(f"        obj.{name} = _default_{name}")
+
+        source = "\n".join([
+            "def hydrate(rows):",
+            "    result = []",
+            "    append = result.append",
+            f"    for ({targets},) in rows:" if columns else "    for _ in rows:",
+            "        obj = _new(_cls)",
+            *body,
+            "        append(obj)",
+            "    return result"
+        ])
+        exec(compile(source, f"<{cls.__name__}.from_rows>", 'exec'), namespace)
+        return namespace['hydrate']
+
+    @classmethod
+    def from_rows(cls, columns, rows):
+        """(kolonlar, tuple satırlar) -> nesne listesi"""
+        return cls._plan(tuple(columns))(rows)
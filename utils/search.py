@@ -0,0 +1,178 @@
+import bisect
+import heapq
+import threading
+from utils.database import db
+from utils.metrics import record_cache
+
+# Türkçe harfleri ASCII karşılığına indirger: "Işık" ve "isik" aynı anahtara düşer
+_ASCII_MAP = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+
+
+def turkish_fold(text):
+    """Türkçe kurallarıyla küçük harfe çevirir ve aksanları kaldırır (İ->i, I->ı->i)"""
+    if not text:
+        return ''
+    text = str(text).replace('İ', 'i').replace('I', 'ı').lower()
+    return text.translate(_ASCII_MAP)
+
+
+def tokenize(text):
+    """Katlanmış metni kelimelere böler"""
+    folded = turkish_fold(text)
+    for ch in '.,;:/\\-_()[]"\'':
+        folded = folded.replace(ch, ' ')
+    return folded.split()
+
+
+class PrefixIndex:
+    """Bellek içi, artımlı güncellenen kelime-önek indeksi
+
+    Her kayıt için aranabilir alanların kelimeleri sıralı bir (kelime, id)
+    listesinde tutulur; önek araması bisect ile O(log n + eşleşme) sürer.
+    İndeks ilk aramada veritabanından yüklenir, sonra kayıt bazında güncellenir.
+    Yükleme sürerken gelen yazmalar kaybolmasın diye not edilir ve yükleme
+    bitince uygulanır (toplu yazmada indeks bir sonraki aramada yeniden yüklenir).
+    """
+
+    def __init__(self, table, fields, payload_fields, max_scan=5000):
+        self.table = table
+        self.fields = fields
+        self.payload_fields = payload_fields
+        self.max_scan = max_scan
+
+        self._lock = threading.RLock()
+        self._entries = []  # sıralı (kelime, id)
+        self._records = {}  # id -> (kelimeler, katlanmış alanlar, payload)
+        self._loaded = False
+
+        # Yükleme sırasında gelen yazmalar
+        self._pending_lock = threading.Lock()
+        self._loading = False
+        self._pending = set()  # yeniden okunacak id'ler
+        self._stale = False    # id'siz (toplu) yazma geldi
+
+    def _columns(self):
+        return ', '.join(dict.fromkeys(['id'] + self.fields + self.payload_fields))
+
+    def _index_row(self, row):
+        tokens = set()
+        folded_fields = []
+        for field in self.fields:
+            value = row.get(field)
+            tokens.update(tokenize(value))
+            folded_fields.append(turkish_fold(value))
+        payload = {field: row.get(field) for field in ['id'] + self.payload_fields}
+        return sorted(tokens), folded_fields, payload
+
+    def _load(self):
+        """Tüm tabloyu okuyup indeksi sıfırdan kurar"""
+        with self._pending_lock:
+            self._loading = True
+            self._pending = set()
+            self._stale = False
+        try:
+            rows = db.execute_query(f"SELECT {self._columns()} FROM {self.table}", fetch=True) or []
+            records = {}
+            entries = []
+            for row in rows:
+                record = self._index_row(row)
+                records[row['id']] = record
+                entries.extend((token, row['id']) for token in record[0])
+            entries.sort()
+        except Exception:
+            with self._pending_lock:
+                self._loading = False
+            raise
+
+        self._records = records
+        self._entries = entries
+        with self._pending_lock:
+            self._loading = False
+            pending, self._pending = self._pending, set()
+            # Toplu yazma okunan veriyi eskitmiş olabilir - sonraki aramada yeniden yüklenir
+            self._loaded = not self._stale
+        if self._loaded:
+            for row_id in pending:
+                self._reindex(row_id)
+
+    def _ensure_loaded(self):
+        record_cache('search_index', self._loaded)
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._load()
+
+    def _remove(self, row_id):
+        record = self._records.pop(row_id, None)
+        if record:
+            for token in record[0]:
+                i = bisect.bisect_left(self._entries, (token, row_id))
+                if i < len(self._entries) and self._entries[i] == (token, row_id):
+                    del self._entries[i]
+
+    def refresh(self, table=None, row_id=None):
+        """Yazma sonrası çağrılır - id verilmişse sadece o kayıt, yoksa tüm indeks yenilenir"""
+        with self._pending_lock:
+            if not self._loaded:
+                # Yükleniyorsa yükleme sonunda uygulanır; yüklenmemişse sonraki yükleme zaten güncel okur
+                if self._loading:
+                    if row_id is None:
+                        self._stale = True
+                    else:
+                        self._pending.add(row_id)
+                return
+        if row_id is None:
+            with self._lock:
+                self._loaded = False
+            return
+        self._reindex(row_id)
+
+    def _reindex(self, row_id):
+        """Tek kaydı veritabanından okuyup indekste günceller"""
+        # Sorgu kilit dışında - aramalar DB turunu beklemez
+        result = db.execute_query(
+            f"SELECT {self._columns()} FROM {self.table} WHERE id = %s", (row_id,), fetch=True
+        )
+        with self._lock:
+            if not self._loaded:
+                return
+            self._remove(row_id)
+            if result:
+                record = self._index_row(result[0])
+                self._records[row_id] = record
+                for token in record[0]:
+                    bisect.insort(self._entries, (token, row_id))
+
+    def _prefix_ids(self, token):
+        """Öneki token olan kelimelerin kayıt id'leri (en fazla max_scan)"""
+        ids = set()
+        i = bisect.bisect_left(self._entries, (token,))
+        entries = self._entries
+        while i < len(entries) and entries[i][0].startswith(token) and len(ids) < self.max_scan:
+            ids.add(entries[i][1])
+            i += 1
+        return ids
+
+    def search(self, query, limit=10):
+        """Tüm sorgu kelimelerinin önek olarak eşleştiği en iyi limit kaydı döndürür"""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        self._ensure_loaded()
+
+        with self._lock:
+            # En uzun (en seçici) kelimeyle aday topla, diğerleriyle ele
+            terms.sort(key=len, reverse=True)
+            candidates = self._prefix_ids(terms[0])
+            folded_query = turkish_fold(query).strip()
+
+            scored = []
+            for row_id in candidates:
+                tokens, folded_fields, payload = self._records[row_id]
+                if not all(any(t.startswith(term) for t in tokens) for term in terms[1:]):
+                    continue
+                # Alanın tamamı sorguyla başlıyorsa öne al, sonra kısa alan, sonra id
+                starts = any(value.startswith(folded_query) for value in folded_fields)
+                scored.append((0 if starts else 1, len(folded_fields[0]), row_id, payload))
+
+            return [dict(item[3]) for item in heapq.nsmallest(limit, scored, key=lambda s: s[:3])]
@@ -0,0 +1,101 @@
+import os
+import threading
+from utils.database import db
+import config
+
+
+class SequenceAllocator:
+    """Sayaç tablosu destekli, seri bazlı numara dağıtıcı
+
+    Her worker (process) sayaç tablosundan tek seferde block_size kadar numara
+    ayırır ve bunları bellekten dağıtır. Ayırma işlemi tek bir atomik
+    UPDATE ile yapıldığından paralel worker'lar asla aynı numarayı alamaz.
+    Numara boşlukları en fazla worker başına block_size kadardır (kullanılmadan
+    kalan blok artığı ya da geri alınan transaction).
+    """
+
+    def __init__(self, table, block_size):
+        self.table = table
+        self.block_size = max(int(block_size), 1)
+        self._blocks = {}  # seri -> [sıradaki, blok sonu]
+        self._lock = threading.Lock()
+        self._table_ready = False
+
+    def _ensure_table(self, cursor):
+        """Sayaç tablosunu ilk kullanımda oluşturur"""
+        if self._table_ready:
+            return
+        cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {self.table} (
+            seri VARCHAR(64) NOT NULL PRIMARY KEY,
+            son_deger BIGINT NOT NULL DEFAULT 0
+        ) ENGINE=InnoDB
+        """)
+        self._table_ready = True
+
+    def _reserve(self, seri):
+        """Sayaç tablosundan yeni bir blok ayırır - (ilk, son) döner"""
+        connection = db.get_connection()
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            self._ensure_table(cursor)
+
+            # Satır yoksa oluşturur, varsa atomik olarak block_size kadar artırır.
+            # LAST_INSERT_ID(expr) yeni değeri bu bağlantıya özel olarak saklar.
+            cursor.execute(f"""
+            INSERT INTO {self.table} (seri, son_deger) VALUES (%s, LAST_INSERT_ID(%s))
+            ON DUPLICATE KEY UPDATE son_deger = LAST_INSERT_ID(son_deger + %s)
+            """, (seri, self.block_size, self.block_size))
+            cursor.execute("SELECT LAST_INSERT_ID() as son")
+            son = int(cursor.fetchone()['son'])
+
+            # Sayaç kilidini hemen bırak - fatura transaction'ını beklemez
+            connection.commit()
+            return son - self.block_size + 1, son
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+            connection.close()
+
+    def next(self, seri):
+        """Serinin sıradaki numarasını döndürür"""
+        with self._lock:
+            block = self._blocks.get(seri)
+            if block is None or block[0] > block[1]:
+                first, last = self._reserve(seri)
+                # Eski serilerin (ör. dünün) blok artıklarını bırak
+                self._blocks = {seri: [first, last]}
+                block = self._blocks[seri]
+
+            value = block[0]
+            block[0] += 1
+            return value
+
+    def reset(self):
+        """Bellekteki blokları bırakır (test ve fork sonrası kullanım için)"""
+        with self._lock:
+            self._blocks = {}
+
+    def _after_fork(self):
+        """Fork sonrası çocuk process'te: ebeveynin ayırdığı bloklar burada dağıtılmasın
+
+        Fork anında kilit başka bir thread'de tutuluyor olabilir; beklemek yerine
+        kilit ve bloklar yeniden oluşturulur.
+        """
+        self._lock = threading.Lock()
+        self._blocks = {}
+
+
+fatura_no_sequence = SequenceAllocator(
+    config.Config.FATURA_NO_TABLE,
+    config.Config.FATURA_NO_BLOCK_SIZE
+)
+
+# Uygulamayı önceden yükleyip fork eden sunucularda (ör. gunicorn --preload)
+# her worker kendi bloğunu ayırır - aynı fatura_no iki worker'dan çıkmaz
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=fatura_no_sequence._after_fork)